@@ -0,0 +1,109 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Benchmarks of FigureCanvasPIL.output_PIL() and .save_tiled() at common
+resolutions, and of .save() with the different encoders."""
+
+import os
+import tempfile
+import matplotlayers
+import matplotlayers.backends.PIL
+import common
+
+
+def make_figure():
+    """Return a rendered figure with a series and an image."""
+
+    (figure, stack) = common.make_stack()
+
+    (x, y, C) = common.make_image(256)
+    stack.add_layer(matplotlayers.LayerPColorMesh(X = x, Y = y, C = C))
+
+    (x, y) = common.make_series(10 ** 4)
+    stack.add_layer(matplotlayers.LayerPlot(x = x / 50.0 - 1, y = y))
+
+    stack.render()
+
+    return figure
+
+
+class TimeOutputPIL:
+    """Rendering a figure with a series and an image to PIL."""
+
+    params = ['640x480', '1280x720', '1920x1080', '3840x2160']
+    param_names = ['resolution']
+
+    def setup(self, resolution):
+        self.figure = make_figure()
+        self.PIL_canvas = matplotlayers.backends.PIL.FigureCanvasPIL(
+                self.figure)
+        self.shape = tuple(map(int, resolution.split('x')))
+
+    def time_output_PIL(self, resolution):
+        self.PIL_canvas.output_PIL(self.shape)
+
+
+class TimeSaveTiled:
+    """Saving the same figure to PNG in bands."""
+
+    params = ['1920x1080', '3840x2160']
+    param_names = ['resolution']
+
+    def setup(self, resolution):
+        self.PIL_canvas = matplotlayers.backends.PIL.FigureCanvasPIL(
+                make_figure())
+        self.shape = tuple(map(int, resolution.split('x')))
+
+        (handle, self.filename) = tempfile.mkstemp(suffix = '.png')
+        os.close(handle)
+
+    def teardown(self, resolution):
+        os.remove(self.filename)
+
+    def time_save_tiled(self, resolution):
+        self.PIL_canvas.save_tiled(self.filename, self.shape)
+
+
+class TimeSave:
+    """Saving the same figure at 1920x1080 with different encoders."""
+
+    params = ['png-6', 'png-1', 'ppm', 'npy', 'bmp']
+    param_names = ['encoder']
+
+    def setup(self, encoder):
+        self.PIL_canvas = matplotlayers.backends.PIL.FigureCanvasPIL(
+                make_figure())
+
+        (extension, level) = (encoder.split('-') + [None])[:2]
+        if level is not None:
+            level = int(level)
+        self.level = level
+
+        (handle, self.filename) = tempfile.mkstemp(suffix = '.' + extension)
+        os.close(handle)
+
+    def teardown(self, encoder):
+        os.remove(self.filename)
+
+    def time_save(self, encoder):
+        self.PIL_canvas.save(self.filename, (1920, 1080), level = self.level)
@@ -0,0 +1,70 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Benchmarks of the import time of matplotlayers.
+
+Each benchmark starts a new interpreter, as the modules once imported stay
+in sys.modules.  The 'bare' statement times the interpreter alone, subtract
+it from the other ones."""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TimeImport:
+    """Starting an interpreter and importing parts of matplotlayers."""
+
+    params = ['bare', 'package', 'plot', 'layers', 'PIL', 'tk']
+    param_names = ['statement']
+
+    statements = {
+            'bare': 'pass',
+            'package': 'import matplotlayers',
+            'plot': 'import matplotlayers; '
+                'matplotlayers.Stack; matplotlayers.LayerPlot',
+            'layers': 'import matplotlayers; '
+                '[getattr(matplotlayers, name) for name in '
+                'matplotlayers.layers.__all__]',
+            'PIL': 'import matplotlayers.backends.PIL; '
+                'matplotlayers.backends.PIL.FigureCanvasPIL',
+            'tk': 'import matplotlayers.backends.tk; '
+                'matplotlayers.backends.tk.FigureCanvasTk'}
+
+    def setup(self, statement):
+        self.environment = dict(os.environ)
+        self.environment['PYTHONPATH'] = os.pathsep.join([ROOT] +
+                filter(None, [os.environ.get('PYTHONPATH')]))
+
+        self.command = [sys.executable, '-c', self.statements[statement]]
+
+        # Skip the statements failing, e.g. without Tkinter.
+        if subprocess.call(self.command, env = self.environment,
+                stdout = open(os.devnull, 'w'),
+                stderr = subprocess.STDOUT) != 0:
+            raise NotImplementedError()
+
+    def time_import(self, statement):
+        subprocess.check_call(self.command, env = self.environment)
@@ -0,0 +1,92 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Benchmarks of simulated pan and zoom sequences via StackCanvas."""
+
+import numpy
+import matplotlayers
+import matplotlayers.backends
+import matplotlayers.backends.PIL
+import common
+
+# The number of motion events per sequence.
+STEPS = 20
+
+
+class TimePanZoom:
+    """A drag of STEPS motion events across a Stack with 1e5 points, with
+    and without rendering a frame per event as FigureCanvasTk does."""
+
+    params = ['pan', 'zoom', 'zoom_box']
+    param_names = ['gesture']
+
+    def setup(self, gesture):
+        (self.figure, self.stack) = common.make_stack()
+        (x, y) = common.make_series(10 ** 5)
+        self.stack.add_layer(matplotlayers.LayerPlot(x = x, y = y))
+        self.stack.render()
+
+        self.stack_canvas = matplotlayers.backends.StackCanvas(self.stack)
+        self.PIL_canvas = matplotlayers.backends.PIL.FigureCanvasPIL(
+                self.figure)
+
+        # A diagonal path through the axes, in figure coordinates.
+        self.path = zip(numpy.linspace(0.3, 0.7, STEPS + 1),
+                numpy.linspace(0.3, 0.6, STEPS + 1))
+
+    def _gesture(self, gesture, render):
+        """Perform the GESTURE, rendering after each step if RENDER."""
+
+        # Start from the same view each time.
+        self.stack.set_autoscale_on(True)
+
+        if gesture == 'zoom_box':
+            self.stack_canvas.zoom_to_box(self.path[0], self.path[-1])
+            if render:
+                self.PIL_canvas.output_PIL(common.SHAPE)
+            return
+
+        if gesture == 'pan':
+            self.stack_canvas.start_pan(self.path[0])
+        else:
+            self.stack_canvas.start_zoom(self.path[0])
+
+        for figurecoords in self.path[1:]:
+            self.stack_canvas.motion(figurecoords)
+            if render:
+                self.PIL_canvas.output_PIL(common.SHAPE)
+
+        if gesture == 'pan':
+            self.stack_canvas.stop_pan()
+        else:
+            self.stack_canvas.stop_zoom()
+
+    def time_limits(self, gesture):
+        """Only the view limit handling."""
+
+        self._gesture(gesture, render = False)
+
+    def time_frames(self, gesture):
+        """The limit handling and a frame rendered per step."""
+
+        self._gesture(gesture, render = True)
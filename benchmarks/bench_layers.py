@@ -0,0 +1,108 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Benchmarks of the layers drawing series and images."""
+
+import matplotlib.backends.backend_agg
+import matplotlayers
+import common
+
+
+class TimeLayerPlot:
+    """Rendering and drawing a LayerPlot, plain, with errors, and with an
+    envelope."""
+
+    params = ([10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+            ['plain', 'errors', 'envelope'])
+    param_names = ['points', 'mode']
+    timeout = 600
+
+    def setup(self, points, mode):
+        (self.figure, self.stack) = common.make_stack()
+        (x, y) = common.make_series(points)
+
+        kwargs = {}
+        if mode in ('errors', 'envelope'):
+            kwargs['yerr'] = 0.1 + 0 * y
+        if mode == 'envelope':
+            kwargs['envelope_on'] = True
+
+        self.layer = matplotlayers.LayerPlot(x = x, y = y, **kwargs)
+        self.stack.add_layer(self.layer)
+        self.stack.render()
+
+        self.agg_canvas = matplotlib.backends.backend_agg.FigureCanvasAgg(
+                self.figure)
+
+    def time_render(self, points, mode):
+        self.layer.set_changed()
+        self.stack.render()
+
+    def time_data_bounds(self, points, mode):
+        self.layer.set_changed()
+        self.layer.get_data_bounds()
+
+    def time_draw(self, points, mode):
+        self.agg_canvas.draw()
+
+
+class TimeImageLayers:
+    """Rendering and drawing the pcolor-like layers and LayerImshow."""
+
+    params = (['LayerPColor', 'LayerPColorMesh', 'LayerPColorFast',
+                'LayerImshow'],
+            [64, 256, 1024])
+    param_names = ['layer', 'size']
+    timeout = 600
+
+    def setup(self, layer, size):
+        if layer == 'LayerPColor' and size > 256:
+            # A million polygons take minutes.
+            raise NotImplementedError()
+
+        (self.figure, self.stack) = common.make_stack()
+        (x, y, C) = common.make_image(size)
+
+        if layer == 'LayerImshow':
+            self.layer = matplotlayers.LayerImshow(X = C,
+                    extent = (x[0], x[-1], y[0], y[-1]))
+        else:
+            self.layer = getattr(matplotlayers, layer)(X = x, Y = y, C = C)
+
+        self.stack.add_layer(self.layer)
+        self.stack.render()
+
+        self.agg_canvas = matplotlib.backends.backend_agg.FigureCanvasAgg(
+                self.figure)
+
+    def time_render(self, layer, size):
+        self.layer.set_changed()
+        self.stack.render()
+
+    def time_draw(self, layer, size):
+        self.agg_canvas.draw()
+
+    def time_render_and_draw(self, layer, size):
+        self.layer.set_changed()
+        self.stack.render()
+        self.agg_canvas.draw()
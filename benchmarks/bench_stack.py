@@ -0,0 +1,63 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Benchmarks of Stack.render() with varying numbers of layers."""
+
+import matplotlayers
+import common
+
+
+class TimeStackRender:
+    """Rendering a Stack of LayerPlots with 1000 points each."""
+
+    params = [1, 10, 100]
+    param_names = ['layers']
+
+    def setup(self, layers):
+        (self.figure, self.stack) = common.make_stack()
+        (x, y) = common.make_series(1000)
+
+        self.layers = [matplotlayers.LayerPlot(x = x, y = y + index)
+                for index in xrange(layers)]
+        for layer in self.layers:
+            self.stack.add_layer(layer)
+
+        self.stack.render()
+
+    def time_render_unchanged(self, layers):
+        """Nothing to do, all layers are drawn already."""
+
+        self.stack.render()
+
+    def time_render_one_changed(self, layers):
+        """A single changed layer resets the Stack."""
+
+        self.layers[0].set_changed()
+        self.stack.render()
+
+    def time_render_all_changed(self, layers):
+        """All layers are drawn again."""
+
+        for layer in self.layers:
+            layer.set_changed()
+        self.stack.render()
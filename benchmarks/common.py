@@ -0,0 +1,62 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Helpers shared by the benchmarks."""
+
+import numpy
+import matplotlib.figure
+import matplotlayers
+
+# The default extent of figures rendered, in pixels.
+SHAPE = (800, 600)
+
+
+def make_stack():
+    """Return (figure, stack) of a new Figure with one Stack."""
+
+    figure = matplotlib.figure.Figure(frameon = False)
+    stack = matplotlayers.Stack(figure)
+
+    return (figure, stack)
+
+
+def make_series(points):
+    """Return (x, y) of a noisy sine with POINTS points."""
+
+    x = numpy.linspace(0, 100, points)
+    y = numpy.sin(x) + 0.1 * numpy.random.RandomState(0).randn(points)
+
+    return (x, y)
+
+
+def make_image(size):
+    """Return (x, y, C) of a SIZE x SIZE image with its column and row
+    edges."""
+
+    x = numpy.linspace(-1, 1, size + 1)
+    y = numpy.linspace(-1, 1, size + 1)
+    (X, Y) = numpy.meshgrid(x[:-1], y[:-1])
+    C = numpy.exp(-(X ** 2 + Y ** 2) * 4) + \
+            0.05 * numpy.random.RandomState(0).randn(size, size)
+
+    return (x, y, C)
@@ -0,0 +1,122 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Compares two benchmark results files written by benchmarks/run.py.
+
+Usage::
+
+    python benchmarks/compare.py [--factor F] OLD.json NEW.json
+
+Lists the benchmarks present in both files with the ratio of the new to the
+old minimum time per call.  Benchmarks slower by more than the factor F
+(default 1.1) are marked as regressions, faster ones as improvements."""
+
+import json
+import optparse
+import sys
+
+# The default ratio above which a benchmark counts as regressed.
+DEFAULT_FACTOR = 1.1
+
+
+def format_time(seconds):
+    """Return SECONDS as a string with a suitable unit."""
+
+    for (unit, scale) in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '%8.3f %s' % (seconds / scale, unit)
+
+    return '%8.3f ns' % (seconds / 1e-9)
+
+
+def load(filename):
+    """Return the (environment, results) stored in FILENAME."""
+
+    stream = open(filename)
+    try:
+        data = json.load(stream)
+    finally:
+        stream.close()
+
+    return (data['environment'], data['results'])
+
+
+def compare_files(old_filename, new_filename, factor = None):
+    """Print the comparison of the results in OLD_FILENAME and
+    NEW_FILENAME.  Returns the number of regressions."""
+
+    if factor is None:
+        factor = DEFAULT_FACTOR
+
+    (old_environment, old_results) = load(old_filename)
+    (new_environment, new_results) = load(new_filename)
+
+    for (label, environment) in (('old', old_environment),
+            ('new', new_environment)):
+        print '%s: matplotlayers %s (%s), matplotlib %s, %s, %s' % (label,
+                environment['matplotlayers'], environment['commit'],
+                environment['matplotlib'], environment['machine'],
+                environment['date'])
+    print
+
+    regressions = 0
+
+    for name in sorted(new_results.keys()):
+        (old, new) = (old_results.get(name), new_results[name])
+        if old is None or new is None:
+            continue
+
+        ratio = new['min'] / old['min']
+        if ratio > factor:
+            mark = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1.0 / factor:
+            mark = 'improved'
+        else:
+            mark = ''
+
+        print '%-70s %s %s %6.2f %s' % (name, format_time(old['min']),
+                format_time(new['min']), ratio, mark)
+
+    print
+    print '%d regression(s) beyond factor %g.' % (regressions, factor)
+
+    return regressions
+
+
+def main(argv = None):
+    parser = optparse.OptionParser(usage = '%prog [options] OLD NEW')
+    parser.add_option('--factor', dest = 'factor', type = 'float',
+            default = DEFAULT_FACTOR,
+            help = 'ratio marking a regression [%default]')
+    (options, args) = parser.parse_args(argv)
+
+    if len(args) != 2:
+        parser.error('Specify the old and the new results file.')
+
+    regressions = compare_files(args[0], args[1], options.factor)
+    sys.exit(regressions > 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Runs the benchmarks offline and stores the results.
+
+The benchmarks follow the conventions of airspeed velocity (asv): Each
+bench_*.py module holds classes with time_*() methods, optionally
+parametrised by the class attributes .params and .param_names, and
+prepared by .setup() and cleaned up by .teardown().  .setup() raises
+NotImplementedError to skip a parameter combination.
+
+Usage::
+
+    python benchmarks/run.py [--filter REGEX] [--output FILE]
+            [--compare FILE] [--repeat N] [--min-time SECONDS]
+
+The results are stored as JSON in benchmarks/results/ by default, named by
+the matplotlayers version, the git commit if available, and the date.
+Compare two results files by benchmarks/compare.py, or by handing the
+older one over via --compare."""
+
+import glob
+import itertools
+import json
+import optparse
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import timeit
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+
+# Benchmark the working tree.
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+import compare
+
+#
+# Discovery ...
+#
+
+
+def expand_params(cls):
+    """Return the list of parameter tuples of the benchmark class CLS."""
+
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+
+    param_names = getattr(cls, 'param_names', [])
+    if len(param_names) <= 1:
+        # A single parameter, PARAMS is the list of its values.
+        return [(value,) for value in params]
+
+    return list(itertools.product(*params))
+
+
+def discover(pattern = None):
+    """Return the list of (name, cls, method name, params) of all
+    benchmarks whose name matches the regular expression PATTERN."""
+
+    benchmarks = []
+
+    for filename in sorted(glob.glob(os.path.join(BENCHMARKS, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(filename))[0]
+        module = __import__(module_name)
+
+        for (class_name, cls) in sorted(vars(module).items()):
+            if not isinstance(cls, type) and \
+                    type(cls).__name__ != 'classobj':
+                continue
+
+            for method_name in sorted(dir(cls)):
+                if not method_name.startswith('time_'):
+                    continue
+
+                for params in expand_params(cls):
+                    name = '%s.%s.%s(%s)' % (module_name, class_name,
+                            method_name, ', '.join(map(str, params)))
+                    if pattern is None or re.search(pattern, name):
+                        benchmarks.append((name, cls, method_name, params))
+
+    return benchmarks
+
+#
+# Timing ...
+#
+
+
+def time_benchmark(cls, method_name, params, repeat, min_time):
+    """Time the method METHOD_NAME of a new instance of CLS with PARAMS.
+    The number of calls per repetition is chosen so that a repetition
+    takes at least MIN_TIME seconds.  Returns a dict with the times per
+    call in seconds, or None if the benchmark is skipped."""
+
+    instance = cls()
+
+    if hasattr(instance, 'setup'):
+        try:
+            instance.setup(*params)
+        except NotImplementedError:
+            return None
+
+    try:
+        method = getattr(instance, method_name)
+        timer = timeit.Timer(lambda: method(*params))
+
+        # Calibrate ...
+
+        number = 1
+        while True:
+            duration = timer.timeit(number)
+            if duration >= min_time or number >= 2 ** 20:
+                break
+            number *= 2
+
+        # Measure ...
+
+        times = sorted(duration / number
+                for duration in timer.repeat(repeat, number))
+
+    finally:
+        if hasattr(instance, 'teardown'):
+            instance.teardown(*params)
+
+    return {
+            'min': times[0],
+            'median': times[len(times) // 2],
+            'max': times[-1],
+            'number': number,
+            'repeat': repeat}
+
+#
+# Results ...
+#
+
+
+def get_commit():
+    """Return the git commit of the working tree, or None."""
+
+    try:
+        process = subprocess.Popen(['git', 'rev-parse', '--short', 'HEAD'],
+                cwd = ROOT, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        (output, errors) = process.communicate()
+    except OSError:
+        return None
+
+    if process.returncode != 0:
+        return None
+
+    return output.strip()
+
+
+def get_environment():
+    """Return a dict describing the versions and the machine."""
+
+    import numpy
+    import matplotlib
+    import matplotlayers
+
+    return {
+            'matplotlayers': matplotlayers.__version_string__,
+            'commit': get_commit(),
+            'matplotlib': matplotlib.__version__,
+            'numpy': numpy.__version__,
+            'python': platform.python_version(),
+            'machine': platform.node(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def default_output(environment):
+    """Return the default results file name for ENVIRONMENT."""
+
+    name = environment['matplotlayers']
+    if environment['commit'] is not None:
+        name += '-' + environment['commit']
+    name += time.strftime('-%Y%m%d-%H%M%S') + '.json'
+
+    return os.path.join(BENCHMARKS, 'results', name)
+
+
+def main(argv = None):
+    parser = optparse.OptionParser(usage = '%prog [options]')
+    parser.add_option('--filter', dest = 'pattern', default = None,
+            help = 'run only benchmarks matching the regular expression')
+    parser.add_option('--output', dest = 'output', default = None,
+            help = 'results file, default benchmarks/results/...')
+    parser.add_option('--compare', dest = 'compare', default = None,
+            help = 'results file to compare with')
+    parser.add_option('--repeat', dest = 'repeat', type = 'int',
+            default = 5, help = 'number of repetitions [%default]')
+    parser.add_option('--min-time', dest = 'min_time', type = 'float',
+            default = 0.1,
+            help = 'minimum seconds per repetition [%default]')
+    (options, args) = parser.parse_args(argv)
+
+    environment = get_environment()
+    results = {}
+
+    for (name, cls, method_name, params) in discover(options.pattern):
+        sys.stdout.write('%-70s ' % name)
+        sys.stdout.flush()
+
+        result = time_benchmark(cls, method_name, params,
+                options.repeat, options.min_time)
+        results[name] = result
+
+        if result is None:
+            print 'skipped'
+        else:
+            print compare.format_time(result['min'])
+
+    # Store the results ...
+
+    output = options.output
+    if output is None:
+        output = default_output(environment)
+
+    directory = os.path.dirname(os.path.abspath(output))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    stream = open(output, 'w')
+    try:
+        json.dump({'environment': environment, 'results': results},
+                stream, indent = 1, sort_keys = True)
+    finally:
+        stream.close()
+
+    print 'Results stored in %r.' % output
+
+    if options.compare is not None:
+        print
+        compare.compare_files(options.compare, output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Tests of matplotlayers.backends.PIL.background."""
+
+import logging
+import threading
+import unittest
+import matplotlayers.backends.PIL.background as background
+
+# How long the tests wait for what should happen at once, in seconds.
+PATIENCE = 5
+
+
+class TestRenderExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = background.RenderExecutor(threads = 2)
+
+        # A figure stand-in, the executor uses only its id().
+        self.figure = object()
+
+        # Released to let a blocking job finish.
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def block(self):
+        """Return a future of a job of the figure running until
+        .release is set."""
+
+        started = threading.Event()
+
+        def job():
+            started.set()
+            self.release.wait(PATIENCE)
+            return 'blocked'
+
+        future = self.executor.submit(self.figure, job)
+        self.assertTrue(started.wait(PATIENCE))
+
+        return future
+
+    def test_result(self):
+        future = self.executor.submit(self.figure, lambda x: 2 * x, 21)
+
+        self.assertEqual(future.result(PATIENCE), 42)
+        self.assertTrue(future.done())
+
+    def test_failure(self):
+        def job():
+            raise KeyError('failed')
+
+        future = self.executor.submit(self.figure, job)
+
+        self.assertRaises(KeyError, future.result, PATIENCE)
+
+    def test_one_job_per_figure(self):
+        """The jobs of a figure run one after the other, other figures
+        meanwhile."""
+
+        running = self.block()
+        waiting = self.executor.submit(self.figure, lambda: 'waiting')
+        other = self.executor.submit(object(), lambda: 'other')
+
+        self.assertEqual(other.result(PATIENCE), 'other')
+        self.assertFalse(waiting.done())
+
+        self.release.set()
+        self.assertEqual(running.result(PATIENCE), 'blocked')
+        self.assertEqual(waiting.result(PATIENCE), 'waiting')
+
+    def test_cancel(self):
+        running = self.block()
+        called = []
+        waiting = self.executor.submit(self.figure, called.append, True)
+
+        self.assertFalse(running.cancel())
+        self.assertTrue(waiting.cancel())
+        self.assertTrue(waiting.cancelled())
+        self.assertRaises(background.RenderCancelled, waiting.result, 0)
+
+        # The cancelled job is skipped, the next one runs.
+        self.release.set()
+        after = self.executor.submit(self.figure, lambda: 'after')
+        self.assertEqual(after.result(PATIENCE), 'after')
+        self.assertEqual(called, [])
+
+    def test_timeout(self):
+        running = self.block()
+        waiting = self.executor.submit(self.figure, lambda: 'late',
+                timeout = 0.05)
+
+        self.assertRaises(background.RenderTimeout, waiting.result,
+                PATIENCE)
+
+        # The running job is not interrupted.
+        self.release.set()
+        self.assertEqual(running.result(PATIENCE), 'blocked')
+
+    def test_result_timeout(self):
+        running = self.block()
+
+        self.assertRaises(background.RenderTimeout, running.result, 0.01)
+        self.assertFalse(running.done())
+
+    def test_failing_callback(self):
+        """A failing callback neither keeps the other callbacks from being
+        called, nor ends the thread."""
+
+        logger = logging.getLogger(background.__name__)
+        logger.disabled = True
+        try:
+            called = threading.Event()
+
+            def fail(future):
+                raise RuntimeError('callback failed')
+
+            running = self.block()
+            running.add_done_callback(fail)
+            running.add_done_callback(lambda future: called.set())
+
+            self.release.set()
+            self.assertTrue(called.wait(PATIENCE))
+
+            for index in xrange(4):
+                future = self.executor.submit(self.figure, lambda: index)
+                self.assertEqual(future.result(PATIENCE), index)
+
+        finally:
+            logger.disabled = False
+
+    def test_callback_when_done(self):
+        future = self.executor.submit(self.figure, lambda: 'done')
+        future.result(PATIENCE)
+
+        done = []
+        future.add_done_callback(done.append)
+
+        self.assertEqual(done, [future])
+
+
+if __name__ == '__main__':
+    unittest.main()
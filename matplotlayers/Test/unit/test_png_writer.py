@@ -0,0 +1,92 @@
+"""Tests of matplotlayers.backends.PIL.png_writer."""
+
+import StringIO
+import struct
+import unittest
+import zlib
+import matplotlayers.backends.PIL.png_writer as png_writer
+
+
+def read_png(data):
+    """Return ((width, height), pixels) of the 8-bit RGB PNG DATA written
+    without filters, checking the chunks on the way."""
+
+    assert data.startswith(png_writer.SIGNATURE)
+
+    position = len(png_writer.SIGNATURE)
+    chunks = []
+    while position < len(data):
+        (length,) = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        content = data[position + 8:position + 8 + length]
+        (crc,) = struct.unpack('>I',
+                data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunk_type + content) & 0xffffffff
+        chunks.append((chunk_type, content))
+        position += 12 + length
+
+    assert chunks[0][0] == 'IHDR'
+    assert chunks[-1] == ('IEND', '')
+
+    (width, height, depth, colour, compression, filter, interlace) = \
+            struct.unpack('>IIBBBBB', chunks[0][1])
+    assert (depth, colour, interlace) == (8, 2, 0)
+
+    raw = zlib.decompress(''.join([content
+            for (chunk_type, content) in chunks if chunk_type == 'IDAT']))
+
+    row_size = 1 + 3 * width
+    assert len(raw) == row_size * height
+
+    rows = [raw[start:start + row_size]
+            for start in xrange(0, len(raw), row_size)]
+    assert all(row[0] == '\x00' for row in rows)
+
+    return ((width, height), ''.join(row[1:] for row in rows))
+
+
+class TestPNGWriter(unittest.TestCase):
+
+    def setUp(self):
+        (self.width, self.height) = (5, 7)
+        self.pixels = ''.join(chr((index * 37) % 256)
+                for index in xrange(3 * self.width * self.height))
+
+    def test_round_trip(self):
+        """Rows written in bands of various heights are read back."""
+
+        stream = StringIO.StringIO()
+        writer = png_writer.PNGWriter(stream, (self.width, self.height))
+
+        row_size = 3 * self.width
+        for (top, rows) in [(0, 1), (1, 3), (4, 0), (4, 3)]:
+            writer.write_rows(
+                    self.pixels[top * row_size:(top + rows) * row_size])
+        writer.close()
+
+        self.assertEqual(read_png(stream.getvalue()),
+                ((self.width, self.height), self.pixels))
+
+    def test_partial_row(self):
+        writer = png_writer.PNGWriter(StringIO.StringIO(),
+                (self.width, self.height))
+
+        self.assertRaises(ValueError, writer.write_rows, self.pixels[:4])
+
+    def test_too_many_rows(self):
+        writer = png_writer.PNGWriter(StringIO.StringIO(),
+                (self.width, self.height))
+
+        self.assertRaises(ValueError, writer.write_rows,
+                self.pixels + self.pixels[:3 * self.width])
+
+    def test_missing_rows(self):
+        writer = png_writer.PNGWriter(StringIO.StringIO(),
+                (self.width, self.height))
+        writer.write_rows(self.pixels[:3 * self.width])
+
+        self.assertRaises(ValueError, writer.close)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests of the delta encoding of matplotlayers.backends.remote."""
+
+import unittest
+import numpy
+import matplotlayers.backends.remote as remote
+
+
+class TestDeltaEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.random = numpy.random.RandomState(0)
+        self.shape = (100, 70)
+        self.encoder = remote.DeltaEncoder(tile = 16)
+        self.decoder = remote.DeltaDecoder()
+
+    def frame(self, shape = None):
+        if shape is None:
+            shape = self.shape
+
+        (width, height) = shape
+        return self.random.randint(0, 256, (height, width, 3)).\
+                astype(numpy.uint8)
+
+    def transfer(self, image):
+        """Encode and decode IMAGE, and return the rectangles sent."""
+
+        (height, width) = image.shape[:2]
+        (rects, payload) = self.encoder.encode((width, height),
+                image.tostring())
+        self.assertEqual(sum(rect[4] for rect in rects), len(payload))
+
+        decoded = self.decoder.decode((width, height), rects, payload)
+        self.assertTrue((decoded == image).all())
+
+        return rects
+
+    def test_first_frame(self):
+        (width, height) = self.shape
+
+        self.assertEqual([rect[:4] for rect in self.transfer(self.frame())],
+                [[0, 0, width, height]])
+
+    def test_unchanged(self):
+        image = self.frame()
+        self.transfer(image)
+
+        self.assertEqual(self.transfer(image.copy()), [])
+
+    def test_changed_pixels(self):
+        """Only the tiles holding changed pixels are sent."""
+
+        image = self.frame()
+        self.transfer(image)
+
+        image = image.copy()
+        image[5, 40] = 255 - image[5, 40]
+        image[69, 99] = 255 - image[69, 99]
+
+        rects = self.transfer(image)
+        self.assertEqual([rect[:4] for rect in rects],
+                [[32, 0, 16, 16], [96, 64, 4, 6]])
+
+    def test_changed_row(self):
+        """Neighbouring tiles in a row are joined."""
+
+        image = self.frame()
+        self.transfer(image)
+
+        image = image.copy()
+        image[20, 10:60] = 255 - image[20, 10:60]
+
+        self.assertEqual([rect[:4] for rect in self.transfer(image)],
+                [[0, 16, 64, 16]])
+
+    def test_resize(self):
+        """Frames of a new shape are sent as a whole."""
+
+        self.transfer(self.frame())
+
+        self.assertEqual(
+                [rect[:4] for rect in self.transfer(self.frame((30, 20)))],
+                [[0, 0, 30, 20]])
+
+    def test_random_changes(self):
+        image = self.frame()
+        self.transfer(image)
+
+        for index in xrange(10):
+            image = image.copy()
+            (rows, columns) = (self.random.randint(0, 70, 5),
+                    self.random.randint(0, 100, 5))
+            image[rows, columns] = self.random.randint(0, 256, (5, 3))
+            self.transfer(image)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests of the ResultCache of matplotlayers.backends.service."""
+
+import unittest
+import matplotlayers.backends.service as service
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = service.ResultCache(10)
+
+    def test_get(self):
+        self.cache.put('a', 'aaa')
+
+        self.assertEqual(self.cache.get('a'), 'aaa')
+        self.assertEqual(self.cache.get('b'), None)
+
+    def test_eviction(self):
+        """The least recently used images are dropped first."""
+
+        self.cache.put('a', 'aaaa')
+        self.cache.put('b', 'bbbb')
+
+        # 'a' is used more recently than 'b' now.
+        self.cache.get('a')
+        self.cache.put('c', 'cc')
+        self.assertEqual(self.cache.bytes, 10)
+
+        self.cache.put('d', 'd')
+        self.assertEqual(self.cache.get('b'), None)
+        self.assertEqual(self.cache.get('a'), 'aaaa')
+        self.assertEqual(self.cache.get('c'), 'cc')
+        self.assertEqual(self.cache.get('d'), 'd')
+        self.assertEqual(self.cache.bytes, 7)
+
+    def test_replace(self):
+        self.cache.put('a', 'aaaa')
+        self.cache.put('a', 'aa')
+
+        self.assertEqual(self.cache.get('a'), 'aa')
+        self.assertEqual(self.cache.bytes, 2)
+
+    def test_too_large(self):
+        """Images larger than the cache are not stored, and do not drop
+        the others."""
+
+        self.cache.put('a', 'aaaa')
+        self.cache.put('b', 'b' * 11)
+
+        self.assertEqual(self.cache.get('b'), None)
+        self.assertEqual(self.cache.get('a'), 'aaaa')
+        self.assertEqual(self.cache.bytes, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
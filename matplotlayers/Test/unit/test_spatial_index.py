@@ -0,0 +1,94 @@
+"""Tests of matplotlayers.spatial_index."""
+
+import unittest
+import numpy
+import matplotlayers.spatial_index as spatial_index
+
+
+def brute_force(x, y, px, py, xscale, yscale):
+    """Return (index, distance) of the finite point nearest to (PX, PY)."""
+
+    distances = numpy.hypot((x - px) / xscale, (y - py) / yscale)
+    distances[~numpy.isfinite(distances)] = numpy.inf
+    index = distances.argmin()
+
+    return (index, distances[index])
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.random = numpy.random.RandomState(0)
+        self.queries = self.random.uniform(-0.2, 1.2, (200, 2))
+
+    def check(self, x, y, xscale = 1.0, yscale = 1.0):
+        index = spatial_index.SpatialIndex(x, y)
+
+        for (px, py) in self.queries:
+            (expected_index, expected_distance) = \
+                    brute_force(x, y, px, py, xscale, yscale)
+            (found_index, found_distance) = index.nearest(px, py,
+                    xscale = xscale, yscale = yscale)
+
+            # Ties may be resolved either way.
+            self.assertAlmostEqual(found_distance, expected_distance)
+            self.assertAlmostEqual(numpy.hypot(
+                    (x[found_index] - px) / xscale,
+                    (y[found_index] - py) / yscale), expected_distance)
+
+        return index
+
+    def test_sorted(self):
+        x = numpy.sort(self.random.uniform(0, 1, 1000))
+        y = self.random.uniform(0, 1, 1000)
+
+        self.assertEqual(self.check(x, y).mode, 'sorted')
+
+    def test_grid(self):
+        x = self.random.uniform(0, 1, 1000)
+        y = self.random.uniform(0, 1, 1000)
+
+        self.assertEqual(self.check(x, y).mode, 'grid')
+
+    def test_scales(self):
+        x = self.random.uniform(0, 1, 1000)
+        y = self.random.uniform(0, 1, 1000)
+
+        self.check(x, y, xscale = 0.01, yscale = 2.0)
+        self.check(numpy.sort(x), y, xscale = 0.01, yscale = 2.0)
+
+    def test_clustered(self):
+        """Most points in one cell, a few far away."""
+
+        x = numpy.concatenate([self.random.uniform(0, 0.01, 990),
+                self.random.uniform(0, 1, 10)])
+        y = numpy.concatenate([self.random.uniform(0, 0.01, 990),
+                self.random.uniform(0, 1, 10)])
+
+        self.check(x, y)
+
+    def test_non_finite(self):
+        """Non-finite points are skipped, the indices refer to the arrays
+        handed over."""
+
+        x = numpy.array([0.0, numpy.nan, 2.0, 3.0, numpy.inf])
+        y = numpy.array([0.0, 1.0, numpy.nan, 3.0, 4.0])
+        index = spatial_index.SpatialIndex(x, y)
+
+        self.assertEqual(index.nearest(2.0, 2.0)[0], 3)
+        self.assertEqual(index.nearest(-1.0, 0.0)[0], 0)
+
+    def test_max_distance(self):
+        index = spatial_index.SpatialIndex([0.0, 1.0], [0.0, 0.0])
+
+        self.assertEqual(index.nearest(0.5, 0.6, max_distance = 0.5), None)
+        self.assertEqual(index.nearest(0.9, 0.1, max_distance = 0.5)[0], 1)
+
+    def test_empty(self):
+        index = spatial_index.SpatialIndex([numpy.nan], [0.0])
+
+        self.assertEqual(index.nearest(0.0, 0.0), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
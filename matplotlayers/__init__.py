@@ -1,6 +1,20 @@
-from stack import Stack
-from layers import *
+import lazy
 
 __version_tuple__ = (0, 1, 1, 'released')
 __version_string__ = '0.1.1'
 __version_date__ = '2011-05-02'
+
+# The classes are imported on first access, so that e.g. a program using
+# only Stack and LayerPlot does not import the other layers.
+lazy.install(__name__, {
+        'Stack': 'matplotlayers.stack',
+        'Grid': 'matplotlayers.grid',
+        'LayerPlot': 'matplotlayers.layers.layer_plot',
+        'LayerPColor': 'matplotlayers.layers.layer_pcolor',
+        'LayerPColorMesh': 'matplotlayers.layers.layer_pcolormesh',
+        'LayerPColorFast': 'matplotlayers.layers.layer_pcolorfast',
+        'LayerColorbar': 'matplotlayers.layers.layer_colorbar',
+        'LayerImshow': 'matplotlayers.layers.layer_imshow',
+        'stack': 'matplotlayers.stack',
+        'grid': 'matplotlayers.grid',
+        'layers': 'matplotlayers.layers'})
@@ -0,0 +1,407 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Saving and loading the Stacks of a figure together with their layers.
+
+A session is saved to a directory holding a manifest, with the settings of
+the Stacks and of the layers, and one .npy file per array::
+
+    matplotlayers.archive.save('session', [stack1, stack2])
+
+    stacks = matplotlayers.archive.load('session', figure)
+
+The arrays are memory-mapped when loading, so that loading is fast also for
+large sessions.  The data is read from disk when the layers render.
+
+The layers are recreated from their settings (see Layer.get_settings()).
+Layers and Grids referenced by several layers or Stacks are saved once.
+Values which are neither arrays, layers, Grids nor plain Python values,
+e.g. locators, are pickled.  Loading unpickles them, which can run
+arbitrary code, so load only sessions from trusted sources."""
+
+import copy
+import json
+import os
+import pickle
+import numpy
+import matplotlayers.layer
+import matplotlayers.grid
+import matplotlayers.stack
+
+# The version of the manifest written.
+FORMAT = 1
+
+# The names of the manifest and of the file holding the pickled values.
+MANIFEST = 'manifest.json'
+OBJECTS = 'objects.pickle'
+
+
+def save(directory, stacks):
+    """Save the Stacks STACKS with their layers to DIRECTORY, which is
+    created if needed.  DIRECTORY must not hold a saved session yet, since
+    its arrays may be in use, memory-mapped by .load()."""
+
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        raise ValueError("Directory %r holds a saved session already." % \
+                directory)
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    encoder = _Encoder(directory)
+
+    manifest = {
+            'format': FORMAT,
+            'stacks': [encoder.encode_stack(stack) for stack in stacks]}
+    manifest['layers'] = encoder.layers
+    manifest['grids'] = encoder.grids
+
+    stream = open(os.path.join(directory, OBJECTS), 'wb')
+    try:
+        pickle.dump(encoder.objects, stream, pickle.HIGHEST_PROTOCOL)
+    finally:
+        stream.close()
+
+    # The manifest comes last, marking the session complete.
+    stream = open(os.path.join(directory, MANIFEST), 'w')
+    try:
+        json.dump(manifest, stream, indent = 1, sort_keys = True)
+    finally:
+        stream.close()
+
+
+def load(directory, figure, mmap_mode = 'r'):
+    """Load the Stacks saved in DIRECTORY into the matplotlib.figure.Figure
+    FIGURE, and return them.  MMAP_MODE is handed over to numpy.load(),
+    None reads the arrays into memory at once.  DIRECTORY must be trusted,
+    since its pickled values can run arbitrary code when loaded."""
+
+    stream = open(os.path.join(directory, MANIFEST))
+    try:
+        manifest = json.load(stream)
+    finally:
+        stream.close()
+
+    if manifest['format'] > FORMAT:
+        raise ValueError("Session %r has been saved in a newer format." % \
+                directory)
+
+    stream = open(os.path.join(directory, OBJECTS), 'rb')
+    try:
+        objects = pickle.load(stream)
+    finally:
+        stream.close()
+
+    decoder = _Decoder(directory, manifest, objects, mmap_mode)
+
+    return [decoder.decode_stack(figure, record)
+            for record in manifest['stacks']]
+
+#
+# Encoding ...
+#
+
+
+class _Encoder:
+    """Turns Stacks and layers into the JSON records of the manifest,
+    saving the arrays along the way."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+        # The records of the layers and Grids, their indices by id() of the
+        # instance, and the pickled objects.
+        self.layers = []
+        self.layer_indices = {}
+        self.grids = []
+        self.grid_indices = {}
+        self.objects = []
+
+        # The file names of the arrays saved, by id() of the array.  The
+        # arrays are kept alive to keep their id()s unique.
+        self.array_files = {}
+        self.arrays = []
+
+    def encode_stack(self, stack):
+        """Return the record of Stack STACK."""
+
+        layers = stack.get_layers()
+
+        return {
+                'position': list(stack.axes.get_position().bounds),
+                'polar': getattr(stack.axes, 'name', None) == 'polar',
+                'title': stack.get_title(),
+                'title_kwargs': self.encode(stack.title_kwargs),
+                'xlabel': stack.get_xlabel(),
+                'ylabel': stack.get_ylabel(),
+                'xlim': self.encode(stack.xlim),
+                'ylim': self.encode(stack.ylim),
+                'autoscale_x_on': stack.autoscale_x_on,
+                'autoscale_y_on': stack.autoscale_y_on,
+                'colorbar': stack.colorbar,
+                'locator_x': self.encode(_detach_locator(stack.locator_x)),
+                'locator_y': self.encode(_detach_locator(stack.locator_y)),
+                'layers': [self.encode_layer(layer) for layer in layers],
+                'visible': [stack.get_layer_visible(layer)
+                    for layer in layers],
+                'zorder': [stack.get_layer_zorder(layer)
+                    for layer in layers],
+                'rasterized': [stack.get_layer_rasterized(layer)
+                    for layer in layers]}
+
+    def encode_layer(self, layer):
+        """Return the index of the record of LAYER, creating the record on
+        first use."""
+
+        if id(layer) not in self.layer_indices:
+            self.layer_indices[id(layer)] = len(self.layers)
+
+            # Reserve the index before encoding the settings, which may
+            # reference other layers.
+            record = {
+                    'module': layer.__class__.__module__,
+                    'class': layer.__class__.__name__}
+            self.layers.append(record)
+            record['settings'] = self.encode(layer.get_settings())
+
+        return self.layer_indices[id(layer)]
+
+    def encode_grid(self, grid):
+        """Return the index of the record of GRID, creating the record on
+        first use."""
+
+        if id(grid) not in self.grid_indices:
+            self.grid_indices[id(grid)] = len(self.grids)
+            self.grids.append({
+                    'X': self.encode(grid.X),
+                    'Y': self.encode(grid.Y)})
+
+        return self.grid_indices[id(grid)]
+
+    def encode_array(self, array):
+        """Save ARRAY to a .npy file, and return the file name."""
+
+        if id(array) not in self.array_files:
+            filename = 'array%04d.npy' % len(self.arrays)
+            numpy.save(os.path.join(self.directory, filename), array)
+
+            self.array_files[id(array)] = filename
+            self.arrays.append(array)
+
+        return self.array_files[id(array)]
+
+    def encode(self, value):
+        """Return the JSON representation of VALUE.  Everything but None,
+        numbers, strings, and lists is represented by a dict with a single
+        key telling the kind of value."""
+
+        if value is None or isinstance(value, (bool, int, long, float,
+                basestring)):
+            return value
+
+        # Layers are keyconf.Configurations, which may be dicts.
+
+        if isinstance(value, matplotlayers.layer.Layer):
+            return {'layer': self.encode_layer(value)}
+
+        if isinstance(value, matplotlayers.grid.Grid):
+            return {'grid': self.encode_grid(value)}
+
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+
+        if isinstance(value, tuple):
+            return {'tuple': [self.encode(item) for item in value]}
+
+        if isinstance(value, dict) and \
+                all(isinstance(key, basestring) for key in value.keys()):
+            return {'dict': dict((key, self.encode(item))
+                    for (key, item) in value.items())}
+
+        if isinstance(value, numpy.ndarray) and value.dtype != object:
+            if isinstance(value, numpy.ma.MaskedArray):
+                return {'masked_array': [
+                        self.encode_array(value.data),
+                        self.encode_array(numpy.ma.getmaskarray(value))]}
+
+            return {'array': self.encode_array(value)}
+
+        if isinstance(value, numpy.generic):
+            return self.encode(value.item())
+
+        self.objects.append(value)
+        return {'object': len(self.objects) - 1}
+
+
+def _detach_locator(locator):
+    """Return LOCATOR, or a copy of it not referring to the axis it has
+    been set to.  Pickling the axis would pull in the axes and the whole
+    figure."""
+
+    if getattr(locator, 'axis', None) is None:
+        return locator
+
+    locator = copy.copy(locator)
+    locator.axis = None
+
+    return locator
+
+#
+# Decoding ...
+#
+
+
+class _Decoder:
+    """Recreates the Stacks and layers from the records of the manifest."""
+
+    def __init__(self, directory, manifest, objects, mmap_mode):
+        self.directory = directory
+        self.manifest = manifest
+        self.objects = objects
+        self.mmap_mode = mmap_mode
+
+        # The layers and Grids created, by index.
+        self.layers = {}
+        self.grids = {}
+
+    def decode_stack(self, figure, record):
+        """Return a new Stack in FIGURE as described by RECORD."""
+
+        (left, bottom, width, height) = record['position']
+
+        stack = matplotlayers.stack.Stack(figure,
+                left = left, bottom = bottom, width = width, height = height,
+                polar = record['polar'],
+                autoscale_x_on = record['autoscale_x_on'],
+                autoscale_y_on = record['autoscale_y_on'],
+                colorbar = self.decode(record['colorbar']),
+                locator_x = self.decode(record['locator_x']),
+                locator_y = self.decode(record['locator_y']))
+
+        with stack.batch():
+            stack.set_title(self.decode(record['title']),
+                    **_keywords(self.decode(record['title_kwargs'])))
+            stack.set_xlabel(self.decode(record['xlabel']))
+            stack.set_ylabel(self.decode(record['ylabel']))
+
+            if record['xlim'] is not None:
+                stack.set_xlim(self.decode(record['xlim']))
+            if record['ylim'] is not None:
+                stack.set_ylim(self.decode(record['ylim']))
+
+        for (index, visible, zorder, rasterized) in zip(record['layers'],
+                record['visible'], record['zorder'], record['rasterized']):
+            layer = self.decode_layer(index)
+            stack.add_layer(layer)
+            stack.set_layer_visible(layer, visible)
+            stack.set_layer_zorder(layer, zorder)
+            stack.set_layer_rasterized(layer, rasterized)
+
+        return stack
+
+    def decode_layer(self, index):
+        """Return the layer with index INDEX, creating it on first use."""
+
+        if index not in self.layers:
+            record = self.manifest['layers'][index]
+
+            module = __import__(str(record['module']), {}, {},
+                    [str(record['class'])])
+            cls = getattr(module, str(record['class']))
+            if not issubclass(cls, matplotlayers.layer.Layer):
+                raise ValueError("%s.%s is not a layer class." % \
+                        (record['module'], record['class']))
+
+            # Register the layer before decoding the settings, which may
+            # reference other layers.
+            layer = cls()
+            self.layers[index] = layer
+            layer.configure(**_keywords(self.decode(record['settings'])))
+
+        return self.layers[index]
+
+    def decode_grid(self, index):
+        """Return the Grid with index INDEX, creating it on first use."""
+
+        if index not in self.grids:
+            record = self.manifest['grids'][index]
+            self.grids[index] = matplotlayers.grid.Grid(
+                    self.decode(record['X']), self.decode(record['Y']))
+
+        return self.grids[index]
+
+    def decode_array(self, filename):
+        """Return the array saved in FILENAME."""
+
+        return numpy.load(os.path.join(self.directory, filename),
+                mmap_mode = self.mmap_mode)
+
+    def decode(self, value):
+        """Return the value represented by the JSON VALUE, see
+        _Encoder.encode()."""
+
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+
+        if isinstance(value, unicode):
+            return _string(value)
+
+        if not isinstance(value, dict):
+            return value
+
+        ((kind, content),) = value.items()
+
+        if kind == 'tuple':
+            return tuple(self.decode(item) for item in content)
+        elif kind == 'dict':
+            return dict((_string(key), self.decode(item))
+                    for (key, item) in content.items())
+        elif kind == 'layer':
+            return self.decode_layer(content)
+        elif kind == 'grid':
+            return self.decode_grid(content)
+        elif kind == 'array':
+            return self.decode_array(content)
+        elif kind == 'masked_array':
+            (data, mask) = content
+            return numpy.ma.MaskedArray(self.decode_array(data),
+                    mask = self.decode_array(mask), copy = False)
+        elif kind == 'object':
+            return self.objects[content]
+
+        raise ValueError("Unknown kind of value %r." % kind)
+
+
+def _string(value):
+    """Return the unicode VALUE read from JSON as str if it is ASCII."""
+
+    try:
+        return str(value)
+    except UnicodeEncodeError:
+        return value
+
+
+def _keywords(kwargs):
+    """Return KWARGS with str keys, as needed for **KWARGS."""
+
+    return dict((str(key), value) for (key, value) in kwargs.items())
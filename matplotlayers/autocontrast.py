@@ -0,0 +1,193 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Automatic colour limits from robust percentiles of the data in view."""
+
+import numpy
+
+# Percentiles used when autocontrast is just turned on.
+DEFAULT_PERCENTILES = (1, 99)
+
+# Maximum number of data values sampled for one estimation.
+DEFAULT_MAX_SAMPLES = 2 ** 16
+
+
+def estimate_limits(C, rows = None, columns = None,
+        percentiles = None, max_samples = None):
+    """Estimate the PERCENTILES (a (low, high) tuple, default
+    DEFAULT_PERCENTILES) of the two-dimensional data C, restricted to the
+    index ranges ROWS and COLUMNS ((start, stop) tuples, default all).
+
+    At most about MAX_SAMPLES values (default DEFAULT_MAX_SAMPLES) are used
+    by sampling the region with a stride, so that the cost is bounded
+    irrespective of the size of C.  Masked and non-finite values are
+    ignored.  Returns (vmin, vmax), or None if there are no valid values."""
+
+    if percentiles is None:
+        percentiles = DEFAULT_PERCENTILES
+    if max_samples is None:
+        max_samples = DEFAULT_MAX_SAMPLES
+    if rows is None:
+        rows = (0, C.shape[0])
+    if columns is None:
+        columns = (0, C.shape[1])
+
+    # Choose the stride, the same in both dimensions ...
+
+    count = (rows[1] - rows[0]) * (columns[1] - columns[0])
+    if count <= 0:
+        return None
+    stride = max(1, int(numpy.ceil(numpy.sqrt(float(count) / max_samples))))
+
+    # Sample the region ...
+    #
+    # Slicing gives a view, only the sampled values are copied.
+
+    sample = numpy.ma.asarray(
+            C[rows[0]:rows[1]:stride, columns[0]:columns[1]:stride])
+    values = sample.compressed()
+    values = values[numpy.isfinite(values)]
+
+    if values.size == 0:
+        return None
+
+    (vmin, vmax) = numpy.percentile(values, list(percentiles))
+    return (vmin, vmax)
+
+
+def index_range(coordinates, n, lim):
+    """Return the (start, stop) range of the N data rows or columns, whose
+    one-dimensional COORDINATES (edges or centers) are visible within the
+    limits LIM.  Non-monotonic COORDINATES give the full range.  Returns
+    None if nothing is visible."""
+
+    coordinates = numpy.asarray(coordinates)
+    (low, high) = (min(lim), max(lim))
+    length = len(coordinates)
+
+    if length < 2:
+        return (0, n)
+
+    steps = numpy.diff(coordinates)
+    if (steps >= 0).all():
+        reverse = False
+    elif (steps <= 0).all():
+        reverse = True
+        coordinates = coordinates[::-1]
+    else:
+        return (0, n)
+
+    # Include the coordinate just outside of each limit, since its cell
+    # may be visible partially.
+    start = numpy.searchsorted(coordinates, low, 'right') - 1
+    stop = numpy.searchsorted(coordinates, high, 'left') + 1
+
+    if reverse:
+        (start, stop) = (length - stop, length - start)
+
+    (start, stop) = (max(0, start), min(n, stop))
+    if stop <= start:
+        return None
+
+    return (start, stop)
+
+
+class AutoContrast:
+    """Keeps the colour limits of a matplotlib artist at robust percentiles
+    of the data in view of its axes.
+
+    The limits are updated whenever the view limits of the axes change.
+    The LayerColorbar fed by the layer, if any, is handed the artist again
+    after each update."""
+
+    def __init__(self, artist, C, x, y,
+            percentiles = None,
+            max_samples = None,
+            layer_colorbar = None):
+        """ARTIST is the matplotlib artist colormapping the two-dimensional
+        data C.  X and Y are the one-dimensional coordinates of the columns
+        and rows of C, respectively.  PERCENTILES and MAX_SAMPLES are handed
+        over to estimate_limits().  LAYER_COLORBAR is an optional
+        matplotlayers.LayerColorbar instance to be notified."""
+
+        self.artist = artist
+        self.C = C
+        self.x = x
+        self.y = y
+        self.percentiles = percentiles
+        self.max_samples = max_samples
+        self.layer_colorbar = layer_colorbar
+
+        self.axes = None
+        self.connections = []
+
+    def connect(self, axes):
+        """Update the colour limits for the current view of AXES, and
+        follow later changes of the view limits of AXES."""
+
+        self.axes = axes
+        self.connections = [
+                axes.callbacks.connect('xlim_changed', self.limits_changed),
+                axes.callbacks.connect('ylim_changed', self.limits_changed)]
+
+        self.update()
+
+    def disconnect(self):
+        """Stop following the view limits."""
+
+        for connection in self.connections:
+            self.axes.callbacks.disconnect(connection)
+        self.connections = []
+
+    def limits_changed(self, axes):
+        """Called by matplotlib when the view limits of AXES changed."""
+
+        # The axes might have been cleared, leaving us behind.
+        if self.artist not in axes.collections and \
+                self.artist not in axes.images:
+            self.disconnect()
+            return
+
+        self.update()
+
+    def update(self):
+        """Set the colour limits from the data in view."""
+
+        rows = index_range(self.y, self.C.shape[0], self.axes.get_ylim())
+        columns = index_range(self.x, self.C.shape[1], self.axes.get_xlim())
+
+        if rows is None or columns is None:
+            # Nothing in view, keep the limits.
+            return
+
+        limits = estimate_limits(self.C, rows, columns,
+                percentiles = self.percentiles,
+                max_samples = self.max_samples)
+
+        if limits is None or tuple(limits) == tuple(self.artist.get_clim()):
+            return
+
+        self.artist.set_clim(*limits)
+
+        if self.layer_colorbar is not None:
+            self.layer_colorbar.set_mappable(self.artist)
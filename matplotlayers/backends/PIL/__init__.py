@@ -1 +1,4 @@
-from matplotlayers.backends.PIL.figure_canvas import FigureCanvasPIL
+import matplotlayers.lazy
+
+matplotlayers.lazy.install(__name__, {
+        'FigureCanvasPIL': 'matplotlayers.backends.PIL.figure_canvas'})
@@ -0,0 +1,387 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Rendering in background threads, for event loops which must not block.
+
+FigureCanvasPIL.render_async() returns at once with a RenderFuture, while
+the figure is rendered by a RenderExecutor.  matplotlib figures must not
+be used by several threads at a time, so the executor runs the jobs of
+each figure one after the other, while different figures are rendered
+concurrently.
+
+An asyncio event loop (trollius on Python 2) waits for the future after
+wrapping it by wrap_for_loop()::
+
+    image = yield From(wrap_for_loop(
+            canvas.render_async((800, 600), timeout = 5), loop))
+
+Other event loops are notified by a callback, called in the thread of
+the executor, e.g. with Tornado::
+
+    future.add_done_callback(
+            lambda future: io_loop.add_callback(deliver, future))
+
+where deliver() calls future.result(), which returns the PIL image or
+raises.  Renders not started yet can be cancelled, and a render not done
+within its timeout fails with RenderTimeout.  A render running cannot be
+interrupted, it finishes in the background, and its figure stays busy
+meanwhile.
+
+Changes to a figure should go through the same executor, so that they do
+not interfere with renders::
+
+    executor.submit(figure, stack.render)"""
+
+import collections
+import logging
+import sys
+import threading
+import time
+import Queue
+
+# The states of a RenderFuture.
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+CANCELLED = 'cancelled'
+
+
+class RenderTimeout(Exception):
+    """Raised when a render is not done in time."""
+
+
+class RenderCancelled(Exception):
+    """Raised by RenderFuture.result() when the render has been
+    cancelled."""
+
+
+class RenderFuture:
+    """The result of a job submitted to a RenderExecutor."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._state = PENDING
+
+        # The result, or the sys.exc_info() of the failure.
+        self._result = None
+        self._exc_info = None
+
+        self._callbacks = []
+
+    #
+    # State ...
+    #
+
+    def cancel(self):
+        """Cancel the job if it has not started yet.  Returns whether the
+        job is cancelled."""
+
+        with self._condition:
+            if self._state == CANCELLED:
+                return True
+            if self._state != PENDING:
+                return False
+
+            self._state = CANCELLED
+            self._condition.notify_all()
+
+        self._call_callbacks()
+
+        return True
+
+    def cancelled(self):
+        """Return whether the job has been cancelled."""
+
+        return self._state == CANCELLED
+
+    def running(self):
+        """Return whether the job is running."""
+
+        return self._state == RUNNING
+
+    def done(self):
+        """Return whether the job has finished, failed, or been
+        cancelled."""
+
+        return self._state in (FINISHED, CANCELLED)
+
+    def result(self, timeout = None):
+        """Return the result of the job, waiting at most TIMEOUT seconds,
+        or for ever if it is None.  Raises RenderTimeout if the job is not
+        done then, RenderCancelled if it has been cancelled, and the
+        exception of the job if it has failed."""
+
+        with self._condition:
+            if timeout is None:
+                while not self.done():
+                    self._condition.wait()
+            else:
+                deadline = time.time() + timeout
+                while not self.done():
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise RenderTimeout("The render has not been done "
+                                "within %g seconds." % timeout)
+                    self._condition.wait(remaining)
+
+            if self._state == CANCELLED:
+                raise RenderCancelled("The render has been cancelled.")
+
+            if self._exc_info is not None:
+                (error_type, error, error_traceback) = self._exc_info
+                raise error_type, error, error_traceback
+
+            return self._result
+
+    def add_done_callback(self, callback):
+        """Call CALLBACK with the future when it is done, at once if it is
+        done already.  CALLBACK is called in the thread finishing the
+        job."""
+
+        with self._condition:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+
+        callback(self)
+
+    #
+    # Used by RenderExecutor ...
+    #
+
+    def _start(self):
+        """Mark the job running.  Returns False if it must not run."""
+
+        with self._condition:
+            if self._state != PENDING:
+                return False
+
+            self._state = RUNNING
+            return True
+
+    def _finish(self, result = None, exc_info = None):
+        """Finish the job with RESULT, or with the failure EXC_INFO.
+        Ignored if the job is done already, e.g. failed by its timeout."""
+
+        with self._condition:
+            if self.done():
+                return
+
+            self._state = FINISHED
+            self._result = result
+            self._exc_info = exc_info
+            self._condition.notify_all()
+
+        self._call_callbacks()
+
+    def _expire(self, timeout):
+        """Fail the job with RenderTimeout, if it is not done yet."""
+
+        try:
+            raise RenderTimeout("The render has not been done within %g "
+                    "seconds." % timeout)
+        except RenderTimeout:
+            self._finish(exc_info = sys.exc_info())
+
+    def _call_callbacks(self):
+        (callbacks, self._callbacks) = (self._callbacks, [])
+        for callback in callbacks:
+            # A failing callback, e.g. of a closed event loop, must neither
+            # keep the others from being called, nor end the thread.
+            try:
+                callback(self)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                        "Callback of a RenderFuture failed.")
+
+
+class RenderExecutor:
+    """Runs jobs in threads, one job per figure at a time."""
+
+    def __init__(self, threads = None):
+        """THREADS is the number of figures rendered concurrently, default
+        2."""
+
+        if threads is None:
+            threads = 2
+
+        self._lock = threading.Lock()
+
+        # The figures whose next job can run, by id().
+        self._ready = Queue.Queue()
+
+        # The jobs waiting of each figure having jobs, including the one
+        # running, by id() of the figure.  The jobs hold the figure, so that
+        # the id() stays unique meanwhile.
+        self._jobs = {}
+
+        self.threads = []
+        for index in xrange(threads):
+            thread = threading.Thread(target = self._work)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, figure, function, *args, **kwargs):
+        """Call FUNCTION with ARGS in a thread, when no other job of FIGURE
+        is running, and return a RenderFuture of its result.  With the
+        keyword argument TIMEOUT, the future fails with RenderTimeout when
+        the job is not done within TIMEOUT seconds."""
+
+        timeout = kwargs.pop('timeout', None)
+        if len(kwargs) > 0:
+            raise TypeError("Unexpected keyword arguments %s." % \
+                    ', '.join(kwargs.keys()))
+
+        future = RenderFuture()
+
+        if timeout is not None:
+            timer = threading.Timer(timeout, future._expire, (timeout,))
+            timer.daemon = True
+            future.add_done_callback(lambda future: timer.cancel())
+            timer.start()
+
+        key = id(figure)
+        with self._lock:
+            if key in self._jobs:
+                # Runs when the jobs before are done.
+                self._jobs[key].append((future, figure, function, args))
+            else:
+                self._jobs[key] = collections.deque(
+                        [(future, figure, function, args)])
+                self._ready.put(key)
+
+        return future
+
+    def _work(self):
+        """The loop of the threads, ended by a None key."""
+
+        while True:
+            key = self._ready.get()
+            if key is None:
+                return
+
+            with self._lock:
+                (future, figure, function, args) = \
+                        self._jobs[key].popleft()
+
+            try:
+                # Cancelled or expired jobs are skipped.
+                if future._start():
+                    try:
+                        result = function(*args)
+                    except Exception:
+                        future._finish(exc_info = sys.exc_info())
+                    else:
+                        future._finish(result)
+
+            finally:
+                # The next job of the figure must run in any case.
+                with self._lock:
+                    if len(self._jobs[key]) == 0:
+                        del self._jobs[key]
+                    else:
+                        self._ready.put(key)
+
+    def shutdown(self):
+        """Cancel the jobs not started yet, and end the threads after the
+        jobs running."""
+
+        with self._lock:
+            futures = [future for jobs in self._jobs.values()
+                    for (future, figure, function, args) in jobs]
+
+        # Outside of the lock, since the callbacks may submit.
+        for future in futures:
+            future.cancel()
+
+        for thread in self.threads:
+            self._ready.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+def wrap_for_loop(future, loop):
+    """Return a future of the asyncio (or trollius) event loop LOOP, done
+    with the result of the RenderFuture FUTURE, so that a coroutine can wait
+    for it.  Cancelling the returned future cancels FUTURE, if it has not 
+    started yet."""
+
+    if hasattr(loop, 'create_future'):
+        loop_future = loop.create_future()
+    else:
+        # trollius before asyncio 3.5.2.
+        import trollius
+        loop_future = trollius.Future(loop = loop)
+
+    def transfer(future):
+        # Called in the thread of the loop.
+        if loop_future.cancelled():
+            return
+
+        if future.cancelled():
+            loop_future.cancel()
+            return
+
+        try:
+            result = future.result()
+        except Exception, error:
+            loop_future.set_exception(error)
+        else:
+            loop_future.set_result(result)
+
+    def cancel(loop_future):
+        if loop_future.cancelled():
+            future.cancel()
+
+    loop_future.add_done_callback(cancel)
+    future.add_done_callback(
+            lambda future: loop.call_soon_threadsafe(transfer, future))
+
+    return loop_future
+
+# The executor used when none is given, created on first use.
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def get_default_executor():
+    """Return the executor used by FigureCanvasPIL.render_async() when
+    none is given."""
+
+    global _default_executor
+
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = RenderExecutor()
+
+        return _default_executor
+
+
+def set_default_executor(executor):
+    """Use the RenderExecutor EXECUTOR when none is given."""
+
+    global _default_executor
+
+    with _default_lock:
+        _default_executor = executor
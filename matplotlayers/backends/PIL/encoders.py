@@ -0,0 +1,200 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Encoding rendered RGB data to image files, optionally in background
+threads.
+
+encode() chooses the encoder by the file name extension:
+
+*   ``.png``: zlib compressed, at the given level (1 is fastest),
+*   ``.ppm``: uncompressed, written as is,
+*   ``.npy``: a numpy array of shape (height, width, 3), uncompressed,
+*   any other: by PIL, e.g. ``.bmp`` or ``.jpg``.
+
+An EncoderPool encodes in background threads, so that the next figure can
+be rendered meanwhile::
+
+    pool = matplotlayers.backends.PIL.encoders.EncoderPool()
+    for figure in figures:
+        canvas = matplotlayers.backends.PIL.FigureCanvasPIL(figure)
+        canvas.save(filename, (800, 600), level = 1, pool = pool)
+    pool.close()
+
+zlib releases the interpreter lock while compressing, so that PNG files
+are also encoded in parallel."""
+
+import os
+import Queue
+import threading
+import traceback
+import numpy
+import PIL.Image
+import matplotlayers.timing
+import matplotlayers.backends.PIL.png_writer
+
+# The zlib compression level used for PNG files when not given.
+DEFAULT_LEVEL = 6
+
+#
+# Encoders ...
+#
+
+
+def encode_png(filename, shape, data, level = None):
+    """Write the RGB DATA of SHAPE (width, height) to the PNG file
+    FILENAME with zlib compression LEVEL (default DEFAULT_LEVEL)."""
+
+    if level is None:
+        level = DEFAULT_LEVEL
+
+    writer = matplotlayers.backends.PIL.png_writer.PNGWriter(filename,
+            shape, level = level)
+    writer.write_rows(data)
+    writer.close()
+
+
+def encode_ppm(filename, shape, data, level = None):
+    """Write the RGB DATA of SHAPE (width, height) to the binary PPM file
+    FILENAME.  LEVEL is ignored."""
+
+    stream = open(filename, 'wb')
+    try:
+        stream.write('P6\n%d %d\n255\n' % tuple(shape))
+        stream.write(data)
+    finally:
+        stream.close()
+
+
+def encode_npy(filename, shape, data, level = None):
+    """Save the RGB DATA of SHAPE (width, height) as a numpy array of
+    shape (height, width, 3) to FILENAME.  LEVEL is ignored."""
+
+    (width, height) = shape
+    numpy.save(filename, numpy.frombuffer(data, dtype = numpy.uint8).\
+            reshape((height, width, 3)))
+
+
+def encode_PIL(filename, shape, data, level = None):
+    """Save the RGB DATA of SHAPE (width, height) by PIL to FILENAME, the
+    format is determined by PIL from the extension.  LEVEL is ignored."""
+
+    # Wrap DATA without copying it.
+    image = PIL.Image.frombuffer('RGB', tuple(shape), data,
+            'raw', 'RGB', 0, 1)
+    image.save(filename)
+
+# The encoders by file name extension.  encode_PIL() is used for all others.
+ENCODERS = {
+        '.png': encode_png,
+        '.ppm': encode_ppm,
+        '.npy': encode_npy}
+
+
+def encode(filename, shape, data, level = None):
+    """Write the RGB DATA of SHAPE (width, height), as returned by
+    FigureCanvasPIL.output_RGB(), to FILENAME by the encoder of ENCODERS
+    for its extension.  LEVEL is the compression level for PNG files."""
+
+    extension = os.path.splitext(filename)[1].lower()
+    encoder = ENCODERS.get(extension, encode_PIL)
+
+    started = matplotlayers.timing.start()
+    encoder(filename, shape, data, level)
+    matplotlayers.timing.stop('FigureCanvasPIL encode', started)
+
+#
+# Encoding in the background ...
+#
+
+
+class EncoderPool:
+    """Encodes images by encode() in background threads."""
+
+    def __init__(self, threads = None, pending = None):
+        """THREADS is the number of threads, it defaults to 2.  At most
+        PENDING images, by default twice the number of threads, wait for
+        being encoded, .submit() blocks when more are submitted."""
+
+        if threads is None:
+            threads = 2
+        if pending is None:
+            pending = 2 * threads
+
+        self.queue = Queue.Queue(pending)
+
+        # The (filename, traceback) of the images failed since the last
+        # .join().
+        self.failures = []
+
+        self.threads = []
+        for index in xrange(threads):
+            thread = threading.Thread(target = self._work)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, filename, shape, data, level = None):
+        """Encode the image in the background, see encode()."""
+
+        self.queue.put((filename, shape, data, level))
+
+    def _work(self):
+        """The loop of the threads, ended by a None job."""
+
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+
+                try:
+                    encode(*job)
+                except Exception:
+                    self.failures.append((job[0], traceback.format_exc()))
+
+            finally:
+                self.queue.task_done()
+
+    def join(self):
+        """Wait until all images submitted are encoded.  Raises IOError if
+        some have failed."""
+
+        self.queue.join()
+
+        (failures, self.failures) = (self.failures, [])
+        if len(failures) > 0:
+            raise IOError("Failed to encode %s:\n%s" % \
+                    (', '.join(filename for (filename, error) in failures),
+                        '\n'.join(error for (filename, error) in failures)))
+
+    def close(self):
+        """Wait for the images submitted, see .join(), and end the
+        threads."""
+
+        try:
+            self.join()
+        finally:
+            for thread in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
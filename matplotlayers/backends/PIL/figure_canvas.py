@@ -24,8 +24,25 @@
 """Defines a Canvas for a matplotlib.figure.Figure instance to be rendered as 
 a PIL image."""
 
+import collections
+import itertools
+import multiprocessing
+import os
+import pickle
 import PIL.Image
 import matplotlib.backends.backend_agg as mpl_backend_agg
+import matplotlayers.timing
+import matplotlayers.backends.PIL.png_writer
+import matplotlayers.backends.PIL.encoders
+import matplotlayers.backends.PIL.background
+
+# The number of pixels per band rendered by .save_tiled(), when the band 
+# height isn't given.
+BAND_PIXELS = 2 ** 22
+
+# The most pixels .save_tiled() saves in formats other than PNG, which are
+# assembled in a PIL image of the full size.
+ASSEMBLED_PIXELS = 2 ** 26
 
 
 class FigureCanvasPIL:
@@ -38,7 +55,20 @@ class FigureCanvasPIL:
         self.figure = figure
 
     def output_PIL(self, shape):
-        """SHAPE is in pixels."""
+        """SHAPE is in pixels.  See matplotlayers.timing for measuring the
+        time needed."""
+
+        image_string = self.output_RGB(shape)
+
+        started = matplotlayers.timing.start()
+        image = PIL.Image.fromstring("RGB", shape, image_string)
+        matplotlayers.timing.stop('FigureCanvasPIL fromstring', started)
+
+        return image
+
+    def output_RGB(self, shape):
+        """Render the figure at SHAPE in pixels, and return the string of
+        RGB pixels, row by row from the top."""
 
         dpi = self.figure.dpi
         self.figure.set_size_inches(
@@ -46,8 +76,211 @@ class FigureCanvasPIL:
                 float(shape[1]) / dpi)
 
         agg_canvas = mpl_backend_agg.FigureCanvasAgg(self.figure)
+
+        started = matplotlayers.timing.start()
         agg_canvas.draw()
+        matplotlayers.timing.stop('FigureCanvasPIL draw', started)
+
+        started = matplotlayers.timing.start()
         image_string = agg_canvas.tostring_rgb()
+        matplotlayers.timing.stop('FigureCanvasPIL tostring_rgb', started)
 
-        image = PIL.Image.fromstring("RGB", shape, image_string)
-        return image
+        return image_string
+
+    def render_async(self, shape,
+            rgb = False,
+            executor = None,
+            timeout = None):
+        """Render the figure at SHAPE in pixels in the background, and
+        return at once with a RenderFuture of the PIL image, or of the
+        string of RGB pixels if RGB is true.  The render runs in the
+        RenderExecutor EXECUTOR, by default the one of
+        matplotlayers.backends.PIL.background.get_default_executor(), after
+        the other jobs of the figure there.  The future fails with
+        RenderTimeout if the render is not done within TIMEOUT seconds."""
+
+        if executor is None:
+            executor = matplotlayers.backends.PIL.background.\
+                    get_default_executor()
+
+        if rgb:
+            output = self.output_RGB
+        else:
+            output = self.output_PIL
+
+        return executor.submit(self.figure, output, shape,
+                timeout = timeout)
+
+    def save(self, filename, shape,
+            level = None,
+            pool = None):
+        """Render the figure at SHAPE in pixels and save it to FILENAME.
+        The encoder is chosen by the extension of FILENAME, see 
+        matplotlayers.backends.PIL.encoders, LEVEL is the compression 
+        level for PNG.  The RGB data is encoded without converting it to a
+        PIL image first, where possible.
+        
+        If the matplotlayers.backends.PIL.encoders.EncoderPool POOL is 
+        given, the image is encoded there in the background, and this 
+        returns as soon as the figure is rendered.  The figure can then be
+        changed and rendered again at once."""
+
+        image_string = self.output_RGB(shape)
+
+        if pool is None:
+            matplotlayers.backends.PIL.encoders.encode(filename, shape,
+                    image_string, level)
+        else:
+            pool.submit(filename, shape, image_string, level)
+
+    def save_tiled(self, filename, shape,
+            band_height = None,
+            processes = None):
+        """Save the figure rendered at SHAPE in pixels to FILENAME.  The 
+        figure is rendered in bands of BAND_HEIGHT rows, from top to bottom,
+        so that the Agg buffer holds only one band at a time.  BAND_HEIGHT 
+        defaults to BAND_PIXELS pixels per band.
+        
+        PNG files are encoded band by band, so that the memory needed is
+        bounded by the band size.  Other formats are assembled in a PIL
+        image of the full size before saving, and are refused with
+        ValueError above ASSEMBLED_PIXELS pixels.
+
+        With PROCESSES greater than 1, the bands are rendered in that many
+        worker processes.  Where processes are forked, the workers inherit
+        the figure.  Elsewhere the figure is pickled without its canvas,
+        which needs a matplotlib able to pickle figures, and ValueError is
+        raised if it cannot."""
+
+        (width, height) = shape
+
+        png = os.path.splitext(filename)[1].lower() == '.png'
+        if not png and width * height > ASSEMBLED_PIXELS:
+            raise ValueError("%dx%d pixels can be saved as PNG only." % \
+                    (width, height))
+
+        dpi = self.figure.dpi
+        self.figure.set_size_inches(
+                float(width) / dpi,
+                float(height) / dpi)
+
+        # Set the figure's canvas to Agg.
+        mpl_backend_agg.FigureCanvasAgg(self.figure)
+
+        if band_height is None:
+            band_height = max(1, BAND_PIXELS // width)
+
+        bands = [(top, min(band_height, height - top))
+                for top in xrange(0, height, band_height)]
+
+        rendered = itertools.izip(bands,
+                self._render_bands(shape, bands, processes))
+
+        if png:
+            writer = matplotlayers.backends.PIL.png_writer.PNGWriter(
+                    filename, shape)
+            for (band, data) in rendered:
+                writer.write_rows(data)
+            writer.close()
+
+        else:
+            image = PIL.Image.new('RGB', shape)
+            for ((top, rows), data) in rendered:
+                image.paste(PIL.Image.fromstring('RGB', (width, rows), data),
+                        (0, top))
+            image.save(filename)
+
+    def _render_bands(self, shape, bands, processes):
+        """Yield the RGB data of the BANDS of the figure at SHAPE, in order,
+        rendered in PROCESSES worker processes if it is greater than 1."""
+
+        if processes is None or processes <= 1:
+            for band in bands:
+                started = matplotlayers.timing.start()
+                data = render_band(self.figure, shape, band)
+                matplotlayers.timing.stop('FigureCanvasPIL band', started)
+
+                yield data
+
+            return
+
+        if hasattr(os, 'fork'):
+            figure = self.figure
+        else:
+            figure = _pickle_figure(self.figure)
+
+        pool = multiprocessing.Pool(processes, _initialise_worker, (figure,))
+        try:
+            # Keep only a few bands in flight, to bound the memory needed
+            # for the bands rendered but not written yet.
+            pending = collections.deque()
+            for band in bands:
+                pending.append(pool.apply_async(_render_worker_band,
+                        (shape, band)))
+                if len(pending) >= 2 * processes:
+                    yield pending.popleft().get()
+
+            while len(pending) > 0:
+                yield pending.popleft().get()
+
+        finally:
+            pool.terminate()
+
+
+def render_band(figure, shape, (top, rows)):
+    """Render ROWS rows, starting at row TOP counted from the top, of the
+    matplotlib.figure.Figure FIGURE set to SHAPE in pixels, and return them
+    as a string of RGB pixels.  The Agg renderer holds only the band."""
+
+    (width, height) = shape
+    dpi = figure.dpi
+
+    renderer = mpl_backend_agg.RendererAgg(width, rows, dpi)
+
+    # Shift the figure down, so that the band comes to lie in the
+    # renderer.  The shift is applied to all transforms derived from the
+    # figure's dpi transform.
+    bottom = height - top - rows
+    figure.dpi_scale_trans.clear().scale(dpi, dpi).translate(0, -bottom)
+    try:
+        figure.draw(renderer)
+    finally:
+        figure.dpi_scale_trans.clear().scale(dpi, dpi)
+
+    return renderer.tostring_rgb()
+
+#
+# Worker processes of FigureCanvasPIL.save_tiled() ...
+#
+
+# The figure rendered by the worker process.
+_worker_figure = None
+
+
+def _pickle_figure(figure):
+    """Return FIGURE pickled without its canvas, for worker processes not
+    forked."""
+
+    canvas = figure.canvas
+    figure.canvas = None
+    try:
+        return pickle.dumps(figure, pickle.HIGHEST_PROTOCOL)
+    except Exception, error:
+        raise ValueError("The figure cannot be handed over to processes "
+                "not forked: %s" % error)
+    finally:
+        figure.canvas = canvas
+
+
+def _initialise_worker(figure):
+    global _worker_figure
+
+    if isinstance(figure, str):
+        figure = pickle.loads(figure)
+        mpl_backend_agg.FigureCanvasAgg(figure)
+
+    _worker_figure = figure
+
+
+def _render_worker_band(shape, band):
+    return render_band(_worker_figure, shape, band)
@@ -0,0 +1,214 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Exporting sequences of frames, e.g. for movies.
+
+A FrameExporter applies per-frame updates of layers to the Stacks of a
+figure, renders each frame by one Agg canvas, and hands the RGB data over
+to an output, either an ImageSequence or a Pipe to a video encoder::
+
+    exporter = matplotlayers.backends.PIL.frames.FrameExporter(figure,
+            [stack])
+    frames = ([(layer, {'C': C})] for C in data)
+
+    output = matplotlayers.backends.PIL.frames.Pipe(
+            matplotlayers.backends.PIL.frames.ffmpeg_command('movie.mp4',
+                (800, 600)))
+    report = exporter.export(frames, output, (800, 600))
+
+The updates go through Stack.update_layer(), so that layers supporting it
+update their artists in place, and the axes need not be cleared and drawn
+again for each frame."""
+
+import subprocess
+import timeit
+import matplotlib.backends.backend_agg as mpl_backend_agg
+import matplotlayers.timing
+import matplotlayers.backends.PIL.encoders
+
+#
+# Outputs ...
+#
+
+
+class ImageSequence:
+    """Writes the frames to numbered image files, by
+    matplotlayers.backends.PIL.encoders."""
+
+    def __init__(self, pattern, level = None, pool = None):
+        """PATTERN is the file name with a format for the frame number,
+        e.g. 'frame%05d.png'.  LEVEL is the compression level for PNG files.
+        With the EncoderPool POOL, the frames are encoded in the
+        background."""
+
+        self.pattern = pattern
+        self.level = level
+        self.pool = pool
+
+    def write(self, index, shape, data):
+        """Write frame number INDEX, with RGB DATA of SHAPE."""
+
+        filename = self.pattern % index
+
+        if self.pool is None:
+            matplotlayers.backends.PIL.encoders.encode(filename, shape,
+                    data, self.level)
+        else:
+            self.pool.submit(filename, shape, data, self.level)
+
+    def close(self):
+        """Wait for the frames being encoded in the background."""
+
+        if self.pool is not None:
+            self.pool.join()
+
+
+class Pipe:
+    """Writes the raw RGB data of the frames to the standard input of a
+    process, e.g. ffmpeg, see ffmpeg_command()."""
+
+    def __init__(self, command):
+        """COMMAND is the argument list of the process started."""
+
+        self.command = command
+        self.process = subprocess.Popen(command, stdin = subprocess.PIPE)
+
+    def write(self, index, shape, data):
+        """Write the RGB DATA of frame number INDEX."""
+
+        self.process.stdin.write(data)
+
+    def close(self):
+        """Close the pipe, and wait for the process to finish.  Raises
+        IOError if it fails."""
+
+        self.process.stdin.close()
+        returncode = self.process.wait()
+
+        if returncode != 0:
+            raise IOError("%s exited with code %d." % \
+                    (self.command[0], returncode))
+
+
+def ffmpeg_command(filename, shape, rate = None, executable = None):
+    """Return the argument list of ffmpeg (or EXECUTABLE) encoding raw RGB
+    frames of SHAPE from its standard input at RATE frames per second
+    (default 25) to FILENAME, for Pipe."""
+
+    if rate is None:
+        rate = 25
+    if executable is None:
+        executable = 'ffmpeg'
+
+    return [executable, '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', '%dx%d' % tuple(shape), '-r', str(rate),
+            '-i', '-',
+            filename]
+
+#
+# Exporting ...
+#
+
+
+class FrameExporter:
+    """Renders frames of a figure with changing layers."""
+
+    def __init__(self, figure, stacks):
+        """FIGURE is the matplotlib.figure.Figure holding the Stacks
+        STACKS, whose layers are updated."""
+
+        self.figure = figure
+        self.stacks = stacks
+
+    def export(self, frames, output, shape):
+        """Render the FRAMES at SHAPE in pixels, and write them to OUTPUT.
+        Each frame is a sequence of (layer, kwargs), the layer is
+        configured with the kwargs before rendering the frame.  An empty
+        frame renders the figure unchanged.  OUTPUT is closed in the end.
+
+        Returns a dict with the number of 'frames', the 'seconds' needed,
+        the frames per second 'fps', the numbers of layer updates done
+        'in_place' and of those needing a 'redraw', and the statistics of
+        the frame durations (see matplotlayers.timing.summarize())."""
+
+        # The Stack of each layer.
+        stacks = {}
+        for stack in self.stacks:
+            for layer in stack.get_layers():
+                stacks[id(layer)] = stack
+
+        dpi = self.figure.dpi
+        self.figure.set_size_inches(
+                float(shape[0]) / dpi,
+                float(shape[1]) / dpi)
+
+        # The renderer of the canvas is kept as long as the size stays.
+        agg_canvas = mpl_backend_agg.FigureCanvasAgg(self.figure)
+
+        durations = []
+        in_place = 0
+        redrawn = 0
+
+        started = timeit.default_timer()
+
+        try:
+            for (index, frame) in enumerate(frames):
+                frame_started = timeit.default_timer()
+
+                for (layer, kwargs) in frame:
+                    if id(layer) not in stacks:
+                        raise ValueError("The layer %r is not in the "
+                                "Stacks exported." % layer)
+
+                    if stacks[id(layer)].update_layer(layer, **kwargs):
+                        in_place += 1
+                    else:
+                        redrawn += 1
+
+                for stack in self.stacks:
+                    stack.render()
+
+                draw_started = matplotlayers.timing.start()
+                agg_canvas.draw()
+                matplotlayers.timing.stop('FrameExporter draw', draw_started)
+
+                output.write(index, shape, agg_canvas.tostring_rgb())
+
+                durations.append(timeit.default_timer() - frame_started)
+
+        finally:
+            output.close()
+
+        seconds = timeit.default_timer() - started
+
+        report = {
+                'frames': len(durations),
+                'seconds': seconds,
+                'fps': len(durations) / seconds if seconds > 0 else 0.0,
+                'in_place': in_place,
+                'redrawn': redrawn}
+        if len(durations) > 0:
+            report.update(matplotlayers.timing.summarize(durations))
+
+        return report
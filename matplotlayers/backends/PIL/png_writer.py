@@ -0,0 +1,110 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the PNGWriter class, encoding an RGB image to PNG row by row, so
+that the image needs not to be held in memory as a whole."""
+
+import struct
+import zlib
+
+# The signature every PNG file starts with.
+SIGNATURE = '\x89PNG\r\n\x1a\n'
+
+
+class PNGWriter:
+    """Writes an 8-bit RGB PNG image to a file, taking the rows in bands
+    from top to bottom."""
+
+    def __init__(self, file, shape, level = None):
+        """FILE is a file name or an open binary file.  SHAPE is the
+        (width, height) of the image in pixels.  LEVEL is the zlib
+        compression level, it defaults to 6."""
+
+        if level is None:
+            level = 6
+
+        if isinstance(file, basestring):
+            self.stream = open(file, 'wb')
+            self.owns_stream = True
+        else:
+            self.stream = file
+            self.owns_stream = False
+
+        (self.width, self.height) = shape
+        self.rows_written = 0
+
+        self.compressor = zlib.compressobj(level)
+
+        self.stream.write(SIGNATURE)
+        # Bit depth 8, colour type 2 (RGB), default compression, filter,
+        # and no interlacing.
+        self._write_chunk('IHDR', struct.pack('>IIBBBBB',
+                self.width, self.height, 8, 2, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type, data):
+        """Write a chunk of type CHUNK_TYPE holding DATA."""
+
+        self.stream.write(struct.pack('>I', len(data)))
+        self.stream.write(chunk_type)
+        self.stream.write(data)
+        self.stream.write(struct.pack('>I',
+                zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    def write_rows(self, data):
+        """Write the next rows of the image.  DATA is a string of RGB
+        pixels, as returned by RendererAgg.tostring_rgb(), holding a whole
+        number of rows."""
+
+        row_size = 3 * self.width
+        (rows, remainder) = divmod(len(data), row_size)
+        if remainder != 0:
+            raise ValueError("The data does not hold a whole number of "
+                    "rows.")
+        if self.rows_written + rows > self.height:
+            raise ValueError("More rows than the height of the image.")
+
+        # Each row is preceded by its filter type, 0 means none.
+        filtered = ''.join(['\x00' + data[start:start + row_size]
+                for start in xrange(0, len(data), row_size)])
+
+        compressed = self.compressor.compress(filtered)
+        if len(compressed) > 0:
+            self._write_chunk('IDAT', compressed)
+
+        self.rows_written += rows
+
+    def close(self):
+        """Finish the image, and close the file if it has been opened by
+        us."""
+
+        if self.rows_written != self.height:
+            raise ValueError("%d of %d rows have been written." % \
+                    (self.rows_written, self.height))
+
+        self._write_chunk('IDAT', self.compressor.flush())
+        self._write_chunk('IEND', '')
+
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
@@ -1 +1,6 @@
-from matplotlayers.backends.stack_canvas import StackCanvas
+import matplotlayers.lazy
+
+matplotlayers.lazy.install(__name__, {
+        'StackCanvas': 'matplotlayers.backends.stack_canvas',
+        'StackLocator': 'matplotlayers.backends.stack_locator',
+        'EventDispatcher': 'matplotlayers.backends.event_dispatcher'})
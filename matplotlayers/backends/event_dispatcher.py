@@ -0,0 +1,207 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the EventDispatcher class, passing interaction events in figure
+coordinates on to the StackCanvas clients they apply to.
+
+A FigureCanvas translates the events of its backend system to figure
+coordinates and hands them over to its EventDispatcher.  As the
+EventDispatcher does not depend on any backend system, the same events can
+also be dispatched headlessly, e.g. when replaying a recorded session (see
+matplotlayers.backends.session)."""
+
+import matplotlayers.backends.stack_locator
+
+
+class EventDispatcher:
+    """Holds the registered clients, and dispatches events to them.  Start
+    events go to the clients at the event location, which are then engaged
+    until the corresponding stop event.  Motion events go to the engaged
+    clients.
+
+    If a recorder is set (see .set_recorder()), each event dispatched is
+    handed over to its .record() method."""
+
+    def __init__(self):
+
+        # The locator finds the clients at a figure position.  The engaged
+        # clients are those which are currently zooming or panning.
+
+        self.clients = []
+        self.locator = matplotlayers.backends.stack_locator.StackLocator()
+        self.engaged_clients = []
+
+        self.recorder = None
+
+    #
+    # Client registry ...
+    #
+
+    def register(self, client):
+        """Register the client CLIENT."""
+
+        if client not in self.clients:
+            self.clients.append(client)
+            self.locator.register(client)
+
+    def unregister(self, client):
+        """Unregister the client CLIENT."""
+
+        if client in self.clients:
+            self.clients.remove(client)
+            self.locator.unregister(client)
+
+        if client in self.engaged_clients:
+            self.engaged_clients.remove(client)
+
+    def invalidate_locator(self):
+        """Must be called when the positions of the axes of the clients
+        have been changed, to let the events go to the right clients."""
+
+        self.locator.invalidate()
+
+    def locate(self, figurecoords):
+        """Return the clients at figure coordinates FIGURECOORDS."""
+
+        return self.locator.locate(figurecoords)
+
+    #
+    # Recording ...
+    #
+
+    def set_recorder(self, recorder):
+        """Set the recorder, having a .record(event, *args) method, to be
+        handed over each event dispatched.  None turns recording off."""
+
+        self.recorder = recorder
+
+    def record(self, event, *args):
+        """Hand EVENT with arguments ARGS over to the recorder, if any."""
+
+        if self.recorder is not None:
+            self.recorder.record(event, *args)
+
+    #
+    # Events ...
+    #
+    # Each event method returns whether the view of some client may have
+    # changed, i.e. whether the figure needs to be rendered.
+
+    def autozoom(self, figurecoords):
+        """Turn on autoscaling in the clients at FIGURECOORDS."""
+
+        self.record('autozoom', figurecoords)
+
+        clients = self.locator.locate(figurecoords)
+        for client in clients:
+            client.autozoom()
+
+        return len(clients) > 0
+
+    def start_zoom(self, figurecoords):
+        """Start zooming around FIGURECOORDS in the clients there."""
+
+        self.record('start_zoom', figurecoords)
+
+        self.engaged_clients = self.locator.locate(figurecoords)
+        for client in self.engaged_clients:
+            client.start_zoom(figurecoords)
+
+        return len(self.engaged_clients) > 0
+
+    def start_pan(self, figurecoords):
+        """Start panning at FIGURECOORDS in the clients there."""
+
+        self.record('start_pan', figurecoords)
+
+        self.engaged_clients = self.locator.locate(figurecoords)
+        for client in self.engaged_clients:
+            client.start_pan(figurecoords)
+
+        return len(self.engaged_clients) > 0
+
+    def motion(self, figurecoords):
+        """Pass a motion to FIGURECOORDS on to the engaged clients."""
+
+        if len(self.engaged_clients) == 0:
+            # Nothing to move.
+            return False
+
+        self.record('motion', figurecoords)
+
+        for client in self.engaged_clients:
+            # Once the start event did apply to a client, also motion
+            # events at locations where start events would not apply,
+            # shall be passed on.
+            client.motion(figurecoords)
+
+        return True
+
+    def stop_zoom(self):
+        """Stop zooming in the engaged clients."""
+
+        self.record('stop_zoom')
+
+        (clients, self.engaged_clients) = (self.engaged_clients, [])
+        for client in clients:
+            client.stop_zoom()
+
+        return len(clients) > 0
+
+    def stop_pan(self):
+        """Stop panning in the engaged clients."""
+
+        self.record('stop_pan')
+
+        (clients, self.engaged_clients) = (self.engaged_clients, [])
+        for client in clients:
+            client.stop_pan()
+
+        return len(clients) > 0
+
+    def zoom_to_box(self, figurecoords_start, figurecoords_stop):
+        """Zoom the clients at FIGURECOORDS_START to the box spanned by
+        FIGURECOORDS_START and FIGURECOORDS_STOP."""
+
+        self.record('zoom_to_box', figurecoords_start, figurecoords_stop)
+
+        clients = self.locator.locate(figurecoords_start)
+        for client in clients:
+            client.zoom_to_box(figurecoords_start, figurecoords_stop)
+
+        return len(clients) > 0
+
+    #
+    # Notifications by the FigureCanvas ...
+    #
+
+    def resize(self, pixelsize):
+        """Called by the FigureCanvas when its size changed to PIXELSIZE."""
+
+        self.record('resize', pixelsize)
+        self.locator.invalidate()
+
+    def frame(self):
+        """Called by the FigureCanvas after it has rendered the figure."""
+
+        self.record('frame')
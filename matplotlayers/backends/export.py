@@ -0,0 +1,284 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Saving figures to files in the background.
+
+An Export saves a figure in a worker process.  The process works on its own
+copy of the figure, so that the figure shown is neither resized nor
+blocked while saving, and several Exports run concurrently::
+
+    export = matplotlayers.backends.export.Export(figure, 'figure.pdf',
+            'pdf', size_inches = (8, 6))
+    export.start()
+    ...
+    if export.poll():
+        # Finished, .error is None on success.
+
+The copy is taken when the Export starts, by pickling the figure without
+its canvas, e.g. a Tkinter one, which cannot be used by another process.
+Where matplotlib cannot pickle figures (before 1.2), the worker gets the
+copy by forking, which is possible only where processes are forked.  A
+forked worker does not touch the canvas or the connection to the display
+it inherits, and leaves without running the exit handlers of its parent.
+
+save_pages() writes many figures to a multi-page PDF file, one page per
+figure, preparing each figure only when its page is due."""
+
+import collections
+import multiprocessing
+import os
+import pickle
+import time
+import traceback
+import matplotlib.backends.backend_ps
+import matplotlib.backends.backend_pdf
+import matplotlayers.rasterization
+import matplotlayers.backends.PIL
+
+# The formats supported.  'raster' means any format PIL can write,
+# determined by the file name extension.
+FORMATS = ('eps', 'pdf', 'raster')
+
+
+def save(figure, filename, format,
+        size_inches = None,
+        shape = None,
+        processes = None,
+        raster_dpi = None):
+    """Save FIGURE to FILENAME in FORMAT, one of FORMATS.  The vector
+    formats are saved at SIZE_INCHES, with the rasterized layers rendered
+    at RASTER_DPI (default matplotlayers.rasterization.dpi).  The raster 
+    formats are saved at SHAPE in pixels, rendered in PROCESSES processes
+    (see FigureCanvasPIL.save_tiled()).  FIGURE is resized."""
+
+    if raster_dpi is None:
+        raster_dpi = matplotlayers.rasterization.dpi
+
+    if format in ('eps', 'pdf'):
+        figure.set_size_inches(size_inches)
+
+        if format == 'eps':
+            canvas = matplotlib.backends.backend_ps.\
+                    FigureCanvasPS(figure)
+            canvas.print_eps(filename, dpi = raster_dpi)
+        else:
+            canvas = matplotlib.backends.backend_pdf.\
+                    FigureCanvasPdf(figure)
+            canvas.print_pdf(filename, dpi = raster_dpi)
+
+    elif format == 'raster':
+        canvas = matplotlayers.backends.PIL.FigureCanvasPIL(figure)
+        canvas.save_tiled(filename, shape, processes = processes)
+
+    else:
+        raise ValueError("Unknown format %r." % format)
+
+
+def save_pages(filename, pages,
+        size_inches = None,
+        raster_dpi = None,
+        processes = None):
+    """Save the figures PAGES to the PDF file FILENAME, one figure per 
+    page.  PAGES is an iterable of matplotlib.figure.Figures, or of
+    callables returning one, e.g. creating a figure and rendering its 
+    Stacks.  Each page is written as soon as it is ready, and the 
+    callables are called only when their page is due, so that the memory
+    needed does not grow with the number of pages.
+
+    With PROCESSES greater than 1, the callables are called in that many
+    worker processes, and their figures are handed back pickled.  The
+    callables must then be picklable, e.g. module-level functions or
+    functools.partial() instances of them.  Writing the pages remains
+    sequential.
+
+    SIZE_INCHES sets the size of all pages, by default the figures keep
+    their size.  For RASTER_DPI see save().  Returns the number of pages
+    written."""
+
+    if raster_dpi is None:
+        raster_dpi = matplotlayers.rasterization.dpi
+
+    pdf_pages = matplotlib.backends.backend_pdf.PdfPages(filename)
+    count = 0
+
+    try:
+        for figure in _prepare_pages(pages, processes):
+            if size_inches is not None:
+                figure.set_size_inches(size_inches)
+
+            matplotlib.backends.backend_pdf.FigureCanvasPdf(figure)
+            pdf_pages.savefig(figure, dpi = raster_dpi)
+            count += 1
+
+    finally:
+        pdf_pages.close()
+
+    return count
+
+
+def _prepare_page(page):
+    """Return the figure of PAGE, see save_pages()."""
+
+    if callable(page):
+        return page()
+
+    return page
+
+
+def _prepare_pages(pages, processes):
+    """Yield the figures of PAGES in order, prepared in PROCESSES worker 
+    processes if it is greater than 1."""
+
+    if processes is None or processes <= 1:
+        for page in pages:
+            yield _prepare_page(page)
+
+        return
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        # Keep only a few pages in flight, to bound the memory needed for
+        # the figures prepared but not written yet.
+        pending = collections.deque()
+        for page in pages:
+            pending.append(pool.apply_async(_prepare_page, (page,)))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().get()
+
+        while len(pending) > 0:
+            yield pending.popleft().get()
+
+    finally:
+        pool.terminate()
+
+
+def _run(connection, figure, filename, format, options):
+    """The worker process of an Export.  Sends the traceback of the failure
+    or None through CONNECTION.  FIGURE may be pickled, see _snapshot()."""
+
+    try:
+        if isinstance(figure, str):
+            figure = pickle.loads(figure)
+
+        save(figure, filename, format, **options)
+    except Exception:
+        connection.send(traceback.format_exc())
+    else:
+        connection.send(None)
+
+    connection.close()
+
+
+def _snapshot(figure):
+    """Return FIGURE pickled without its canvas, or None if matplotlib
+    cannot pickle figures."""
+
+    canvas = figure.canvas
+    figure.canvas = None
+    try:
+        return pickle.dumps(figure, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+    finally:
+        figure.canvas = canvas
+
+
+class Export:
+    """Saves a figure by save() in a worker process."""
+
+    def __init__(self, figure, filename, format, **options):
+        """FIGURE is saved to FILENAME in FORMAT.  OPTIONS are handed over
+        to save()."""
+
+        if format not in FORMATS:
+            raise ValueError("Unknown format %r." % format)
+
+        self.figure = figure
+        self.filename = filename
+        self.format = format
+        self.options = options
+
+        self.process = None
+        self.connection = None
+        self.started = None
+
+        # Set when finished, .error is then None on success, and the
+        # message otherwise.
+        self.finished = False
+        self.error = None
+
+    def start(self):
+        """Start the worker process.  The figure is copied at this time."""
+
+        figure = _snapshot(self.figure)
+        if figure is None:
+            if not hasattr(os, 'fork'):
+                raise ValueError("The figure cannot be pickled, and "
+                        "processes are not forked here.")
+
+            # The worker gets the figure by forking.
+            figure = self.figure
+
+        (self.connection, worker_connection) = multiprocessing.Pipe(False)
+
+        # The worker must not be daemonic, since it may start processes on
+        # its own.
+        self.process = multiprocessing.Process(target = _run,
+                args = (worker_connection, figure, self.filename,
+                    self.format, self.options))
+        self.process.start()
+        self.started = time.time()
+
+        worker_connection.close()
+
+    def poll(self):
+        """Return whether the export has finished, without blocking."""
+
+        if self.finished:
+            return True
+
+        if not self.connection.poll() and self.process.is_alive():
+            return False
+
+        # The worker has sent its result, or has exited.  As all ends of
+        # the pipe for sending are closed then, this doesn't block.
+        try:
+            error = self.connection.recv()
+        except EOFError:
+            error = "The export process exited with code %s." % \
+                    self.process.exitcode
+
+        self.process.join()
+        self.connection.close()
+
+        self.finished = True
+        self.error = error
+
+        return True
+
+    def wait(self):
+        """Wait for the export to finish."""
+
+        if not self.finished:
+            self.process.join()
+            self.poll()
@@ -0,0 +1,426 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""A headless figure canvas controlled over a socket.
+
+FigureCanvasRemote is the counterpart of FigureCanvasTk for thin clients.
+It takes the interaction events in pixel coordinates over a TCP
+connection, passes them on to the registered StackCanvas clients by an
+EventDispatcher, renders the figure by a FigureCanvasPIL, and sends back
+only the rectangles of the frame which have changed, compressed::
+
+    canvas = matplotlayers.backends.remote.FigureCanvasRemote(figure)
+    canvas.register(matplotlayers.backends.StackCanvas(stack))
+    server = canvas.serve(('localhost', 8470))
+    server.serve_forever()
+
+The protocol is line-based.  The client sends one JSON object per line,
+e.g. ``{"event": "start_zoom", "args": [[120, 80]]}``.  The events are
+those of EventDispatcher, with positions in pixels from the top left, and
+'resize' with the (width, height) in pixels, 'frame' requesting a frame
+anyway, and 'close'.  The server answers each event by one JSON line,
+holding the 'shape' of the frame, the changed rectangles 'rects' as
+[x, y, width, height, bytes], and the number of 'bytes' following,
+which are the zlib compressed RGB data of the rectangles.  The line holds
+also the seconds needed for rendering and encoding, and 'error' if the
+event failed.  RemoteClient implements the client side and measures the
+latency and the bandwidth of each event."""
+
+import json
+import socket
+import SocketServer
+import timeit
+import zlib
+import numpy
+import matplotlayers.timing
+import matplotlayers.backends.event_dispatcher
+import matplotlayers.backends.PIL
+
+# The edge length of the tiles the frames are compared by, in pixels.
+DEFAULT_TILE = 32
+
+# The zlib compression level of the rectangles sent.
+DEFAULT_LEVEL = 1
+
+# The events taking positions, and how many.
+POSITION_EVENTS = {
+        'autozoom': 1,
+        'start_zoom': 1,
+        'start_pan': 1,
+        'motion': 1,
+        'zoom_to_box': 2}
+
+#
+# Delta encoding ...
+#
+
+
+def changed_rectangles(previous, image, tile = None):
+    """Return the list of rectangles (x, y, width, height) covering the
+    pixels differing between the (height, width, 3) arrays PREVIOUS and
+    IMAGE.  The images are compared by tiles of TILE pixels (default
+    DEFAULT_TILE), and the changed tiles in a row are joined."""
+
+    if tile is None:
+        tile = DEFAULT_TILE
+
+    changed = (previous != image).any(axis = 2)
+    (height, width) = changed.shape
+    (rows, columns) = ((height + tile - 1) // tile, (width + tile - 1) // tile)
+
+    # Pad to whole tiles, and reduce to one flag per tile.
+    padded = numpy.zeros((rows * tile, columns * tile), dtype = bool)
+    padded[:height, :width] = changed
+    dirty = padded.reshape((rows, tile, columns, tile)).\
+            any(axis = 3).any(axis = 1)
+
+    rectangles = []
+    for row in xrange(rows):
+        column = 0
+        while column < columns:
+            if not dirty[row, column]:
+                column += 1
+                continue
+
+            start = column
+            while column < columns and dirty[row, column]:
+                column += 1
+
+            (x, y) = (start * tile, row * tile)
+            rectangles.append((x, y, min(column * tile, width) - x,
+                    min(y + tile, height) - y))
+
+    return rectangles
+
+
+class DeltaEncoder:
+    """Encodes frames as the compressed rectangles changed since the
+    previous frame."""
+
+    def __init__(self, tile = None, level = None):
+        """TILE is handed over to changed_rectangles().  LEVEL is the zlib
+        compression level, default DEFAULT_LEVEL."""
+
+        if level is None:
+            level = DEFAULT_LEVEL
+
+        self.tile = tile
+        self.level = level
+        self.previous = None
+
+    def encode(self, shape, data):
+        """Encode the RGB DATA of SHAPE (width, height).  Returns (rects,
+        payload), the list of [x, y, width, height, bytes] and the string
+        of the compressed rectangles.  The first frame, and frames of a new
+        shape, are sent as a whole."""
+
+        started = matplotlayers.timing.start()
+
+        (width, height) = shape
+        image = numpy.frombuffer(data, dtype = numpy.uint8).\
+                reshape((height, width, 3))
+
+        if self.previous is None or self.previous.shape != image.shape:
+            rectangles = [(0, 0, width, height)]
+        else:
+            rectangles = changed_rectangles(self.previous, image, self.tile)
+
+        self.previous = image
+
+        rects = []
+        chunks = []
+        for (x, y, rect_width, rect_height) in rectangles:
+            chunk = zlib.compress(
+                    image[y:y + rect_height, x:x + rect_width].tostring(),
+                    self.level)
+            rects.append([x, y, rect_width, rect_height, len(chunk)])
+            chunks.append(chunk)
+
+        matplotlayers.timing.stop('DeltaEncoder encode', started)
+
+        return (rects, ''.join(chunks))
+
+
+class DeltaDecoder:
+    """Applies the rectangles encoded by a DeltaEncoder to an image."""
+
+    def __init__(self):
+
+        # The (height, width, 3) array of the current frame.
+        self.image = None
+
+    def decode(self, shape, rects, payload):
+        """Apply the RECTS of PAYLOAD, see DeltaEncoder.encode(), to the
+        image of SHAPE (width, height), and return the image."""
+
+        (width, height) = shape
+        if self.image is None or self.image.shape != (height, width, 3):
+            self.image = numpy.zeros((height, width, 3), dtype = numpy.uint8)
+
+        offset = 0
+        for (x, y, rect_width, rect_height, size) in rects:
+            pixels = zlib.decompress(payload[offset:offset + size])
+            self.image[y:y + rect_height, x:x + rect_width] = \
+                    numpy.frombuffer(pixels, dtype = numpy.uint8).\
+                    reshape((rect_height, rect_width, 3))
+            offset += size
+
+        return self.image
+
+#
+# Server side ...
+#
+
+
+class FigureCanvasRemote:
+    """A figure canvas driven by events received over a socket, see the
+    module documentation."""
+
+    def __init__(self, figure, shape = None, tile = None, level = None):
+        """FIGURE is the matplotlib.figure.Figure shown.  SHAPE is the
+        initial size in pixels, default (800, 600), until the client sends
+        'resize'.  TILE and LEVEL are handed over to the DeltaEncoders."""
+
+        if shape is None:
+            shape = (800, 600)
+
+        self.figure = figure
+        self.PIL_canvas = matplotlayers.backends.PIL.FigureCanvasPIL(figure)
+        self.dispatcher = \
+                matplotlayers.backends.event_dispatcher.EventDispatcher()
+
+        self.tile = tile
+        self.level = level
+
+        self.pixelsize = tuple(shape)
+        self.dispatcher.resize(self.pixelsize)
+
+    def pixelcoords2figurecoords(self, (pixelx, pixely)):
+        """Transform pixel coordinates from the top left to figure
+        coordinates."""
+
+        return (float(pixelx) / self.pixelsize[0],
+                1 - float(pixely) / self.pixelsize[1])
+
+    #
+    # Client registry ...
+    #
+
+    def register(self, client):
+        """Register the StackCanvas CLIENT."""
+
+        self.dispatcher.register(client)
+
+    def unregister(self, client):
+        """Unregister the StackCanvas CLIENT."""
+
+        self.dispatcher.unregister(client)
+
+    def invalidate_locator(self):
+        """See EventDispatcher.invalidate_locator()."""
+
+        self.dispatcher.invalidate_locator()
+
+    def set_recorder(self, recorder):
+        """See EventDispatcher.set_recorder()."""
+
+        self.dispatcher.set_recorder(recorder)
+
+    #
+    # Events ...
+    #
+
+    def create_encoder(self):
+        """Return a new DeltaEncoder for a connection."""
+
+        return DeltaEncoder(tile = self.tile, level = self.level)
+
+    def handle(self, encoder, event, args):
+        """Handle EVENT with ARGS, positions in pixels, and return the
+        (header, payload) of the answer, encoded by the DeltaEncoder
+        ENCODER of the connection."""
+
+        if event == 'resize':
+            (width, height) = map(int, args[0])
+            if width <= 0 or height <= 0:
+                raise ValueError("Unacceptable size %dx%d." % \
+                        (width, height))
+            self.pixelsize = (width, height)
+            self.dispatcher.resize(self.pixelsize)
+            changed = True
+        elif event == 'frame':
+            changed = True
+        elif event in POSITION_EVENTS:
+            if len(args) != POSITION_EVENTS[event]:
+                raise ValueError("%s takes %d position(s)." % \
+                        (event, POSITION_EVENTS[event]))
+            changed = getattr(self.dispatcher, event)(
+                    *map(self.pixelcoords2figurecoords, args))
+        elif event in ('stop_zoom', 'stop_pan'):
+            changed = getattr(self.dispatcher, event)()
+        else:
+            raise ValueError("Unknown event %r." % event)
+
+        header = {
+                'shape': list(self.pixelsize),
+                'rects': [],
+                'render': 0.0,
+                'encode': 0.0}
+        payload = ''
+
+        if changed:
+            started = timeit.default_timer()
+            data = self.PIL_canvas.output_RGB(self.pixelsize)
+            self.dispatcher.frame()
+            header['render'] = timeit.default_timer() - started
+
+            started = timeit.default_timer()
+            (header['rects'], payload) = encoder.encode(self.pixelsize, data)
+            header['encode'] = timeit.default_timer() - started
+
+        header['bytes'] = len(payload)
+
+        return (header, payload)
+
+    def serve(self, address):
+        """Return a RemoteServer listening on ADDRESS, a (host, port)
+        tuple.  Call its .serve_forever() method to serve the clients, one
+        at a time."""
+
+        return RemoteServer(address, self)
+
+
+class _RemoteHandler(SocketServer.StreamRequestHandler):
+    """Handles the events of one connection."""
+
+    def handle(self):
+        figure_canvas = self.server.figure_canvas
+        encoder = figure_canvas.create_encoder()
+
+        for line in iter(self.rfile.readline, ''):
+            try:
+                request = json.loads(line)
+                event = str(request['event'])
+                if event == 'close':
+                    break
+
+                (header, payload) = figure_canvas.handle(encoder, event,
+                        request.get('args', []))
+            except (ValueError, KeyError, TypeError, IndexError), error:
+                (header, payload) = ({'error': '%s: %s' % \
+                        (error.__class__.__name__, error), 'bytes': 0}, '')
+
+            self.wfile.write(json.dumps(header) + '\n')
+            self.wfile.write(payload)
+            self.wfile.flush()
+
+
+class RemoteServer(SocketServer.TCPServer):
+    """Serves a FigureCanvasRemote.  The connections are served one after
+    the other, since the figure can be drawn by one at a time only."""
+
+    allow_reuse_address = True
+
+    def __init__(self, address, figure_canvas):
+        self.figure_canvas = figure_canvas
+        SocketServer.TCPServer.__init__(self, address, _RemoteHandler)
+
+#
+# Client side ...
+#
+
+
+class RemoteClient:
+    """Connects to a RemoteServer, sends events, and keeps the current
+    frame in .image, a (height, width, 3) array.  Measures the latency and
+    the bytes received of each event."""
+
+    def __init__(self, address):
+        """ADDRESS is the (host, port) of the server."""
+
+        self.socket = socket.create_connection(address)
+        self.rfile = self.socket.makefile('rb')
+        self.wfile = self.socket.makefile('wb')
+
+        self.decoder = DeltaDecoder()
+        self.image = None
+
+        # The latency in seconds, and the bytes received, per event.
+        self.latencies = []
+        self.bytes_received = []
+
+    def send(self, event, *args):
+        """Send EVENT with ARGS, positions in pixels from the top left,
+        wait for the answer, and apply it to .image.  Returns the header
+        of the answer.  Raises ValueError if the server did."""
+
+        started = timeit.default_timer()
+
+        self.wfile.write(json.dumps({'event': event, 'args': args}) + '\n')
+        self.wfile.flush()
+
+        line = self.rfile.readline()
+        if line == '':
+            raise IOError("The server has closed the connection.")
+        header = json.loads(line)
+        payload = self.rfile.read(header['bytes'])
+
+        if 'error' in header:
+            raise ValueError(header['error'])
+
+        if len(header['rects']) > 0:
+            self.image = self.decoder.decode(header['shape'],
+                    header['rects'], payload)
+
+        self.latencies.append(timeit.default_timer() - started)
+        self.bytes_received.append(len(line) + len(payload))
+
+        return header
+
+    def get_statistics(self):
+        """Return a dict with the number of 'events', the total 'bytes'
+        received, the 'mean_bytes' per event, and the statistics of the
+        latencies under 'latency' (see matplotlayers.timing.summarize())."""
+
+        statistics = {
+                'events': len(self.latencies),
+                'bytes': sum(self.bytes_received)}
+
+        if len(self.latencies) > 0:
+            statistics['mean_bytes'] = \
+                    float(statistics['bytes']) / len(self.latencies)
+            statistics['latency'] = \
+                    matplotlayers.timing.summarize(self.latencies)
+
+        return statistics
+
+    def close(self):
+        """End the connection."""
+
+        try:
+            self.wfile.write(json.dumps({'event': 'close'}) + '\n')
+            self.wfile.flush()
+        finally:
+            self.rfile.close()
+            self.wfile.close()
+            self.socket.close()
@@ -0,0 +1,579 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""A local HTTP service rendering Stacks described in JSON to PNG.
+
+A RenderService renders in a pool of worker processes, forked when the
+service starts.  Each worker keeps its figures together with their Agg
+canvases for reuse.  Results are cached by the hash of the specification,
+and identical requests arriving while rendering are served by the same
+render::
+
+    service = matplotlayers.backends.service.RenderService(
+            ('localhost', 8471), processes = 4)
+    service.serve_forever()
+
+    client = matplotlayers.backends.service.RenderClient(
+            ('localhost', 8471))
+    png = client.render({
+            'shape': [800, 600],
+            'layers': [{'class': 'LayerPlot',
+                'settings': {'x': [0, 1, 2], 'y': [1, 0, 1]}}],
+            'stacks': [{'layers': [0], 'title': 'Example'}]})
+
+POST /render takes the specification as JSON and answers with the PNG
+image.  The specification holds
+
+*   'shape': the (width, height) in pixels, default (800, 600),
+*   'level': the zlib compression level of the PNG, optional,
+*   'layers': the layers, each with the name of a class in
+    matplotlayers.layers under 'class' and the keyword configuration under
+    'settings'.  Lists in the settings become arrays, and {"layer": index}
+    refers to another layer, e.g. for 'layer_colorbar',
+*   'stacks': the Stacks, each with the indices of its 'layers', and
+    optionally 'position' [left, bottom, width, height], 'polar', 'title',
+    'xlabel', 'ylabel', 'xlim', 'ylim', 'autoscale_x_on',
+    'autoscale_y_on', and 'colorbar' as taken by Stack.
+
+GET /metrics answers with the metrics as JSON, see
+RenderService.get_metrics()."""
+
+import BaseHTTPServer
+import SocketServer
+import StringIO
+import collections
+import hashlib
+import httplib
+import json
+import multiprocessing
+import threading
+import timeit
+import traceback
+import numpy
+import matplotlib.figure
+import matplotlib.backends.backend_agg as mpl_backend_agg
+import matplotlayers
+import matplotlayers.layers
+import matplotlayers.timing
+import matplotlayers.backends.PIL.encoders
+import matplotlayers.backends.PIL.png_writer
+
+# The default extent of the images rendered, in pixels.
+DEFAULT_SHAPE = (800, 600)
+
+# Larger images are refused.
+MAX_PIXELS = 2 ** 25
+
+# Larger specifications are refused, in bytes.
+MAX_SPEC_BYTES = 2 ** 26
+
+# The number of figures each worker keeps, by shape.
+WARM_FIGURES = 4
+
+# The number of latencies the metrics are computed from.
+LATENCY_WINDOW = 1000
+
+# The seconds a request waits for its render by default.
+RENDER_TIMEOUT = 60
+
+#
+# Rendering ...
+#
+
+
+class WarmFigures:
+    """Keeps figures together with their Agg canvases, by shape, so that
+    rendering again at the same shape reuses the canvas and its
+    renderer."""
+
+    def __init__(self, size = None):
+        """SIZE is the number of figures kept, default WARM_FIGURES."""
+
+        if size is None:
+            size = WARM_FIGURES
+
+        self.size = size
+        self.entries = collections.OrderedDict()
+
+    def get(self, shape):
+        """Return (figure, agg_canvas) of SHAPE in pixels, with the figure
+        cleared."""
+
+        shape = tuple(shape)
+
+        if shape in self.entries:
+            (figure, agg_canvas) = self.entries.pop(shape)
+        else:
+            figure = matplotlib.figure.Figure(frameon = False)
+            figure.set_size_inches(
+                    float(shape[0]) / figure.dpi,
+                    float(shape[1]) / figure.dpi)
+            agg_canvas = mpl_backend_agg.FigureCanvasAgg(figure)
+
+        self.entries[shape] = (figure, agg_canvas)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last = False)
+
+        figure.clf()
+
+        return (figure, agg_canvas)
+
+
+def get_shape(spec):
+    """Return the (width, height) of the specification SPEC.  Raises
+    ValueError if it is not acceptable."""
+
+    (width, height) = map(int, spec.get('shape', DEFAULT_SHAPE))
+
+    if width <= 0 or height <= 0 or width * height > MAX_PIXELS:
+        raise ValueError("Unacceptable shape %dx%d." % (width, height))
+
+    return (width, height)
+
+
+def build(figure, spec):
+    """Create the layers and Stacks of the specification SPEC in FIGURE,
+    and return the Stacks."""
+
+    records = spec.get('layers', [])
+
+    # Create all layers first, since settings may refer to others.
+    layers = []
+    for record in records:
+        name = str(record['class'])
+        if name not in matplotlayers.layers.__all__:
+            raise ValueError("Unknown layer class %r." % name)
+        layers.append(getattr(matplotlayers.layers, name)())
+
+    def decode(value):
+        if isinstance(value, list):
+            return numpy.asarray(value)
+        if isinstance(value, unicode):
+            return str(value)
+        if isinstance(value, dict):
+            if value.keys() != ['layer']:
+                raise ValueError("Unknown value %r." % value)
+            return layers[value['layer']]
+        return value
+
+    for (layer, record) in zip(layers, records):
+        layer.configure(**dict((str(key), decode(value))
+                for (key, value) in record.get('settings', {}).items()))
+
+    stacks = []
+    for record in spec.get('stacks', []):
+        (left, bottom, width, height) = record.get('position',
+                (0.2, 0.2, 0.6, 0.6))
+
+        stack = matplotlayers.Stack(figure,
+                left = left, bottom = bottom, width = width, height = height,
+                polar = record.get('polar'),
+                autoscale_x_on = record.get('autoscale_x_on'),
+                autoscale_y_on = record.get('autoscale_y_on'),
+                colorbar = record.get('colorbar'))
+
+        with stack.batch():
+            if 'title' in record:
+                stack.set_title(record['title'])
+            if 'xlabel' in record:
+                stack.set_xlabel(record['xlabel'])
+            if 'ylabel' in record:
+                stack.set_ylabel(record['ylabel'])
+            if 'xlim' in record:
+                stack.set_xlim(tuple(record['xlim']))
+            if 'ylim' in record:
+                stack.set_ylim(tuple(record['ylim']))
+
+        for index in record.get('layers', []):
+            stack.add_layer(layers[index])
+
+        stacks.append(stack)
+
+    return stacks
+
+
+def render(spec, figures = None):
+    """Render the specification SPEC, see the module documentation, and
+    return the PNG image as a string.  The figure is taken from the
+    WarmFigures FIGURES, if given."""
+
+    shape = get_shape(spec)
+
+    if figures is None:
+        figures = WarmFigures(size = 1)
+    (figure, agg_canvas) = figures.get(shape)
+
+    for stack in build(figure, spec):
+        stack.render()
+
+    started = matplotlayers.timing.start()
+    agg_canvas.draw()
+    matplotlayers.timing.stop('RenderService draw', started)
+
+    stream = StringIO.StringIO()
+    writer = matplotlayers.backends.PIL.png_writer.PNGWriter(stream, shape,
+            level = spec.get('level',
+                matplotlayers.backends.PIL.encoders.DEFAULT_LEVEL))
+    writer.write_rows(agg_canvas.tostring_rgb())
+    writer.close()
+
+    return stream.getvalue()
+
+# The WarmFigures of a worker process.
+_figures = None
+
+
+def _initialise_worker(size):
+    global _figures
+    _figures = WarmFigures(size)
+
+
+def _render_worker(spec):
+    """Return (kind, result) for SPEC, where KIND is 'png', or 'invalid'
+    or 'error' with the traceback as result."""
+
+    try:
+        return ('png', render(spec, _figures))
+    except (ValueError, KeyError, TypeError, IndexError):
+        return ('invalid', traceback.format_exc())
+    except Exception:
+        return ('error', traceback.format_exc())
+
+#
+# Server ...
+#
+
+
+class ResultCache:
+    """The PNG images rendered, by key, keeping the most recently used up
+    to a total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = collections.OrderedDict()
+
+    def get(self, key):
+        """Return the image of KEY, or None."""
+
+        if key not in self.entries:
+            return None
+
+        image = self.entries.pop(key)
+        self.entries[key] = image
+
+        return image
+
+    def put(self, key, image):
+        """Store IMAGE under KEY, dropping the least recently used images
+        as needed.  Images larger than the cache are not stored."""
+
+        if len(image) > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+
+        self.entries[key] = image
+        self.bytes += len(image)
+
+        while self.bytes > self.max_bytes:
+            (dropped_key, dropped) = self.entries.popitem(last = False)
+            self.bytes -= len(dropped)
+
+
+class _RenderHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handles the requests of a RenderService."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self._answer(404, 'text/plain', 'Not found.')
+            return
+
+        self._answer(200, 'application/json',
+                json.dumps(self.server.get_metrics()))
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._answer(404, 'text/plain', 'Not found.')
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Reading would wait for the connection to be closed.
+            self.close_connection = True
+            self._answer(400, 'text/plain', 'Invalid Content-Length.')
+            return
+        if length > MAX_SPEC_BYTES:
+            self.close_connection = True
+            self._answer(413, 'text/plain', 'Specification too large.')
+            return
+
+        try:
+            spec = json.loads(self.rfile.read(length))
+        except ValueError, error:
+            self._answer(400, 'text/plain', str(error))
+            return
+
+        if not isinstance(spec, dict):
+            self._answer(400, 'text/plain', 'The specification must be an '
+                    'object.')
+            return
+
+        (kind, result, key) = self.server.render(spec)
+
+        if kind == 'png':
+            self._answer(200, 'image/png', result, key)
+        elif kind == 'invalid':
+            self._answer(400, 'text/plain', result)
+        elif kind == 'timeout':
+            self._answer(504, 'text/plain', result)
+        else:
+            self._answer(500, 'text/plain', result)
+
+    def _answer(self, status, content_type, body, key = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if key is not None:
+            self.send_header('ETag', '"%s"' % key)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # The metrics tell more than a line per request.
+        pass
+
+
+class RenderService(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Serves renders of specifications over HTTP, see the module
+    documentation.  Requests are taken in threads, and rendered in a pool of
+    worker processes."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address,
+            processes = None,
+            cache_bytes = None,
+            warm_figures = None,
+            render_timeout = None):
+        """ADDRESS is the (host, port) to listen on.  PROCESSES is the
+        number of worker processes, by default the number of CPUs.
+        CACHE_BYTES is the size of the result cache, default 64 MiB, 0
+        turns caching off.  WARM_FIGURES is the number of figures each
+        worker keeps (see WarmFigures).  Requests whose render is not done
+        within RENDER_TIMEOUT seconds (default RENDER_TIMEOUT) are answered
+        with status 504.  The worker keeps rendering nevertheless."""
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if cache_bytes is None:
+            cache_bytes = 2 ** 26
+        if render_timeout is None:
+            render_timeout = RENDER_TIMEOUT
+
+        self.render_timeout = render_timeout
+
+        # Fork the workers before any thread is started.
+        self.processes = processes
+        self.pool = multiprocessing.Pool(processes,
+                initializer = _initialise_worker,
+                initargs = (warm_figures,))
+
+        self.lock = threading.Lock()
+        self.cache = ResultCache(cache_bytes)
+
+        # The renders running or waiting for a worker, by key.
+        self.pending = {}
+
+        self.started = timeit.default_timer()
+        self.counters = dict.fromkeys(['requests', 'hits', 'coalesced',
+                'renders', 'invalid', 'errors', 'timeouts'], 0)
+        self.max_queue_depth = 0
+        self.latencies = collections.deque(maxlen = LATENCY_WINDOW)
+        self.render_latencies = collections.deque(maxlen = LATENCY_WINDOW)
+
+        BaseHTTPServer.HTTPServer.__init__(self, address, _RenderHandler)
+
+    def render(self, spec):
+        """Return (kind, result, key) for the specification SPEC, from the
+        cache, from a render of the same key running, or by a new render.
+        See _render_worker() for KIND and RESULT, KIND is 'timeout' if the
+        render is not done within the render timeout.  KEY is the hash of
+        SPEC."""
+
+        started = timeit.default_timer()
+        key = hashlib.sha1(json.dumps(spec, sort_keys = True)).hexdigest()
+
+        with self.lock:
+            self.counters['requests'] += 1
+
+            image = self.cache.get(key)
+            if image is not None:
+                self.counters['hits'] += 1
+                self.latencies.append(timeit.default_timer() - started)
+                return ('png', image, key)
+
+            if key in self.pending:
+                self.counters['coalesced'] += 1
+                (async_result, owner) = (self.pending[key], False)
+            else:
+                async_result = self.pool.apply_async(_render_worker,
+                        (spec,))
+                (self.pending[key], owner) = (async_result, True)
+                self.counters['renders'] += 1
+                self.max_queue_depth = max(self.max_queue_depth,
+                        len(self.pending))
+
+        # Counted as an error if getting the result fails otherwise.
+        (kind, result) = ('error', None)
+        try:
+            (kind, result) = async_result.get(self.render_timeout)
+        except multiprocessing.TimeoutError:
+            (kind, result) = ('timeout', "The render has not been done "
+                    "within %g seconds." % self.render_timeout)
+
+        finally:
+            with self.lock:
+                if owner:
+                    # A later request renders again.
+                    del self.pending[key]
+
+                    if kind == 'png':
+                        self.cache.put(key, result)
+                    else:
+                        self.counters[{'invalid': 'invalid',
+                            'error': 'errors',
+                            'timeout': 'timeouts'}[kind]] += 1
+                    self.render_latencies.append(
+                            timeit.default_timer() - started)
+
+                self.latencies.append(timeit.default_timer() - started)
+
+        return (kind, result, key)
+
+    def get_metrics(self):
+        """Return a dict with the counts of 'requests', cache 'hits',
+        requests 'coalesced' with a running render, 'renders', 'invalid'
+        specifications, render 'errors' and 'timeouts', the renders running or waiting
+        'queue_depth' and its maximum 'max_queue_depth', the 'processes',
+        the 'uptime' in seconds, the 'throughput' in requests per second
+        and the 'render_throughput' in renders per second, the 'cache'
+        state, and the statistics of the recent 'latency' and
+        'render_latency' (see matplotlayers.timing.summarize())."""
+
+        with self.lock:
+            uptime = timeit.default_timer() - self.started
+
+            metrics = dict(self.counters)
+            metrics.update({
+                    'queue_depth': len(self.pending),
+                    'max_queue_depth': self.max_queue_depth,
+                    'processes': self.processes,
+                    'uptime': uptime,
+                    'throughput': self.counters['requests'] / uptime,
+                    'render_throughput': self.counters['renders'] / uptime,
+                    'cache': {
+                        'entries': len(self.cache.entries),
+                        'bytes': self.cache.bytes,
+                        'max_bytes': self.cache.max_bytes}})
+
+            if len(self.latencies) > 0:
+                metrics['latency'] = \
+                        matplotlayers.timing.summarize(self.latencies)
+            if len(self.render_latencies) > 0:
+                metrics['render_latency'] = \
+                        matplotlayers.timing.summarize(self.render_latencies)
+
+        return metrics
+
+    def server_close(self):
+        """Stop listening, and end the worker processes."""
+
+        BaseHTTPServer.HTTPServer.server_close(self)
+        self.pool.terminate()
+        self.pool.join()
+
+#
+# Client ...
+#
+
+
+class RenderClient:
+    """A client of a RenderService, for testing and for tools."""
+
+    def __init__(self, address, timeout = None):
+        """ADDRESS is the (host, port) of the service."""
+
+        (self.host, self.port) = address
+        self.timeout = timeout
+        self.connection = None
+
+    def _request(self, method, path, body = None):
+        """Return the body of the answer to the request, which is sent
+        again on a new connection if the one kept has been closed.  Raises
+        IOError if the service fails."""
+
+        for attempt in (0, 1):
+            if self.connection is None:
+                self.connection = httplib.HTTPConnection(self.host,
+                        self.port, timeout = self.timeout)
+            try:
+                self.connection.request(method, path, body)
+                response = self.connection.getresponse()
+                answer = response.read()
+                break
+            except (httplib.HTTPException, IOError):
+                self.close()
+                if attempt == 1:
+                    raise
+
+        if response.status != 200:
+            raise IOError("%s %s failed with status %d:\n%s" % \
+                    (method, path, response.status, answer))
+
+        return answer
+
+    def render(self, spec):
+        """Return the PNG image of the specification SPEC as a string."""
+
+        return self._request('POST', '/render', json.dumps(spec))
+
+    def get_metrics(self):
+        """Return the metrics of the service, see
+        RenderService.get_metrics()."""
+
+        return json.loads(self._request('GET', '/metrics'))
+
+    def close(self):
+        """Close the connection kept."""
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
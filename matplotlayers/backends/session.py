@@ -0,0 +1,189 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Recording and replaying interaction sessions.
+
+A Recorder set on a FigureCanvasTk (see FigureCanvasTk.set_recorder())
+writes the events passed on to the StackCanvas clients, and the frames
+rendered, to a file, one JSON object per line::
+
+    recorder = matplotlayers.backends.session.Recorder('session.jsonl')
+    figure_canvas.set_recorder(recorder)
+    ...
+    recorder.close()
+
+A Replayer drives the same events through an EventDispatcher headlessly,
+rendering each frame by a FigureCanvasPIL, and measures the latency of each
+frame, i.e. the time from the first event after the previous frame until
+the frame is rendered::
+
+    dispatcher = matplotlayers.backends.EventDispatcher()
+    dispatcher.register(matplotlayers.backends.StackCanvas(stack))
+
+    replayer = matplotlayers.backends.session.Replayer(
+            matplotlayers.backends.session.load('session.jsonl'))
+    report = replayer.replay(dispatcher,
+            matplotlayers.backends.PIL.FigureCanvasPIL(figure))
+
+The figure and the Stacks must be set up as in the recorded session, with
+the StackCanvases registered in the same order."""
+
+import json
+import time
+import timeit
+import matplotlayers.timing
+
+
+class Recorder:
+    """Writes the events handed over to .record() as JSON lines, together
+    with the time since the recorder was created."""
+
+    def __init__(self, file):
+        """FILE is a file name or an open file."""
+
+        if isinstance(file, basestring):
+            self.stream = open(file, 'w')
+            self.owns_stream = True
+        else:
+            self.stream = file
+            self.owns_stream = False
+
+        self.started = timeit.default_timer()
+
+    def record(self, event, *args):
+        """Write EVENT with arguments ARGS."""
+
+        self.stream.write(json.dumps({
+                'time': timeit.default_timer() - self.started,
+                'event': event,
+                'args': args}) + '\n')
+
+    def close(self):
+        """Flush, and close the file if it has been opened by us."""
+
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def load(file):
+    """Return the list of (time, event, args) recorded in FILE, a file name
+    or an open file."""
+
+    if isinstance(file, basestring):
+        stream = open(file)
+    else:
+        stream = file
+
+    events = []
+    try:
+        for line in stream:
+            if line.strip() == '':
+                continue
+            record = json.loads(line)
+            events.append((record['time'], str(record['event']),
+                    [_from_json(arg) for arg in record['args']]))
+    finally:
+        if stream is not file:
+            stream.close()
+
+    return events
+
+
+def _from_json(arg):
+    """Turn lists read from JSON back into the tuples recorded."""
+
+    if isinstance(arg, list):
+        return tuple(arg)
+
+    return arg
+
+
+class Replayer:
+    """Replays recorded events, see the module documentation."""
+
+    def __init__(self, events):
+        """EVENTS is a list of (time, event, args) as returned by
+        load()."""
+
+        self.events = events
+
+    def replay(self, dispatcher, PIL_canvas,
+            shape = None,
+            realtime = None):
+        """Dispatch the events by the matplotlayers.backends.\\
+        EventDispatcher DISPATCHER, and render a frame by the FigureCanvasPIL
+        PIL_CANVAS wherever a frame has been recorded.  The frames are
+        rendered with the recorded size, unless SHAPE is given.  If REALTIME
+        is True, the recorded pauses between the events are kept.
+
+        Returns a dict with the latencies of the frames, in seconds, under
+        'latencies', and their statistics under 'mean', 'p50' etc. (see
+        matplotlayers.timing.summarize()), and the number of 'frames' and
+        'events' replayed."""
+
+        if realtime is None:
+            realtime = False
+
+        recorded_shape = None
+        latencies = []
+        dispatched = 0
+
+        # The time of the first event since the last frame.
+        pending = None
+
+        replay_started = timeit.default_timer()
+
+        for (recorded_time, event, args) in self.events:
+            if realtime:
+                delay = recorded_time - \
+                        (timeit.default_timer() - replay_started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            if pending is None:
+                pending = timeit.default_timer()
+
+            if event == 'frame':
+                render_shape = shape or recorded_shape
+                if render_shape is not None:
+                    PIL_canvas.output_PIL(render_shape)
+                    latencies.append(timeit.default_timer() - pending)
+                pending = None
+                continue
+
+            if event == 'resize':
+                recorded_shape = args[0]
+
+            getattr(dispatcher, event)(*args)
+            dispatched += 1
+
+        report = {
+                'latencies': latencies,
+                'frames': len(latencies),
+                'events': dispatched}
+        if len(latencies) > 0:
+            report.update(matplotlayers.timing.summarize(latencies))
+
+        return report
@@ -165,6 +165,83 @@ class StackCanvas:
         return (xstart * (1 - axesx) + xstop * axesx,
                 ystart * (1 - axesy) + ystop * axesy)
 
+    def figurecoords2datacoords(self, figurecoords):
+        """Map figure relative coordinates FIGURECOORDS to data relative
+        coordinates."""
+
+        return self.axescoords2datacoords(
+                self.figurecoords2axescoords(figurecoords))
+
+    def datacoords2figurecoords(self, (datax, datay)):
+        """Map data coordinates (DATAX, DATAY) to figure relative
+        coordinates.  This is the inverse of .figurecoords2datacoords()."""
+
+        (xstart, xstop) = self.stack.get_xlim()
+        (ystart, ystop) = self.stack.get_ylim()
+        bbox = self.stack.axes.get_position()
+
+        return (bbox.x0 + bbox.size[0] * (datax - xstart) / (xstop - xstart),
+                bbox.y0 + bbox.size[1] * (datay - ystart) / (ystop - ystart))
+
+    def get_extent(self):
+        """Return the extent (x0, y0, x1, y1) of the associated Stack in 
+        figure relative coordinates."""
+
+        bbox = self.stack.axes.get_position()
+
+        return (bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+
+    #
+    # Picking ...
+    #
+
+    def pick(self, figurecoords, radius = None):
+        """Find the data point nearest to figure coordinates FIGURECOORDS
+        among the layers of the Stack shown and supporting picking, i.e. 
+        having a .get_spatial_index() method.  Distances are measured on 
+        the figure in points (1/72 inch).  Returns (layer, index, (x, y)),
+        or None if there is no point within RADIUS (default unlimited)."""
+
+        (datax, datay) = self.figurecoords2datacoords(figurecoords)
+
+        # Calculate the data extent of one point in x and y ...
+
+        (xstart, xstop) = self.stack.get_xlim()
+        (ystart, ystop) = self.stack.get_ylim()
+        bbox = self.stack.axes.get_position()
+        (width, height) = self.stack.axes.figure.get_size_inches()
+
+        xscale = (xstop - xstart) / (bbox.size[0] * width * 72)
+        yscale = (ystop - ystart) / (bbox.size[1] * height * 72)
+
+        # Query the layers ...
+
+        (best, best_distance) = (None, None)
+
+        for layer in self.stack.get_layers():
+            if not hasattr(layer, 'get_spatial_index') or \
+                    not self.stack.get_layer_visible(layer):
+                continue
+
+            index = layer.get_spatial_index()
+            if index is None:
+                continue
+
+            result = index.nearest(datax, datay, xscale, yscale,
+                    max_distance = radius)
+            if result is None:
+                continue
+
+            (point, distance) = result
+            if best is None or distance < best_distance:
+                (best, best_distance) = ((layer, point), distance)
+
+        if best is None:
+            return None
+
+        (layer, point) = best
+        return (layer, point, layer.get_point(point))
+
     #
     # Client methods with respect to the StackCanvas ...
     #
@@ -244,17 +321,47 @@ class StackCanvas:
         # Do apply the new view limits only if zooming is not disabled in 
         # the respective dimension.
 
-        if self.zoom_response_x != 0:
-            self.stack.set_xlim(newlim_x)
+        with self.stack.batch():
+            if self.zoom_response_x != 0:
+                self.stack.set_xlim(newlim_x)
 
-        if self.zoom_response_y != 0:
-            self.stack.set_ylim(newlim_y)
+            if self.zoom_response_y != 0:
+                self.stack.set_ylim(newlim_y)
 
     def stop_zoom(self):
         """Set the motion mode to None."""
         
         self.motion_mode = None
 
+    def zoom_to_box(self, figurecoords_start, figurecoords_stop):
+        """Zoom to the box spanned by the figure coordinates 
+        FIGURECOORDS_START and FIGURECOORDS_STOP.  The orientation of the 
+        axes is maintained.  Dimensions with a zoom response of zero are
+        not affected."""
+
+        (startx, starty) = self.figurecoords2datacoords(figurecoords_start)
+        (stopx, stopy) = self.figurecoords2datacoords(figurecoords_stop)
+
+        # Maintain the orientation of the axes ...
+
+        (xstart, xstop) = self.stack.get_xlim()
+        (ystart, ystop) = self.stack.get_ylim()
+
+        if (stopx - startx) * (xstop - xstart) < 0:
+            (startx, stopx) = (stopx, startx)
+
+        if (stopy - starty) * (ystop - ystart) < 0:
+            (starty, stopy) = (stopy, starty)
+
+        # Apply the new view limits ...
+
+        with self.stack.batch():
+            if self.zoom_response_x != 0:
+                self.stack.set_xlim((startx, stopx))
+
+            if self.zoom_response_y != 0:
+                self.stack.set_ylim((starty, stopy))
+
     # Pan mathods ...
 
     def start_pan(self, figurecoords):
@@ -310,8 +417,9 @@ class StackCanvas:
                  (starty - move_datay, stopy - move_datay))
 
         # Set the new limits.
-        self.stack.set_xlim((startx, stopx))
-        self.stack.set_ylim((starty, stopy))
+        with self.stack.batch():
+            self.stack.set_xlim((startx, stopx))
+            self.stack.set_ylim((starty, stopy))
 
     def stop_pan(self):
         """Clears the motion mode."""
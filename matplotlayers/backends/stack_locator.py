@@ -0,0 +1,128 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the StackLocator class, finding the clients of a FigureCanvas at
+some figure position without asking matplotlib for every client's
+position."""
+
+# Default number of grid cells along each figure dimension.
+DEFAULT_CELLS = 16
+
+
+class StackLocator:
+    """Finds the clients at a figure position via a cached index.
+
+    The extents of the clients (see StackCanvas.get_extent()) are retrieved
+    once, and each client is entered into the cells of a uniform grid over
+    the figure it overlaps with.  A lookup then examines only the clients
+    in a single cell, without asking the clients for their extents.  The
+    index is rebuilt on the next lookup after .invalidate() has been
+    called, which must be done when the positions of the axes change, e.g.
+    by axes.set_position().  Registering and unregistering clients
+    invalidates the index automatically."""
+
+    def __init__(self, cells = None):
+        """CELLS is the number of grid cells along each figure dimension,
+        it defaults to DEFAULT_CELLS."""
+
+        if cells is None:
+            cells = DEFAULT_CELLS
+
+        self.cells = cells
+        self.clients = []
+
+        # The index, mapping (cellx, celly) to a list of (extent, client),
+        # built on demand.
+        self._index = None
+
+    #
+    # Client registry ...
+    #
+
+    def register(self, client):
+        """Register the client CLIENT."""
+
+        if client not in self.clients:
+            self.clients.append(client)
+            self.invalidate()
+
+    def unregister(self, client):
+        """Unregister the client CLIENT."""
+
+        if client in self.clients:
+            self.clients.remove(client)
+            self.invalidate()
+
+    def invalidate(self):
+        """Flag that the index has to be rebuilt, e.g. because axes have
+        been moved."""
+
+        self._index = None
+
+    #
+    # Lookup ...
+    #
+
+    def _cell_range(self, start, stop):
+        """Return the range of cells covering the figure coordinate range
+        from START to STOP."""
+
+        first = max(0, min(self.cells - 1, int(start * self.cells)))
+        last = max(0, min(self.cells - 1, int(stop * self.cells)))
+
+        return range(first, last + 1)
+
+    def _build(self):
+        """Build the index from the current extents of the clients."""
+
+        index = {}
+
+        for client in self.clients:
+            extent = tuple(client.get_extent())
+            (x0, y0, x1, y1) = extent
+
+            for cellx in self._cell_range(x0, x1):
+                for celly in self._cell_range(y0, y1):
+                    index.setdefault((cellx, celly), []).append(
+                            (extent, client))
+
+        self._index = index
+
+    def locate(self, (figurex, figurey)):
+        """Return the list of clients whose extent contains the figure
+        coordinates (FIGUREX, FIGUREY), in the order of registration."""
+
+        if not (0 <= figurex <= 1 and 0 <= figurey <= 1):
+            return []
+
+        if self._index is None:
+            self._build()
+
+        cell = (min(self.cells - 1, int(figurex * self.cells)),
+                min(self.cells - 1, int(figurey * self.cells)))
+
+        # The entries of a cell are in the order of registration.
+        return [client
+                for ((x0, y0, x1, y1), client)
+                    in self._index.get(cell, [])
+                if x0 <= figurex <= x1 and y0 <= figurey <= y1]
@@ -1,3 +1,7 @@
+import matplotlayers.lazy
+
 has_mainloop = False
-from matplotlayers.backends.tk.figure_canvas import FigureCanvasTk
-from matplotlayers.backends.tk.stack_settings import StackSettings
+
+matplotlayers.lazy.install(__name__, {
+        'FigureCanvasTk': 'matplotlayers.backends.tk.figure_canvas',
+        'StackSettings': 'matplotlayers.backends.tk.stack_settings'})
@@ -34,24 +34,57 @@ FigureCanvas, thus making panning and zooming several Axes in a Figure easy."""
 import Tkinter
 import PIL.ImageTk
 import matplotlayers.backends.tk  # for .has_mainloop
+import matplotlayers.backends.event_dispatcher
+import matplotlayers.backends.PIL
 import matplotlayers.backends.tk.stack_settings
 import matplotlayers.backends.tk.figure_settings
+import matplotlayers.backends.tk.overlay
+import matplotlayers.backends.tk.hud
+import matplotlayers.timing
 
 
 class FigureCanvasTk:
+
+    # The key toggling the HUD, after the canvas got the focus by a click.
+    HUD_KEY = '<Key-F3>'
+
     def __init__(self, master, 
             figure,
             shape = None,
-            tk_canvas = None):
+            tk_canvas = None,
+            zoom_mode = None,
+            crosshair = None,
+            pick_radius = None,
+            hud = None):
         """figure is a matplotlib.figure.Figure instance.  SHAPE is the extent 
         of the Tkinter.Canvas if a new one is created.  TK_CANVAS can be used 
         to hand over an already-existing Tkinter.Canvas to draw upon.  If a 
         new Tkinter.Canvas is created, it is .pack()ed with arguments 
         expand=True and fill=Tkinter.BOTH.  The default SHAPE is (400, 400).  
-        MASTER is only used when a new Tkinter.Canvas is created."""
+        MASTER is only used when a new Tkinter.Canvas is created.
+        
+        ZOOM_MODE is either 'drag' (the default), zooming continuously while
+        dragging with the left button, or 'box', drawing a rubber-band box
+        which is zoomed to on release.  If CROSSHAIR is True, a crosshair 
+        and the data coordinates are shown at the cursor position.  If 
+        PICK_RADIUS is given, the data point nearest to the cursor within
+        PICK_RADIUS points (1/72 inch) is marked and its coordinates are
+        shown, see StackCanvas.pick().  All this is drawn as Tkinter.Canvas
+        items, so it does not require the figure to be rendered.
+        
+        If HUD is True, the frame time, the frame rate, the time needed by
+        the stages of rendering, and the number of layers rendered are shown
+        on the canvas, see .set_hud().  The HUD can be toggled by the 
+        .HUD_KEY and in the Figure settings dialog."""
 
         if shape is None:
             shape = (400, 400)
+        if zoom_mode is None:
+            zoom_mode = 'drag'
+        if crosshair is None:
+            crosshair = False
+        if hud is None:
+            hud = False
 
         # Initialise attributes ...
 
@@ -71,8 +104,25 @@ class FigureCanvasTk:
                     height=shape[1])
 
         # Initialise client registry ...
+        #
+        # The dispatcher passes the events on to the clients.
+
+        self.dispatcher = \
+                matplotlayers.backends.event_dispatcher.EventDispatcher()
 
-        self.clients = []
+        # Initialise interaction feedback ...
+
+        self.overlay = matplotlayers.backends.tk.overlay.Overlay(
+                self.tk_canvas)
+        self.set_zoom_mode(zoom_mode)
+        self.set_crosshair(crosshair)
+        self.set_pick_radius(pick_radius)
+
+        self.hud = matplotlayers.backends.tk.hud.HUD(self.tk_canvas)
+        self.set_hud(hud)
+
+        # The pixel position where the current zoom box started.
+        self.zoom_box_start = None
 
         # Bind methods ...
 
@@ -88,12 +138,15 @@ class FigureCanvasTk:
         self.tk_canvas.bind('<ButtonRelease-2>', self.tk_stop_pan, add=True)
         self.tk_canvas.bind('<ButtonRelease-3>', self.tk_stop_pan, add=True)
         self.tk_canvas.bind('<Motion>', self.tk_motion, add=True)
+        self.tk_canvas.bind('<Leave>', self.tk_leave, add=True)
         self.tk_canvas.bind('<Double-Button-1>', self.tk_show_figure_settings,
                 add=True)
         self.tk_canvas.bind('<Double-Button-2>', self.tk_show_stack_settings, 
                 add=True)
         self.tk_canvas.bind('<Double-Button-3>', self.tk_show_stack_settings, 
                 add=True)
+        self.tk_canvas.bind('<ButtonPress>', self.tk_focus, add=True)
+        self.tk_canvas.bind(self.HUD_KEY, self.tk_toggle_hud, add=True)
 
         # Pack Tkinter.Canvas if newly created ...
 
@@ -112,6 +165,60 @@ class FigureCanvasTk:
         return (float(pixelx) / self.pixelsize[0],
                 1 - float(pixely) / self.pixelsize[1])
 
+    def figurecoords2pixelcoords(self, (figurex, figurey)):
+        """Convert the figure-relative float coordinate (FIGUREX, FIGUREY)
+        to canvas-relative pixel coordinate (pixelx, pixely).  This is the 
+        inverse of .pixelcoords2figurecoords()."""
+
+        return (figurex * self.pixelsize[0],
+                (1 - figurey) * self.pixelsize[1])
+
+    #
+    # Interaction feedback settings ...
+    #
+
+    def set_zoom_mode(self, zoom_mode):
+        """Set the zoom mode to 'drag' or 'box'."""
+
+        if zoom_mode not in ('drag', 'box'):
+            raise ValueError("Unknown zoom mode %r." % zoom_mode)
+
+        self.zoom_mode = zoom_mode
+
+    def set_crosshair(self, crosshair):
+        """Turn the crosshair on or off."""
+
+        self.crosshair = crosshair
+
+        if not crosshair:
+            self.overlay.hide_crosshair()
+            self.overlay.hide_readout()
+
+    def set_pick_radius(self, pick_radius):
+        """Set the radius in points for picking the data point under the 
+        cursor.  None turns picking off."""
+
+        self.pick_radius = pick_radius
+
+        if pick_radius is None:
+            self.overlay.hide_marker()
+            if not self.crosshair:
+                self.overlay.hide_readout()
+
+    def set_hud(self, hud):
+        """Show or hide the HUD.  It is updated with each frame.  While it
+        is shown, matplotlayers.timing is turned on."""
+
+        if hud:
+            self.hud.show()
+        else:
+            self.hud.hide()
+
+    def get_hud(self):
+        """Return whether the HUD is shown."""
+
+        return self.hud.is_shown()
+
     #
     # Client registry ...
     #
@@ -119,14 +226,24 @@ class FigureCanvasTk:
     def register(self, client):
         """Register the client CLIENT to the canvas."""
 
-        if client not in self.clients:
-            self.clients.append(client)
+        self.dispatcher.register(client)
 
     def unregister(self, client):
         """Unregister the client CLIENT from the canvas."""
         
-        if client in self.clients:
-            self.clients.remove(client)
+        self.dispatcher.unregister(client)
+
+    def invalidate_locator(self):
+        """See EventDispatcher.invalidate_locator()."""
+
+        self.dispatcher.invalidate_locator()
+
+    def set_recorder(self, recorder):
+        """Record the events passed on to the clients, and the frames 
+        rendered, by RECORDER, e.g. a matplotlayers.backends.session.\
+        Recorder.  None turns recording off."""
+
+        self.dispatcher.set_recorder(recorder)
 
     #
     # Tk callbacks ...
@@ -136,15 +253,14 @@ class FigureCanvasTk:
         """Called upon reconfiguration of the .tk_canvas ."""
 
         self.pixelsize = (event.width, event.height)
+        self.dispatcher.resize(self.pixelsize)
         self.update()
 
     def tk_autozoom(self, event):
         """Called upon activation of autozooming."""
 
         figurecoords = self.pixelcoords2figurecoords((event.x, event.y))
-        for client in self.clients:
-            if client.event_location_applies(figurecoords):
-                client.autozoom()
+        self.dispatcher.autozoom(figurecoords)
 
         self.update()
 
@@ -152,9 +268,14 @@ class FigureCanvasTk:
         """Called upon start of zooming."""
 
         figurecoords = self.pixelcoords2figurecoords((event.x, event.y))
-        for client in self.clients:
-            if client.event_location_applies(figurecoords):
-                client.start_zoom(figurecoords)
+
+        if self.zoom_mode == 'box':
+            # Only remember where the box starts.  The view is changed when
+            # the box is complete.
+            self.zoom_box_start = (event.x, event.y)
+            return
+
+        self.dispatcher.start_zoom(figurecoords)
 
         self.update()
 
@@ -162,25 +283,42 @@ class FigureCanvasTk:
         """Called upon start of panning."""
 
         figurecoords = self.pixelcoords2figurecoords((event.x, event.y))
-        for client in self.clients:
-            if client.event_location_applies(figurecoords):
-                client.start_pan(figurecoords)
+        self.dispatcher.start_pan(figurecoords)
 
         self.update()
 
     def tk_stop_zoom(self, event):
         """Called upon stop of zooming."""
 
-        for client in self.clients:
-            client.stop_zoom()
+        if self.zoom_box_start is not None:
+            # Complete the zoom box ...
+
+            (startx, starty) = self.zoom_box_start
+            self.zoom_box_start = None
+            self.overlay.hide_box()
+
+            # Ignore boxes too small to be meant as such, e.g. clicks.
+            if abs(event.x - startx) < 3 or abs(event.y - starty) < 3:
+                return
+
+            figurecoords_start = \
+                    self.pixelcoords2figurecoords((startx, starty))
+            figurecoords_stop = \
+                    self.pixelcoords2figurecoords((event.x, event.y))
+            self.dispatcher.zoom_to_box(figurecoords_start, 
+                    figurecoords_stop)
+
+            self.update()
+            return
+
+        self.dispatcher.stop_zoom()
 
         self.update()
 
     def tk_stop_pan(self, event):
         """Called upon stop of panning."""
 
-        for client in self.clients:
-            client.stop_pan()
+        self.dispatcher.stop_pan()
 
         self.update()
 
@@ -188,42 +326,117 @@ class FigureCanvasTk:
         """Called when the settings dialog shall be shown."""
 
         figurecoords = self.pixelcoords2figurecoords((event.x, event.y))
-        for client in self.clients:
-            if client.event_location_applies(figurecoords):
-                # Create dialog:
-                matplotlayers.backends.tk.stack_settings.StackSettings(
-                        self.tk_canvas, client.stack, self.update)
+        for client in self.dispatcher.locate(figurecoords):
+            # Create dialog:
+            matplotlayers.backends.tk.stack_settings.StackSettings(
+                    self.tk_canvas, client.stack, self.update)
 
     def tk_show_figure_settings(self, event):
         """Called when the Figure settings dialog shall be shown."""
 
         # Create dialog:
         matplotlayers.backends.tk.figure_settings.FigureSettings(
-                self.tk_canvas, self.figure)
+                self.tk_canvas, self.figure, figure_canvas = self)
+
+    def tk_focus(self, event):
+        """Called on clicks, to receive the key events."""
+
+        self.tk_canvas.focus_set()
+
+    def tk_toggle_hud(self, event):
+        """Called when the HUD key is pressed."""
+
+        self.set_hud(not self.get_hud())
 
     def tk_motion(self, event):
         """Called when the cursor is moved."""
 
         figurecoords = self.pixelcoords2figurecoords((event.x, event.y))
-        for client in self.clients:
-            # Pass motion events on the all clients.  Once the start event
-            # did apply to a client, also motion events at locations where
-            # start events would not apply, shall be passed on.
-            client.motion(figurecoords)
 
-        self.update()
+        # Update the feedback drawn on top of the figure ...
+
+        if self.zoom_box_start is not None:
+            self.overlay.show_box(self.zoom_box_start, (event.x, event.y))
+
+        if self.crosshair or self.pick_radius is not None:
+            self.update_feedback((event.x, event.y), figurecoords)
+
+        # Move the view ...
+        #
+        # Render only when some client did actually change its view.
+
+        if self.dispatcher.motion(figurecoords):
+            self.update()
+
+    def tk_leave(self, event):
+        """Called when the cursor leaves the canvas."""
+
+        self.overlay.hide_crosshair()
+        self.overlay.hide_readout()
+        self.overlay.hide_marker()
+
+    #
+    # Interaction feedback ...
+    #
+
+    def update_feedback(self, pixelcoords, figurecoords):
+        """Show the crosshair, the data coordinates, and the picked data 
+        point at PIXELCOORDS in the client under the cursor, as far as they
+        are turned on.  Hide them if there is no such client.  FIGURECOORDS
+        are the figure coordinates of PIXELCOORDS."""
+
+        clients = self.dispatcher.locate(figurecoords)
+        if len(clients) == 0:
+            self.overlay.hide_crosshair()
+            self.overlay.hide_readout()
+            self.overlay.hide_marker()
+            return
+
+        client = clients[0]
+
+        lines = []
+
+        if self.crosshair:
+            (x0, y0, x1, y1) = client.get_extent()
+            (left, top) = self.figurecoords2pixelcoords((x0, y1))
+            (right, bottom) = self.figurecoords2pixelcoords((x1, y0))
+
+            (datax, datay) = client.figurecoords2datacoords(figurecoords)
+
+            self.overlay.show_crosshair(pixelcoords,
+                    (left, top, right, bottom))
+            lines.append('x = %g\ny = %g' % (datax, datay))
+
+        if self.pick_radius is not None:
+            picked = client.pick(figurecoords, radius = self.pick_radius)
+
+            if picked is None:
+                self.overlay.hide_marker()
+            else:
+                (layer, index, (pointx, pointy)) = picked
+                self.overlay.show_marker(self.figurecoords2pixelcoords(
+                        client.datacoords2figurecoords((pointx, pointy))))
+                lines.append('[%d]  %g, %g' % (index, pointx, pointy))
+
+        if len(lines) > 0:
+            self.overlay.show_readout(pixelcoords, '\n'.join(lines))
+        else:
+            self.overlay.hide_readout()
 
     #
     # Update method ...
     #
 
     def update(self):
-        """Redraws the figure."""
+        """Redraws the figure.  See matplotlayers.timing for measuring the
+        time needed."""
 
         if self.pixelsize is None: 
             # If this is called before .tk_configure() was initialised we 
             # ignore the call silently.
             return
+
+        started = matplotlayers.timing.start()
         
         # Retrieve the image.
         image = self.PIL_canvas.output_PIL(self.pixelsize)
@@ -233,7 +446,10 @@ class FigureCanvasTk:
                 (self.photoimage, self.photoimage_tag)
 
         # Create the new photoimage.
+        photoimage_started = matplotlayers.timing.start()
         self.photoimage = PIL.ImageTk.PhotoImage(image)
+        matplotlayers.timing.stop('FigureCanvasTk PhotoImage',
+                photoimage_started)
 
         # Put it on the Canvas before deleting the old one.  This avoids
         # flickering.
@@ -244,6 +460,14 @@ class FigureCanvasTk:
             # If there was a previous image, remove it from the Canvas.
             self.tk_canvas.delete(old_photoimage_tag)
 
+        # Keep the interaction feedback visible.
+        self.overlay.lift()
+
+        self.dispatcher.frame()
+
+        if self.hud.is_shown():
+            self.hud.frame()
+
         if not matplotlayers.backends.tk.has_mainloop:
             # If we /have/ a mainloop, we /must/ avoid calling .update().
             # This showed up when having a mainloop, crashing the program ...
@@ -252,6 +476,8 @@ class FigureCanvasTk:
             # a charm again.
             self.tk_canvas.update()
 
+        matplotlayers.timing.stop('FigureCanvasTk update', started)
+
     #
     # Tk Destroy method ...
     #
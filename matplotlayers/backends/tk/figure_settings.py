@@ -23,22 +23,35 @@
 
 """Settings of a complete figure, also writing down to HDD."""
 
+import os
+import sys
+import threading
+import time
 import Tkinter
 import tkFileDialog
 import ventry
-import matplotlib.backends.backend_ps
-import matplotlib.backends.backend_pdf
-import matplotlayers.backends.PIL
+import matplotlayers.rasterization
+import matplotlayers.backends.export
+import matplotlayers.backends.PIL.figure_canvas
+
+# The file name extensions used when saving several formats at once.
+EXTENSIONS = {'eps': '.eps', 'pdf': '.pdf', 'raster': '.png'}
+
+# The interval of updating the progress of the exports, in milliseconds.
+POLL_INTERVAL = 250
 
 
 class FigureSettings(Tkinter.Toplevel):
 
-    def __init__(self, master, figure):
-        """FIGURE is the matplotlib.figure.Figure to act upon."""
+    def __init__(self, master, figure, figure_canvas = None):
+        """FIGURE is the matplotlib.figure.Figure to act upon.  FIGURE_CANVAS
+        is the optional matplotlayers.backends.tk.FigureCanvasTk showing 
+        FIGURE, to change its view settings."""
 
         Tkinter.Toplevel.__init__(self, master)
         self.wm_title('Figure Settings')
         self.figure = figure
+        self.figure_canvas = figure_canvas
 
         # Create Save widgets ...
 
@@ -65,8 +78,14 @@ class FigureSettings(Tkinter.Toplevel):
                 name = 'Size Y (Inches):',
                 column = 0, row = 1,
                 initial = 9.0, validate = ventry.number)
+        self.inches_raster_dpi = ventry.NamedVEntry(self.frame_dim_inches,
+                name = 'Raster DPI:',
+                column = 0, row = 2,
+                initial = matplotlayers.rasterization.dpi,
+                validate = ventry.number)
         self.inches_xdim.initialise()
         self.inches_ydim.initialise()
+        self.inches_raster_dpi.initialise()
 
         # Create save button EPS.
         self.button_eps = Tkinter.Button(self.lframe_vector,
@@ -93,8 +112,13 @@ class FigureSettings(Tkinter.Toplevel):
                 name = 'Size Y (Pixels):',
                 column = 0,row = 1,
                 initial = 600,validate = ventry.int)
+        self.pixels_processes = ventry.NamedVEntry(self.frame_dim_pixels,
+                name = 'Processes:',
+                column = 0, row = 2,
+                initial = 1, validate = ventry.int)
         self.pixels_xdim.initialise()
         self.pixels_ydim.initialise()
+        self.pixels_processes.initialise()
 
         # Create save image button.
         self.button_img = Tkinter.Button(self.lframe_raster,
@@ -102,6 +126,64 @@ class FigureSettings(Tkinter.Toplevel):
                 command = self.tk_save_img)
         self.button_img.pack(side = Tkinter.TOP, fill = Tkinter.X)
 
+        self.label_raster = Tkinter.Label(self.lframe_raster,
+                text = 'Above %d Mpixels, PNG only.' % \
+                    (matplotlayers.backends.PIL.figure_canvas.\
+                        ASSEMBLED_PIXELS // 2 ** 20),
+                justify = Tkinter.LEFT)
+        self.label_raster.pack(side = Tkinter.TOP, anchor = Tkinter.W)
+
+        # Create widgets saving several formats at once.
+        self.lframe_formats = Tkinter.LabelFrame(self.lframe_save,
+                text = 'Several Formats')
+        self.lframe_formats.pack(side = Tkinter.TOP, fill = Tkinter.X)
+
+        self.formats_on = {}
+        for (format, text) in (('eps', 'EPS'), ('pdf', 'PDF'),
+                ('raster', 'PNG')):
+            self.formats_on[format] = Tkinter.BooleanVar(self.lframe_formats)
+            checkbutton = Tkinter.Checkbutton(self.lframe_formats,
+                    text = text,
+                    variable = self.formats_on[format])
+            checkbutton.pack(side = Tkinter.TOP, anchor = Tkinter.W)
+
+        self.button_formats = Tkinter.Button(self.lframe_formats,
+                text = 'Save Formats ...',
+                command = self.tk_save_formats)
+        self.button_formats.pack(side = Tkinter.TOP, fill = Tkinter.X)
+
+        # Create the progress display of the exports.
+        self.export_status = Tkinter.StringVar(self.lframe_save)
+        self.label_status = Tkinter.Label(self.lframe_save,
+                textvariable = self.export_status,
+                justify = Tkinter.LEFT)
+        self.label_status.pack(side = Tkinter.TOP, anchor = Tkinter.W)
+
+        # The exports running or finished lately, and the id of the next
+        # poll of their progress, if any.
+        self.exports = []
+        self.polling = None
+
+        # Create View widgets ...
+
+        if self.figure_canvas is not None:
+            self.lframe_view = Tkinter.LabelFrame(self, text = 'View')
+            self.lframe_view.pack(side = Tkinter.LEFT, anchor = Tkinter.N)
+
+            self.hud_on = Tkinter.BooleanVar(self.lframe_view)
+            self.hud_on.set(self.figure_canvas.get_hud())
+
+            self.checkbutton_hud = Tkinter.Checkbutton(self.lframe_view,
+                    text = 'Performance HUD',
+                    command = self.tk_hud,
+                    variable = self.hud_on)
+            self.checkbutton_hud.pack(side = Tkinter.TOP, anchor = Tkinter.W)
+
+    def tk_hud(self):
+        """Called on changes of the HUD checkbutton."""
+
+        self.figure_canvas.set_hud(self.hud_on.get())
+
     def tk_save_eps(self):
         filename = tkFileDialog.asksaveasfilename(
                 defaultextension = '.eps',
@@ -113,11 +195,7 @@ class FigureSettings(Tkinter.Toplevel):
                 parent = self,
                 title = 'Save Figure as Encapsulated PostScript')
         if filename != '':
-            self.figure.set_size_inches(
-                    (self.inches_xdim.get(), self.inches_ydim.get()))
-            canvas = matplotlib.backends.backend_ps.\
-                    FigureCanvasPS(self.figure)
-            canvas.print_eps(filename)
+            self.export(filename, 'eps')
 
     def tk_save_pdf(self):
         filename = tkFileDialog.asksaveasfilename(
@@ -128,11 +206,7 @@ class FigureSettings(Tkinter.Toplevel):
                 parent = self,
                 title = 'Save Figure as PDF')
         if filename != '':
-            self.figure.set_size_inches(
-                    (self.inches_xdim.get(), self.inches_ydim.get()))
-            canvas = matplotlib.backends.backend_pdf.\
-                    FigureCanvasPdf(self.figure)
-            canvas.print_pdf(filename)
+            self.export(filename, 'pdf')
 
     def tk_save_img(self):
         filename = tkFileDialog.asksaveasfilename(
@@ -143,7 +217,102 @@ class FigureSettings(Tkinter.Toplevel):
                 parent = self,
                 title = 'Save Figure as Image')
         if filename != '':
-            canvas = matplotlayers.backends.PIL.FigureCanvasPIL(self.figure)
-            image = canvas.output_PIL(
-                    (self.pixels_xdim.get(), self.pixels_ydim.get()))
-            image.save(filename)
+            self.export(filename, 'raster')
+
+    def tk_save_formats(self):
+        """Save the figure in all formats checked, under the file name 
+        asked for with the extensions of EXTENSIONS."""
+
+        formats = [format for format in ('eps', 'pdf', 'raster')
+                if self.formats_on[format].get()]
+        if len(formats) == 0:
+            return
+
+        filename = tkFileDialog.asksaveasfilename(
+                filetypes = [('All Files', '*')],
+                parent = self,
+                title = 'Save Figure in Several Formats')
+        if filename != '':
+            (root, extension) = os.path.splitext(filename)
+            for format in formats:
+                self.export(root + EXTENSIONS[format], format)
+
+    #
+    # Exporting ...
+    #
+
+    def export(self, filename, format):
+        """Start saving the figure to FILENAME in FORMAT in the background,
+        see matplotlayers.backends.export.  The figure shown stays as it 
+        is."""
+
+        # Forget the exports finished.
+        self.exports = [export for export in self.exports
+                if not export.finished]
+
+        export = matplotlayers.backends.export.Export(self.figure,
+                filename, format,
+                size_inches = (self.inches_xdim.get(),
+                    self.inches_ydim.get()),
+                shape = (self.pixels_xdim.get(), self.pixels_ydim.get()),
+                processes = self.pixels_processes.get(),
+                raster_dpi = self.inches_raster_dpi.get())
+        export.start()
+        self.exports.append(export)
+
+        if self.polling is None:
+            self.tk_poll_exports()
+
+    def tk_poll_exports(self):
+        """Show the progress of the exports, and poll again while some are
+        running."""
+
+        lines = []
+        running = False
+
+        for export in self.exports:
+            name = os.path.basename(export.filename)
+
+            was_finished = export.finished
+            if not export.poll():
+                lines.append('Saving %s (%d s) ...' % \
+                        (name, time.time() - export.started))
+                running = True
+            elif export.error is None:
+                lines.append('Saved %s.' % name)
+            else:
+                lines.append('Failed to save %s.' % name)
+                if not was_finished:
+                    sys.stderr.write(export.error)
+
+        self.export_status.set('\n'.join(lines))
+
+        self.polling = None
+        if running:
+            self.polling = self.after(POLL_INTERVAL, self.tk_poll_exports)
+
+    def destroy(self):
+        """Destroy the dialogue.  The exports still running are waited for
+        in a thread, which reports their failures."""
+
+        if self.polling is not None:
+            self.after_cancel(self.polling)
+            self.polling = None
+
+        running = [export for export in self.exports if not export.finished]
+        if len(running) > 0:
+            thread = threading.Thread(target = _wait_for_exports,
+                    args = (running,))
+            thread.daemon = True
+            thread.start()
+
+        Tkinter.Toplevel.destroy(self)
+
+
+def _wait_for_exports(exports):
+    """Join the EXPORTS, and report their failures."""
+
+    for export in exports:
+        export.wait()
+        if export.error is not None:
+            sys.stderr.write(export.error)
@@ -0,0 +1,181 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the HUD class, showing performance figures as plain
+Tkinter.Canvas items on top of the figure image.  The figures are not part
+of the matplotlib figure, so showing them does not change what is rendered
+by Agg."""
+
+import collections
+import timeit
+import matplotlayers.timing
+
+# The stages of matplotlayers.timing shown, with their labels.
+STAGES = [
+        ('Stack.render', 'render'),
+        ('FigureCanvasPIL draw', 'draw'),
+        ('FigureCanvasPIL tostring_rgb', 'tostring'),
+        ('FigureCanvasPIL fromstring', 'fromstring'),
+        ('FigureCanvasTk PhotoImage', 'PhotoImage')]
+
+# The number of recent frames the frame rate is calculated from.
+FRAMES = 32
+
+
+class HUD:
+    """Shows the frame time, the frame rate, the time needed by each stage
+    of the rendering pipeline, and the number of layers rendered and reused
+    since the last frame.
+
+    The figures are taken from matplotlayers.timing, which is turned on
+    while the HUD is shown.  Call .frame() after each frame."""
+
+    def __init__(self, tk_canvas,
+            color = None,
+            background = None,
+            font = None):
+        """TK_CANVAS is the Tkinter.Canvas to draw on.  COLOR is the colour
+        of the text, BACKGROUND the colour of the box behind.  FONT is the
+        font of the text."""
+
+        if color is None:
+            color = 'white'
+        if background is None:
+            background = 'gray20'
+        if font is None:
+            font = ('Courier', 9)
+
+        self.tk_canvas = tk_canvas
+        self.color = color
+        self.background = background
+        self.font = font
+
+        # The items are created when shown.
+        self.text_tag = None
+        self.box_tag = None
+
+        # Whether timing has been turned on by us, to turn it off again.
+        self.enabled_timing = False
+
+        # The times of the recent frames, and the counters at the last
+        # frame.
+        self.frame_times = collections.deque(maxlen = FRAMES)
+        self.counters = {}
+
+    def is_shown(self):
+        """Return whether the HUD is shown."""
+
+        return self.text_tag is not None
+
+    def show(self):
+        """Show the HUD.  The figures appear with the next frame."""
+
+        if self.is_shown():
+            return
+
+        if not matplotlayers.timing.enabled:
+            matplotlayers.timing.enable()
+            self.enabled_timing = True
+
+        self.box_tag = self.tk_canvas.create_rectangle(0, 0, 0, 0,
+                fill = self.background, outline = '', tags = 'hud')
+        self.text_tag = self.tk_canvas.create_text(4, 4,
+                anchor = 'nw', fill = self.color, font = self.font,
+                text = 'waiting for frame ...', tags = 'hud')
+        self._fit_box()
+
+        self.frame_times.clear()
+        self.counters = matplotlayers.timing.get_statistics()[1]
+
+    def hide(self):
+        """Remove the HUD."""
+
+        if not self.is_shown():
+            return
+
+        self.tk_canvas.delete(self.text_tag)
+        self.tk_canvas.delete(self.box_tag)
+        (self.text_tag, self.box_tag) = (None, None)
+
+        if self.enabled_timing:
+            matplotlayers.timing.disable()
+            self.enabled_timing = False
+
+    def lift(self):
+        """Raise the HUD above all other items."""
+
+        if self.is_shown():
+            self.tk_canvas.tag_raise('hud')
+
+    def _fit_box(self):
+        """Fit the background box to the text."""
+
+        (left, top, right, bottom) = self.tk_canvas.bbox(self.text_tag)
+        self.tk_canvas.coords(self.box_tag,
+                left - 4, top - 4, right + 4, bottom + 4)
+
+    #
+    # Updating ...
+    #
+
+    def frame(self):
+        """Record that a frame has been shown, and show the figures."""
+
+        if not self.is_shown():
+            return
+
+        self.frame_times.append(timeit.default_timer())
+        (stages, counters) = matplotlayers.timing.get_statistics()
+
+        lines = []
+
+        # Frame time and rate ...
+
+        if 'FigureCanvasTk update' in stages:
+            lines.append('frame   %7.1f ms' % \
+                    (1e3 * stages['FigureCanvasTk update']['mean']))
+
+        if len(self.frame_times) > 1:
+            interval = (self.frame_times[-1] - self.frame_times[0]) / \
+                    (len(self.frame_times) - 1)
+            if interval > 0:
+                lines.append('fps     %7.1f' % (1.0 / interval))
+
+        # Stages ...
+
+        for (name, label) in STAGES:
+            if name in stages:
+                lines.append('%-10s%5.1f ms' % \
+                        (label, 1e3 * stages[name]['mean']))
+
+        # Layers since the last frame ...
+
+        for name in ('layers rendered', 'layers reused'):
+            lines.append('%-10s%5d' % (name.split()[1],
+                    counters.get(name, 0) - self.counters.get(name, 0)))
+
+        self.counters = counters
+
+        self.tk_canvas.itemconfigure(self.text_tag, text = '\n'.join(lines))
+        self._fit_box()
+        self.lift()
@@ -0,0 +1,172 @@
+# Copyright (c) 2010 Friedrich Romstedt <friedrichromstedt@gmail.com>
+# See also <www.friedrichromstedt.org> (if e-mail has changed)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the Overlay class, drawing interaction feedback as plain
+Tkinter.Canvas items on top of the figure image.  Showing, moving and
+hiding the items does not require the figure to be rendered again."""
+
+
+class Overlay:
+    """Draws a crosshair, a coordinate readout, a point marker, and a
+    rubber-band box onto a Tkinter.Canvas.  All coordinates are canvas pixel
+    coordinates."""
+
+    def __init__(self, tk_canvas,
+            color = None,
+            box_color = None,
+            font = None):
+        """TK_CANVAS is the Tkinter.Canvas to draw on.  COLOR is the colour
+        of the crosshair and the readout, BOX_COLOR the colour of the
+        rubber-band box.  FONT is the font of the readout."""
+
+        if color is None:
+            color = 'gray40'
+        if box_color is None:
+            box_color = 'black'
+        if font is None:
+            font = ('Helvetica', 9)
+
+        self.tk_canvas = tk_canvas
+        self.color = color
+        self.box_color = box_color
+        self.font = font
+
+        # The items are created on first use.
+        self.crosshair_tags = None
+        self.readout_tag = None
+        self.marker_tag = None
+        self.box_tag = None
+
+    #
+    # Crosshair ...
+    #
+
+    def show_crosshair(self, (pixelx, pixely), (left, top, right, bottom)):
+        """Show the crosshair at (PIXELX, PIXELY), ranging over the box
+        (LEFT, TOP, RIGHT, BOTTOM)."""
+
+        if self.crosshair_tags is None:
+            self.crosshair_tags = (
+                    self.tk_canvas.create_line(0, 0, 0, 0,
+                        fill = self.color, dash = (2, 2), tags = 'overlay'),
+                    self.tk_canvas.create_line(0, 0, 0, 0,
+                        fill = self.color, dash = (2, 2), tags = 'overlay'))
+
+        (horizontal, vertical) = self.crosshair_tags
+        self.tk_canvas.coords(horizontal, left, pixely, right, pixely)
+        self.tk_canvas.coords(vertical, pixelx, top, pixelx, bottom)
+
+    def hide_crosshair(self):
+        """Remove the crosshair."""
+
+        if self.crosshair_tags is not None:
+            for tag in self.crosshair_tags:
+                self.tk_canvas.delete(tag)
+            self.crosshair_tags = None
+
+    #
+    # Readout ...
+    #
+
+    def show_readout(self, (pixelx, pixely), text):
+        """Show TEXT next to position (PIXELX, PIXELY)."""
+
+        if self.readout_tag is None:
+            self.readout_tag = self.tk_canvas.create_text(0, 0,
+                    anchor = 'nw', fill = self.color, font = self.font,
+                    tags = 'overlay')
+
+        self.tk_canvas.coords(self.readout_tag, pixelx + 12, pixely + 12)
+        self.tk_canvas.itemconfigure(self.readout_tag, text = text)
+
+    def hide_readout(self):
+        """Remove the readout."""
+
+        if self.readout_tag is not None:
+            self.tk_canvas.delete(self.readout_tag)
+            self.readout_tag = None
+
+    #
+    # Marker ...
+    #
+
+    def show_marker(self, (pixelx, pixely)):
+        """Mark position (PIXELX, PIXELY), e.g. of a picked data point."""
+
+        if self.marker_tag is None:
+            self.marker_tag = self.tk_canvas.create_oval(0, 0, 0, 0,
+                    outline = self.color, tags = 'overlay')
+
+        self.tk_canvas.coords(self.marker_tag,
+                pixelx - 4, pixely - 4, pixelx + 4, pixely + 4)
+
+    def hide_marker(self):
+        """Remove the marker."""
+
+        if self.marker_tag is not None:
+            self.tk_canvas.delete(self.marker_tag)
+            self.marker_tag = None
+
+    #
+    # Rubber-band box ...
+    #
+
+    def show_box(self, (startx, starty), (stopx, stopy)):
+        """Show the rubber-band box spanned by (STARTX, STARTY) and
+        (STOPX, STOPY)."""
+
+        if self.box_tag is None:
+            self.box_tag = self.tk_canvas.create_rectangle(0, 0, 0, 0,
+                    outline = self.box_color, dash = (4, 2),
+                    tags = 'overlay')
+
+        self.tk_canvas.coords(self.box_tag, startx, starty, stopx, stopy)
+
+    def hide_box(self):
+        """Remove the rubber-band box."""
+
+        if self.box_tag is not None:
+            self.tk_canvas.delete(self.box_tag)
+            self.box_tag = None
+
+    #
+    # Stacking ...
+    #
+
+    def lift(self):
+        """Raise the overlay items above all other items, e.g. above a newly
+        created figure image."""
+
+        if self.crosshair_tags is not None or \
+                self.readout_tag is not None or \
+                self.marker_tag is not None or \
+                self.box_tag is not None:
+            self.tk_canvas.tag_raise('overlay')
+
+    def hide(self):
+        """Remove all overlay items."""
+
+        self.hide_crosshair()
+        self.hide_readout()
+        self.hide_marker()
+        self.hide_box()
@@ -155,18 +155,42 @@ class StackSettings(Tkinter.Toplevel):
         self.update_autoscalex_accessibility()
         self.update_autoscaley_accessibility()
 
+        # Create layer visibility widgets.
+        self.lframe_layers = Tkinter.LabelFrame(self.lframe_settings,
+                text = 'Layers')
+        self.lframe_layers.pack(side = Tkinter.TOP, anchor = Tkinter.W,
+                fill = Tkinter.X)
+
+        self.layers_visible = []
+        for (index, layer) in enumerate(self.stack.get_layers()):
+            visible = Tkinter.BooleanVar(self.lframe_layers)
+            visible.set(self.stack.get_layer_visible(layer))
+            self.layers_visible.append((layer, visible))
+
+            checkbutton = Tkinter.Checkbutton(self.lframe_layers,
+                    text = '%d: %s' % (index, layer.__class__.__name__),
+                    command = self.tk_layer_visible,
+                    variable = visible)
+            checkbutton.pack(side = Tkinter.TOP, anchor = Tkinter.W)
+
     def tk_update_labeling(self):
-        self.stack.set_title(self.title.get().replace('\\n', '\n'))
-        self.stack.set_xlabel(self.xlabel.get().replace('\\n', '\n'))
-        self.stack.set_ylabel(self.ylabel.get().replace('\\n', '\n'))
+        with self.stack.batch(self.callback_update):
+            self.stack.set_title(self.title.get().replace('\\n', '\n'))
+            self.stack.set_xlabel(self.xlabel.get().replace('\\n', '\n'))
+            self.stack.set_ylabel(self.ylabel.get().replace('\\n', '\n'))
 
-        self.callback_update()
         self.update_title()
 
     def tk_update_limits(self):
-           
-        # Tells wheter an update is needed or not:
-        update_needed = False
+
+        # The batch calls .callback_update() once if the stack has been
+        # changed.
+        with self.stack.batch(self.callback_update):
+            self.update_limits()
+
+    def update_limits(self):
+        """Show the limits of autoscaled axes, and apply the limits typed in 
+        for the other axes."""
 
         if self.autoscalex_on.get():
             
@@ -185,9 +209,6 @@ class StackSettings(Tkinter.Toplevel):
             self.stack.set_xlim(
                     (self.xlim_left.get(), self.xlim_right.get()))
 
-            # Only in this branch update the stack.
-            update_needed = True
-
         if self.autoscaley_on.get():
 
             # We are in autoscale mode, thus update the values displayed ...
@@ -205,12 +226,6 @@ class StackSettings(Tkinter.Toplevel):
             self.stack.set_ylim(
                     (self.ylim_bottom.get(), self.ylim_top.get()))
 
-            # Only in this branch update the stack.
-            update_needed = True
-
-        if update_needed:
-            self.callback_update()
-
     def update_autoscalex_accessibility(self):
         """Enables / Disables widgets according to the X autoscale setting."""
 
@@ -289,6 +304,14 @@ class StackSettings(Tkinter.Toplevel):
 
         self.callback_update()
 
+    def tk_layer_visible(self):
+        """Called on changes of the layer checkbuttons."""
+
+        for (layer, visible) in self.layers_visible:
+            self.stack.set_layer_visible(layer, visible.get())
+
+        self.callback_update()
+
     def update_title(self):
         """Update the title of the window according to the title of the
         stack."""
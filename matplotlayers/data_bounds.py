@@ -0,0 +1,73 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Functions for handling the data bounds of layers, see
+Layer.get_data_bounds().  Bounds are ((xmin, xmax), (ymin, ymax)) tuples,
+where the range of a dimension is None if there is no finite data in
+it.
+
+numpy is imported by finite_range() only, so that a Stack, using union(),
+can be imported without it."""
+
+
+def finite_range(low, high = None, valid = None):
+    """Return (min, max) of the finite values, where the minimum is taken
+    over LOW and the maximum over HIGH (default LOW).  Only elements where
+    both LOW and HIGH are finite, and where the optional mask VALID is True,
+    are used.  Masked elements are ignored.  Returns None if there is no
+    such element."""
+
+    import numpy
+
+    low = numpy.ma.asarray(low, dtype=float).filled(numpy.nan).ravel()
+    if high is None:
+        high = low
+    else:
+        high = numpy.ma.asarray(high, dtype=float).filled(numpy.nan).ravel()
+
+    mask = numpy.isfinite(low) & numpy.isfinite(high)
+    if valid is not None:
+        mask &= numpy.asarray(valid).ravel()
+
+    if not mask.any():
+        return None
+
+    return (float(low[mask].min()), float(high[mask].max()))
+
+
+def union_range(a, b):
+    """Return the range covering both ranges A and B, each of which may be
+    None."""
+
+    if a is None:
+        return b
+    if b is None:
+        return a
+
+    return (min(a[0], b[0]), max(a[1], b[1]))
+
+
+def union(a, b):
+    """Return the bounds covering both bounds A and B."""
+
+    return (union_range(a[0], b[0]), union_range(a[1], b[1]))
@@ -0,0 +1,138 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the Grid class, holding the coordinates shared by several
+pcolor-like layers."""
+
+import numpy
+import matplotlayers.data_bounds
+
+# The relative tolerance of the steps of coordinates taken as uniformly
+# spaced, a few float roundings of the step.
+UNIFORM_RTOL = 1e-9
+
+
+class Grid:
+    """Holds the X and Y coordinates of a pcolor-like plot, together with the
+    arrays derived from them.
+
+    Several layers plotting data on the same coordinates can reference one
+    Grid instance via their 'grid' configuration option instead of holding
+    X and Y on their own.  The derived arrays are computed once on first
+    use and are shared by all layers referencing the Grid afterwards.  The
+    layers then differ only by their C data.
+
+    A Grid is not meant to be changed after creation.  To plot on different
+    coordinates, create a new Grid and configure the layers with it."""
+
+    def __init__(self, X, Y):
+        """X and Y are the coordinates as handed over to axes.pcolor() et al.
+        They can be either both one-dimensional, giving the coordinates of
+        the columns and rows respectively, or both two-dimensional."""
+
+        self.X = numpy.asarray(X)
+        self.Y = numpy.asarray(Y)
+
+        if self.X.ndim != self.Y.ndim or self.X.ndim not in (1, 2):
+            raise ValueError("X and Y must be both either one- or "
+                    "two-dimensional.")
+
+        # The derived arrays, computed on demand.
+        self._mesh = None
+        self._edges = None
+        self._bounds = None
+
+    #
+    # Derived data ...
+    #
+
+    def get_mesh(self):
+        """Returns the two-dimensional coordinate arrays (X, Y).  For a Grid
+        created from one-dimensional coordinates, these are computed once
+        and are reused afterwards."""
+
+        if self._mesh is None:
+            if self.X.ndim == 1:
+                (X, Y) = numpy.meshgrid(self.X, self.Y)
+            else:
+                (X, Y) = (self.X, self.Y)
+
+            self._mesh = (X, Y)
+
+        return self._mesh
+
+    def get_edges(self, shape = None):
+        """Returns the (X, Y) arguments for axes.pcolorfast().  For uniformly
+        spaced one-dimensional coordinates, these are the (start, stop)
+        tuples, so that matplotlib can draw the data as an image.  For
+        other one-dimensional coordinates, these are the coordinates
+        themselves, and for two-dimensional coordinates, the mesh is
+        returned.
+
+        SHAPE is the (rows, columns) shape of the C data.  If given,
+        one-dimensional coordinates must be the edges of the cells, one more
+        than the columns and rows, else ValueError is raised.  Coordinates
+        of the cell centres would be compressed to a wrong extent."""
+
+        if shape is not None and self.X.ndim == 1:
+            (rows, columns) = shape[:2]
+            if len(self.X) != columns + 1 or len(self.Y) != rows + 1:
+                raise ValueError("One-dimensional X and Y must be the %d "
+                        "and %d edges of the cells of C with shape %s, "
+                        "not %d and %d." % (columns + 1, rows + 1,
+                            tuple(shape), len(self.X), len(self.Y)))
+
+        if self._edges is None:
+            if self.X.ndim == 1:
+                self._edges = (self._compress_uniform(self.X),
+                        self._compress_uniform(self.Y))
+            else:
+                self._edges = self.get_mesh()
+
+        return self._edges
+
+    def get_bounds(self):
+        """Returns the bounds ((xmin, xmax), (ymin, ymax)) of the finite
+        coordinates, see matplotlayers.data_bounds.  They are computed once
+        and are reused afterwards."""
+
+        if self._bounds is None:
+            self._bounds = (
+                    matplotlayers.data_bounds.finite_range(self.X),
+                    matplotlayers.data_bounds.finite_range(self.Y))
+
+        return self._bounds
+
+    def _compress_uniform(self, coordinates):
+        """Returns (start, stop) for uniformly spaced one-dimensional
+        COORDINATES, else the COORDINATES unchanged."""
+
+        if len(coordinates) < 2:
+            return coordinates
+
+        steps = numpy.diff(coordinates)
+        if steps[0] != 0 and numpy.allclose(steps, steps[0],
+                rtol = UNIFORM_RTOL, atol = 0):
+            return (coordinates[0], coordinates[-1])
+
+        return coordinates
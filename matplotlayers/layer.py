@@ -32,6 +32,18 @@ class Layer(keyconf.Configuration):
     def __init__(self):
         """Sets the layer to has-changed."""
 
+        # The version is incremented on each change.  It can be used to key
+        # data derived from the layer's configuration.
+        self.version = 0
+
+        # The data bounds, calculated on demand, and the .version they were
+        # calculated for.
+        self._data_bounds = None
+        self._data_bounds_version = None
+
+        # The keyword arguments configured, see .get_settings().
+        self._settings = {}
+
         keyconf.Configuration.__init__(self)
 
         self.set_changed()
@@ -42,19 +54,30 @@ class Layer(keyconf.Configuration):
     def configure(self, **kwargs):
         self.set_changed()
         keyconf.Configuration.configure(self, **kwargs)
+        self._settings.update(kwargs)
 
     def unconfigure(self, *args):
         self.set_changed()
         keyconf.Configuration.unconfigure(self, *args)
+        for key in args:
+            self._settings.pop(key, None)
+
+    def get_settings(self):
+        """Return a dict of the keyword arguments configured so far, with
+        the latest value of each.  Handing them over to .configure() of a 
+        new layer of the same class recreates the layer."""
+
+        return dict(self._settings)
 
     #
     # Changed-flag methods ...
     #
 
     def set_changed(self):
-        """Flag that the layer has changed."""
+        """Flag that the layer has changed, and increment .version."""
 
         self.changed = True
+        self.version += 1
 
     def unset_changed(self):
         """Flag that the layer is unchanged."""
@@ -64,6 +87,54 @@ class Layer(keyconf.Configuration):
     def has_changed(self):
         return self.changed
 
+    #
+    # Data bounds ...
+    #
+
+    def get_data_bounds(self):
+        """Return the bounds ((xmin, xmax), (ymin, ymax)) of the data drawn
+        by the layer, or None if the layer cannot tell.  The range of a 
+        dimension is None if there is no finite data in it.  The bounds are
+        calculated by .calculate_data_bounds() on first use after each 
+        change of the layer."""
+
+        if self._data_bounds_version != self.version:
+            self._data_bounds = self.calculate_data_bounds()
+            self._data_bounds_version = self.version
+
+        return self._data_bounds
+
+    def calculate_data_bounds(self):
+        """Calculate the bounds returned by .get_data_bounds().  To be 
+        overloaded by derived classes, the default returns None."""
+
+        return None
+
+    #
+    # Rasterization ...
+    #
+
+    def get_element_count(self):
+        """Return the number of elements drawn by the layer, e.g. points or
+        quadrilaterals, or None if the layer cannot tell.  Heavy layers are
+        rasterized in vector output, see matplotlayers.rasterization.  To 
+        be overloaded by derived classes, the default returns None."""
+
+        return None
+
+    #
+    # In-place updates ...
+    #
+
+    def configure_in_place(self, artists, **kwargs):
+        """Configure KWARGS like .configure(), and update the matplotlib
+        ARTISTS drawn by the layer to show the new configuration, instead
+        of drawing the layer again.  Returns False without configuring 
+        anything if this isn't possible.  Called by Stack.update_layer().
+        To be overloaded by derived classes, the default returns False."""
+
+        return False
+
     # 
     # Comaprison ...
     #
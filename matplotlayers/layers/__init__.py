@@ -1,6 +1,9 @@
-from layer_plot import LayerPlot
-from layer_pcolor import LayerPColor
-from layer_pcolormesh import LayerPColorMesh
-from layer_pcolorfast import LayerPColorFast
-from layer_colorbar import LayerColorbar
-from layer_imshow import LayerImshow
+import matplotlayers.lazy
+
+matplotlayers.lazy.install(__name__, {
+        'LayerPlot': 'matplotlayers.layers.layer_plot',
+        'LayerPColor': 'matplotlayers.layers.layer_pcolor',
+        'LayerPColorMesh': 'matplotlayers.layers.layer_pcolormesh',
+        'LayerPColorFast': 'matplotlayers.layers.layer_pcolorfast',
+        'LayerColorbar': 'matplotlayers.layers.layer_colorbar',
+        'LayerImshow': 'matplotlayers.layers.layer_imshow'})
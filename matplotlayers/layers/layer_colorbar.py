@@ -3,14 +3,17 @@ output."""
 
 import matplotlib.colorbar
 import matplotlayers.layer
+import keyconf
 
 
 class LayerColorbar(matplotlayers.layer.Layer):
     """This layer creates a matplotlib.colorbar.Colorbar in the axes
     it draws to.
     
-    Since the axes are cleared when the LayerColorbar changes due to 
-    changes of the mappable, there will be then a new Colorbar created.
+    When the layer providing the mappable draws again, the existing
+    Colorbars are updated in place with the new mappable.  Only when the
+    LayerColorbar itself is configured, e.g. with a new orientation, the
+    axes are cleared and there will be then a new Colorbar created.
     
     The layer must be registered to the layer providing the mappable by
     the 'layer_colorbar' configuration option of that layer."""
@@ -24,19 +27,86 @@ class LayerColorbar(matplotlayers.layer.Layer):
 
         self.mappable = None
 
+        # The Colorbars drawn, by id() of their axes, as (axes, colorbar,
+        # artists), where ARTISTS are the children of the axes belonging to
+        # the colorbar.  The axes are held to keep their id() unique.
+        self._colorbars = {}
+
     def set_mappable(self, mappable):
-        """Sets the mappable (expected to be called by the providing layer),
-        and sets the layer to changed."""
+        """Sets the mappable (expected to be called by the providing layer).
+        The Colorbars already drawn are updated in place.  If this isn't
+        possible, the layer is set to changed."""
+
+        # Store the mappable without flagging a change.
+        keyconf.Configuration.configure(self, mappable=mappable)
+
+        self._drop_stale_colorbars()
+
+        if len(self._colorbars) == 0:
+            # Nothing drawn yet, the Stack has to draw us.
+            self.set_changed()
+            return
+
+        for (key, (axes, colorbar, artists)) in self._colorbars.items():
+            children = set(map(id, axes.get_children()))
+            if not self._update_colorbar(colorbar, mappable):
+                self.set_changed()
+                return
+
+            # Updating may replace some of the artists.
+            self._colorbars[key] = (axes, colorbar,
+                    self._colorbar_artists(axes, children, artists))
+
+    def _drop_stale_colorbars(self):
+        """Forget the Colorbars whose artists have been removed from their
+        axes, e.g. since the axes have been cleared after .remove_layer()."""
 
-        self.configure(mappable=mappable)
-        self.set_changed()
+        for (key, (axes, colorbar, artists)) in self._colorbars.items():
+            children = set(map(id, axes.get_children()))
+            if not any(id(artist) in children for artist in artists):
+                del self._colorbars[key]
+
+    def _colorbar_artists(self, axes, children, artists):
+        """Return the children of AXES not among the ids CHILDREN, or among
+        ARTISTS.  The spines are left out, since clearing the axes keeps
+        them."""
+
+        kept = set(map(id, artists))
+        spines = set(map(id, getattr(axes, 'spines', {}).values()))
+
+        return [artist for artist in axes.get_children()
+                if id(artist) not in spines and
+                    (id(artist) not in children or id(artist) in kept)]
+
+    def _update_colorbar(self, colorbar, mappable):
+        """Update the matplotlib.colorbar.Colorbar COLORBAR in place to show
+        MAPPABLE.  Returns False if this isn't possible."""
+
+        if type(colorbar.norm) is not type(mappable.norm):
+            # A different kind of norm may need different ticks etc.
+            return False
+
+        if hasattr(colorbar, 'on_mappable_changed'):
+            colorbar.mappable = mappable
+            colorbar.on_mappable_changed(mappable)
+        elif hasattr(colorbar, 'update_normal'):
+            colorbar.update_normal(mappable)
+        else:
+            return False
+
+        return True
 
     def to_axes(self, axes):
-        """Creates a new Colorbar in the AXES."""
+        """Creates a new Colorbar in the AXES.  A Colorbar drawn to them
+        before has been cleared away."""
     
         # When the layer has not yet provided a mappable, abort.
         if not self.is_configured('mappable'):
             return
 
         # self is also configured to hold the mappable.
-        matplotlib.colorbar.Colorbar(ax=axes, **self)
+        children = set(map(id, axes.get_children()))
+        colorbar = matplotlib.colorbar.Colorbar(ax=axes, **self)
+
+        self._colorbars[id(axes)] = (axes, colorbar,
+                self._colorbar_artists(axes, children, []))
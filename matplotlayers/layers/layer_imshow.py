@@ -1,5 +1,9 @@
 import matplotlayers.layer
+import matplotlayers.data_bounds
+import matplotlayers.rgba_cache
+import matplotlayers.autocontrast
 import keyconf
+import numpy
 
 """Showing some image."""
 
@@ -8,16 +12,131 @@ class LayerImshow(matplotlayers.layer.Layer):
     """Plotting some image."""
 
     def __init__(self, **kwargs):
-        """All arguments go to axes.imshow."""
+        """All arguments go to axes.imshow, except for the following.  The
+        kwarg LAYER_COLORBAR may be a matplotlayers.LayerColorbar instance.
+
+        The colormapped RGBA data is cached and reused when the layer is
+        drawn again with unchanged data and colours.  Set the kwarg
+        CACHE_RGBA to False to turn this off.
+
+        The kwarg AUTOCONTRAST turns on automatic colour limits.  It may be
+        True or a (low, high) tuple of percentiles, the default is (1, 99).
+        The limits are then estimated from a sample of the data in view,
+        and updated on each change of the view limits.  VMIN and VMAX are
+        overridden, and the RGBA data is not cached."""
+
+        kwargs.setdefault('cache_rgba', True)
+
+        # The cache must be present before the first .configure() call.
+        self._rgba_cache = matplotlayers.rgba_cache.RGBACache(
+                data_keys=('X',))
 
         matplotlayers.layer.Layer.__init__(self)
-    
+
+        # We forward non-imshow arguments to some dedicated Configuration,
+        # because they should not show up in the call to imshow().
+        self._explicits = keyconf.Configuration()
+        self.add_components(explicits=self._explicits)
+        self.set_aliases(layer_colorbar='explicits_layer_colorbar',
+                cache_rgba='explicits_cache_rgba',
+                autocontrast='explicits_autocontrast')
+
+        # The AutoContrast instances by id() of the axes drawn to.
+        self._autocontrasts = {}
+
         self.configure(**kwargs)
 
+    #
+    # Tracking status ...
+    #
+
+    def configure(self, **kwargs):
+        matplotlayers.layer.Layer.configure(self, **kwargs)
+        self._rgba_cache.invalidate(kwargs.keys())
+
+    def unconfigure(self, *args):
+        matplotlayers.layer.Layer.unconfigure(self, *args)
+        self._rgba_cache.invalidate(args)
+
+    #
+    # Data bounds ...
+    #
+
+    def calculate_data_bounds(self):
+        """Return the bounds of the image extent.  Without EXTENT, the
+        pixel centers are at integer coordinates."""
+
+        if not self.is_configured('X'):
+            return (None, None)
+
+        if self.is_configured('extent') and self['extent'] is not None:
+            (left, right, bottom, top) = self['extent']
+        else:
+            (rows, columns) = numpy.shape(self['X'])[:2]
+            (left, right, bottom, top) = \
+                    (-0.5, columns - 0.5, -0.5, rows - 0.5)
+
+        return ((min(left, right), max(left, right)),
+                (min(bottom, top), max(bottom, top)))
+
+    #
+    # Plotting methods ...
+    #
+
     def to_axes(self, axes):
         """Shows the image."""
 
         if not self.is_configured('X'):
             return
 
-        axes.imshow(**self)
+        mappable = axes.imshow(**self)
+
+        C = numpy.ma.asarray(self['X'])
+
+        if self.is_configured('autocontrast') and \
+                self['autocontrast'] is not False and C.ndim == 2:
+            # Follow the view limits with the colour limits.
+            self._connect_autocontrast(axes, mappable, C)
+
+        elif self['cache_rgba']:
+            # Colour by the cached RGBA data if possible.  The Colorbar
+            # needs then a dedicated mappable.
+            cached_mappable = matplotlayers.rgba_cache.apply_cached_rgba(
+                    self._rgba_cache, mappable)
+            if cached_mappable is not None:
+                mappable = cached_mappable
+
+        # Notify also the LayerColorbar of the new mappable.
+        if self.is_configured('layer_colorbar'):
+            self['layer_colorbar'].set_mappable(mappable)
+
+    def _connect_autocontrast(self, axes, mappable, C):
+        """Let the colour limits of the image MAPPABLE in AXES follow the
+        view limits.  C is the data."""
+
+        percentiles = self['autocontrast']
+        if percentiles is True:
+            percentiles = None
+
+        layer_colorbar = None
+        if self.is_configured('layer_colorbar'):
+            layer_colorbar = self['layer_colorbar']
+
+        # Calculate the edges of the columns and rows from the extent.  With
+        # origin 'upper', the first row is at the top of the extent.
+        (left, right, bottom, top) = mappable.get_extent()
+        (rows, columns) = C.shape
+        x = numpy.linspace(left, right, columns + 1)
+        if mappable.origin == 'upper':
+            y = numpy.linspace(top, bottom, rows + 1)
+        else:
+            y = numpy.linspace(bottom, top, rows + 1)
+
+        autocontrast = matplotlayers.autocontrast.AutoContrast(
+                mappable, C, x, y,
+                percentiles = percentiles,
+                layer_colorbar = layer_colorbar)
+        autocontrast.connect(axes)
+
+        # matplotlib holds only weak references to callbacks.
+        self._autocontrasts[id(axes)] = autocontrast
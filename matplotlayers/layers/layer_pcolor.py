@@ -24,7 +24,9 @@
 # File version: 0.1.0b
 
 import matplotlayers.layer
+import matplotlayers.data_bounds
 import keyconf
+import numpy
 
 
 class LayerPColor(matplotlayers.layer.Layer):
@@ -32,8 +34,12 @@ class LayerPColor(matplotlayers.layer.Layer):
         """CMAP may be an abbreviation as defined by matplotlib, it defaults 
         to 'gray'.
         
-        The layer is specified empty, if X, Y, or C are not specified or
-        None."""
+        Instead of X and Y, the kwarg GRID may be a matplotlayers.Grid 
+        instance holding the coordinates.  GRID takes precedence over X and
+        Y.  Several layers on the same coordinates should share one Grid.
+        
+        The layer is specified empty, if C or both GRID and one of X and Y
+        are not specified or None."""
 
         kwargs.setdefault('cmap', 'gray')
 
@@ -49,25 +55,55 @@ class LayerPColor(matplotlayers.layer.Layer):
         # because they should not show up in the call to pcolormesh().
         self._explicits = keyconf.Configuration()
         self.add_components(explicits=self._explicits)
-        self.set_aliases(layer_colorbar='explicits_layer_colorbar')
+        self.set_aliases(layer_colorbar='explicits_layer_colorbar',
+                grid='explicits_grid')
 
         self.configure(**kwargs)
 
+    def calculate_data_bounds(self):
+        """Return the bounds of the coordinates."""
+
+        if not self.is_configured('C'):
+            return (None, None)
+
+        if self.is_configured('grid'):
+            return self['grid'].get_bounds()
+
+        if not self.is_configured('X') or not self.is_configured('Y'):
+            return (None, None)
+
+        return (matplotlayers.data_bounds.finite_range(self['X']),
+                matplotlayers.data_bounds.finite_range(self['Y']))
+
+    def get_element_count(self):
+        """Return the number of quadrilaterals drawn."""
+
+        if not self.is_configured('C'):
+            return 0
+
+        return numpy.size(self['C'])
+
     def to_axes(self, axes):
         """Plot the data to matplotlib.axes.Axes instance AXES."""
         
         # Skip plotting if not all data is specified ...
 
-        if not self.is_configured('X') or \
-                not self.is_configured('Y') or \
-                not self.is_configured('C'):
+        if not self.is_configured('C'):
+            return
+
+        if not self.is_configured('grid') and \
+                (not self.is_configured('X') or not self.is_configured('Y')):
             return
 
         # Plot ...
 
         # Unfortunately, mpl pcolor needs X, Y, C positional.
-        X = self['X']
-        Y = self['Y']
+        if self.is_configured('grid'):
+            # The Grid holds the coordinates, already prepared.
+            (X, Y) = self['grid'].get_mesh()
+        else:
+            X = self['X']
+            Y = self['Y']
         C = self['C']
         # X, Y, C are actually stored in ._XYC.
 
@@ -24,7 +24,10 @@
 # File version: 0.1.0b
 
 import matplotlayers.layer
+import matplotlayers.data_bounds
+import matplotlayers.rgba_cache
 import keyconf
+import numpy
 
 
 class LayerPColorFast(matplotlayers.layer.Layer):
@@ -33,10 +36,23 @@ class LayerPColorFast(matplotlayers.layer.Layer):
         to 'gray'.  The kwarg LAYER_COLORBAR may be a matplotlayers.\\
         LayerColorbar instance.
         
-        The layer is specified empty, if X, Y, or C are not specified or
-        None."""
+        Instead of X and Y, the kwarg GRID may be a matplotlayers.Grid 
+        instance holding the coordinates.  GRID takes precedence over X and
+        Y.  Several layers on the same coordinates should share one Grid.
+        
+        The colormapped RGBA data is cached and reused when the layer is 
+        drawn again with unchanged data and colours.  Set the kwarg 
+        CACHE_RGBA to False to turn this off.
+        
+        The layer is specified empty, if C or both GRID and one of X and Y
+        are not specified or None."""
 
         kwargs.setdefault('cmap', 'gray')
+        kwargs.setdefault('cache_rgba', True)
+
+        # The cache must be present before the first .configure() call.
+        self._rgba_cache = matplotlayers.rgba_cache.RGBACache(
+                data_keys=('C',))
 
         matplotlayers.layer.Layer.__init__(self)
 
@@ -50,30 +66,89 @@ class LayerPColorFast(matplotlayers.layer.Layer):
         # because they should not show up in the call to pcolormesh().
         self._explicits = keyconf.Configuration()
         self.add_components(explicits=self._explicits)
-        self.set_aliases(layer_colorbar='explicits_layer_colorbar')
+        self.set_aliases(layer_colorbar='explicits_layer_colorbar',
+                grid='explicits_grid',
+                cache_rgba='explicits_cache_rgba')
         
         self.configure(**kwargs)
 
+    #
+    # Tracking status ...
+    #
+
+    def configure(self, **kwargs):
+        matplotlayers.layer.Layer.configure(self, **kwargs)
+        self._rgba_cache.invalidate(kwargs.keys())
+
+    def unconfigure(self, *args):
+        matplotlayers.layer.Layer.unconfigure(self, *args)
+        self._rgba_cache.invalidate(args)
+
+    #
+    # Data bounds ...
+    #
+
+    def calculate_data_bounds(self):
+        """Return the bounds of the coordinates."""
+
+        if not self.is_configured('C'):
+            return (None, None)
+
+        if self.is_configured('grid'):
+            return self['grid'].get_bounds()
+
+        if not self.is_configured('X') or not self.is_configured('Y'):
+            return (None, None)
+
+        return (matplotlayers.data_bounds.finite_range(self['X']),
+                matplotlayers.data_bounds.finite_range(self['Y']))
+
+    def get_element_count(self):
+        """Return the number of quadrilaterals drawn."""
+
+        if not self.is_configured('C'):
+            return 0
+
+        return numpy.size(self['C'])
+
+    #
+    # Plotting methods ...
+    #
+
     def to_axes(self, axes):
         """Plot the data to matplotlib.axes.Axes instance AXES."""
         
         # Skip plotting if not all data is specified ...
 
-        if not self.is_configured('X') or \
-                not self.is_configured('Y') or \
-                not self.is_configured('C'):
+        if not self.is_configured('C'):
+            return
+
+        if not self.is_configured('grid') and \
+                (not self.is_configured('X') or not self.is_configured('Y')):
             return
 
         # Plot ...
 
         # Unfortunately, mpl pcolor needs X, Y, C positional.
-        X = self['X']
-        Y = self['Y']
+        if self.is_configured('grid'):
+            # The Grid holds the coordinates, already prepared.
+            (X, Y) = self['grid'].get_edges(numpy.shape(self['C']))
+        else:
+            X = self['X']
+            Y = self['Y']
         C = self['C']
         # X, Y, C are actually stored in ._XYC.
 
         mappable = axes.pcolorfast(X, Y, C, **self)
 
+        # Colour by the cached RGBA data if possible.  The Colorbar needs
+        # then a dedicated mappable.
+        if self['cache_rgba']:
+            cached_mappable = matplotlayers.rgba_cache.apply_cached_rgba(
+                    self._rgba_cache, mappable)
+            if cached_mappable is not None:
+                mappable = cached_mappable
+
         # Notify also the LayerColorbar of the new mappable.
         if self.is_configured('layer_colorbar'):
             self['layer_colorbar'].set_mappable(mappable)
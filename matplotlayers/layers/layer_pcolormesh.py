@@ -23,8 +23,13 @@
 # Developed since: Jul 2008
 # File version: 0.1.0b
 
+import matplotlib.collections
 import matplotlayers.layer
+import matplotlayers.data_bounds
+import matplotlayers.rgba_cache
+import matplotlayers.autocontrast
 import keyconf
+import numpy
 
 
 class LayerPColorMesh(matplotlayers.layer.Layer):
@@ -33,10 +38,29 @@ class LayerPColorMesh(matplotlayers.layer.Layer):
         to 'gray'.  The kwarg LAYER_COLORBAR may be a matplotlayers.\\
         LayerColorbar instance.
         
-        The layer is specified empty, if X, Y, or C are not specified or
-        None."""
+        Instead of X and Y, the kwarg GRID may be a matplotlayers.Grid 
+        instance holding the coordinates.  GRID takes precedence over X and
+        Y.  Several layers on the same coordinates should share one Grid.
+        
+        The colormapped RGBA data is cached and reused when the layer is 
+        drawn again with unchanged data and colours.  Set the kwarg 
+        CACHE_RGBA to False to turn this off.
+        
+        The kwarg AUTOCONTRAST turns on automatic colour limits.  It may be
+        True or a (low, high) tuple of percentiles, the default is (1, 99).
+        The limits are then estimated from a sample of the data in view, 
+        and updated on each change of the view limits.  VMIN and VMAX are
+        overridden, and the RGBA data is not cached.
+        
+        The layer is specified empty, if C or both GRID and one of X and Y
+        are not specified or None."""
 
         kwargs.setdefault('cmap', 'gray')
+        kwargs.setdefault('cache_rgba', True)
+
+        # The cache must be present before the first .configure() call.
+        self._rgba_cache = matplotlayers.rgba_cache.RGBACache(
+                data_keys=('C',))
 
         matplotlayers.layer.Layer.__init__(self)
 
@@ -50,30 +74,167 @@ class LayerPColorMesh(matplotlayers.layer.Layer):
         # because they should not show up in the call to pcolormesh().
         self._explicits = keyconf.Configuration()
         self.add_components(explicits=self._explicits)
-        self.set_aliases(layer_colorbar='explicits_layer_colorbar')
+        self.set_aliases(layer_colorbar='explicits_layer_colorbar',
+                grid='explicits_grid',
+                cache_rgba='explicits_cache_rgba',
+                autocontrast='explicits_autocontrast')
+
+        # The AutoContrast instances by id() of the axes drawn to.
+        self._autocontrasts = {}
         
         self.configure(**kwargs)
 
+    #
+    # Tracking status ...
+    #
+
+    def configure(self, **kwargs):
+        matplotlayers.layer.Layer.configure(self, **kwargs)
+        self._rgba_cache.invalidate(kwargs.keys())
+
+    def unconfigure(self, *args):
+        matplotlayers.layer.Layer.unconfigure(self, *args)
+        self._rgba_cache.invalidate(args)
+
+    #
+    # Data bounds ...
+    #
+
+    def calculate_data_bounds(self):
+        """Return the bounds of the coordinates."""
+
+        if not self.is_configured('C'):
+            return (None, None)
+
+        if self.is_configured('grid'):
+            return self['grid'].get_bounds()
+
+        if not self.is_configured('X') or not self.is_configured('Y'):
+            return (None, None)
+
+        return (matplotlayers.data_bounds.finite_range(self['X']),
+                matplotlayers.data_bounds.finite_range(self['Y']))
+
+    def get_element_count(self):
+        """Return the number of quadrilaterals drawn."""
+
+        if not self.is_configured('C'):
+            return 0
+
+        return numpy.size(self['C'])
+
+    #
+    # In-place updates ...
+    #
+
+    def configure_in_place(self, artists, **kwargs):
+        """Set the data of the mesh drawn in place, if only C is configured
+        with the shape as before, and autocontrast is off.  The colour 
+        limits stay as they are."""
+
+        if kwargs.keys() != ['C'] or not self.is_configured('C'):
+            return False
+
+        if numpy.shape(kwargs['C']) != numpy.shape(self['C']):
+            return False
+
+        if self.is_configured('autocontrast') and \
+                self['autocontrast'] is not False:
+            return False
+
+        meshes = [artist for artist in artists
+                if isinstance(artist, matplotlib.collections.QuadMesh)]
+        if len(meshes) != 1:
+            return False
+        mesh = meshes[0]
+
+        self.configure(**kwargs)
+
+        mesh.set_array(numpy.ma.ravel(self['C']))
+
+        mappable = mesh
+        if self['cache_rgba']:
+            cached_mappable = matplotlayers.rgba_cache.apply_cached_rgba(
+                    self._rgba_cache, mesh)
+            if cached_mappable is not None:
+                mappable = cached_mappable
+
+        if self.is_configured('layer_colorbar'):
+            self['layer_colorbar'].set_mappable(mappable)
+
+        return True
+
+    #
+    # Plotting methods ...
+    #
+
     def to_axes(self, axes):
         """Plot the data to matplotlib.axes.Axes instance AXES."""
         
         # Skip plotting if not all data is specified ...
 
-        if not self.is_configured('X') or \
-                not self.is_configured('Y') or \
-                not self.is_configured('C'):
+        if not self.is_configured('C'):
+            return
+
+        if not self.is_configured('grid') and \
+                (not self.is_configured('X') or not self.is_configured('Y')):
             return
 
         # Plot ...
 
         # Unfortunately, mpl pcolor needs X, Y, C positional.
-        X = self['X']
-        Y = self['Y']
+        if self.is_configured('grid'):
+            # The Grid holds the coordinates, already prepared.
+            (X, Y) = self['grid'].get_mesh()
+        else:
+            X = self['X']
+            Y = self['Y']
         C = self['C']
         # X, Y, C are actually stored in ._XYC.
 
         mappable = axes.pcolormesh(X, Y, C, **self)
 
+        if self.is_configured('autocontrast') and \
+                self['autocontrast'] is not False:
+            # Follow the view limits with the colour limits.
+            if self.is_configured('grid'):
+                (X, Y) = (self['grid'].X, self['grid'].Y)
+            (X, Y) = (numpy.asarray(X), numpy.asarray(Y))
+            if X.ndim == 2:
+                (X, Y) = (X[0, :], Y[:, 0])
+
+            self._connect_autocontrast(axes, mappable, C, X, Y)
+
+        elif self['cache_rgba']:
+            # Colour by the cached RGBA data if possible.  The Colorbar 
+            # needs then a dedicated mappable.
+            cached_mappable = matplotlayers.rgba_cache.apply_cached_rgba(
+                    self._rgba_cache, mappable)
+            if cached_mappable is not None:
+                mappable = cached_mappable
+
         # Notify also the LayerColorbar of the new mappable.
         if self.is_configured('layer_colorbar'):
             self['layer_colorbar'].set_mappable(mappable)
+
+    def _connect_autocontrast(self, axes, mappable, C, x, y):
+        """Let the colour limits of MAPPABLE in AXES follow the view
+        limits.  C is the data, X and Y are its column and row 
+        coordinates."""
+
+        percentiles = self['autocontrast']
+        if percentiles is True:
+            percentiles = None
+
+        layer_colorbar = None
+        if self.is_configured('layer_colorbar'):
+            layer_colorbar = self['layer_colorbar']
+
+        autocontrast = matplotlayers.autocontrast.AutoContrast(
+                mappable, numpy.ma.asarray(C), x, y,
+                percentiles = percentiles,
+                layer_colorbar = layer_colorbar)
+        autocontrast.connect(axes)
+
+        # matplotlib holds only weak references to callbacks.
+        self._autocontrasts[id(axes)] = autocontrast
@@ -25,7 +25,10 @@
 
 __version__ = (0, 1, 0)
 
+import matplotlib.lines
 import matplotlayers.layer
+import matplotlayers.spatial_index
+import matplotlayers.data_bounds
 import keyconf
 import numpy
 
@@ -82,6 +85,11 @@ class LayerPlot(matplotlayers.layer.Layer):
         self.set_x(x, xerr, x_ua, sigmas)
         self.set_y(y, yerr, y_ua, sigmas)
 
+        # The spatial index, built on demand, and the .version it was built
+        # for.
+        self._spatial_index = None
+        self._spatial_index_version = None
+
 
     #
     # Plotting methods ...
@@ -241,3 +249,185 @@ class LayerPlot(matplotlayers.layer.Layer):
         # Apply values ...
 
         self.configure(y = value, yerr = yerr)
+
+    #
+    # Streaming methods ...
+    #
+
+    def append(self, x, y, xerr = None, yerr = None):
+        """Append the points X and Y, with errors XERR and YERR, to the data.
+        Errors must be given exactly for the dimensions having errors 
+        configured, except for scalar errors, which apply to the new points
+        as well."""
+
+        x = numpy.asarray(x)
+        y = numpy.asarray(y)
+
+        if not self.is_configured('x') or not self.is_configured('y'):
+            # Nothing to append to.
+            self.set_x(x, xerr)
+            self.set_y(y, yerr)
+            return
+
+        # Calculate the new errors ...
+
+        xerr = self._append_error('xerr', xerr)
+        yerr = self._append_error('yerr', yerr)
+
+        # Apply values ...
+
+        self.configure(
+                x = numpy.concatenate((self.get_config('x'), x)),
+                y = numpy.concatenate((self.get_config('y'), y)))
+
+        if xerr is not None:
+            self.configure(xerr = xerr)
+        if yerr is not None:
+            self.configure(yerr = yerr)
+
+    def _append_error(self, key, err):
+        """Return the error configured under KEY with the errors ERR of new
+        points appended, or None if no error is configured."""
+
+        if not self.is_configured(key):
+            if err is not None:
+                raise ValueError("Cannot append %s without %s configured." % \
+                        (key, key))
+            return None
+
+        current = self.get_config(key)
+        if current.ndim == 0:
+            # A scalar error applies to the new points as well.
+            return None
+
+        if err is None:
+            raise ValueError("%s is configured, it must be appended too." % \
+                    key)
+
+        return numpy.concatenate((current, numpy.asarray(err)), axis = -1)
+
+    #
+    # In-place updates ...
+    #
+
+    def configure_in_place(self, artists, **kwargs):
+        """Set the data of the line drawn in place, if only X and Y are
+        configured, the new X and Y have the same shape, and there are 
+        neither errors nor an envelope."""
+
+        if not set(kwargs.keys()) <= set(['x', 'y']):
+            return False
+
+        if self.get_config('envelope_on'):
+            return False
+
+        for key in ('xerr', 'yerr'):
+            if self.is_configured(key) and self.get_config(key) is not None:
+                return False
+
+        lines = [artist for artist in artists
+                if isinstance(artist, matplotlib.lines.Line2D)]
+        if len(artists) != 1 or len(lines) != 1:
+            return False
+
+        data = dict((key, numpy.asarray(value))
+                for (key, value) in kwargs.items())
+        x = data.get('x', self.get_config('x'))
+        y = data.get('y', self.get_config('y'))
+        if numpy.shape(x) != numpy.shape(y):
+            return False
+
+        self.configure(**data)
+        lines[0].set_data(x, y)
+
+        return True
+
+    #
+    # Data bounds ...
+    #
+
+    def calculate_data_bounds(self):
+        """Return the bounds of the data including the errors.  The 
+        envelope is drawn at the error positions, and thus covered, too.
+        Points where x or y isn't finite are ignored."""
+
+        if not self.is_configured('x') or not self.is_configured('y'):
+            return (None, None)
+
+        xerr = None
+        yerr = None
+
+        if self.is_configured('xerr'):
+            xerr = self.get_config('xerr')
+
+        if self.is_configured('yerr'):
+            yerr = self.get_config('yerr')
+
+        return self._calculate_bounds(self.get_config('x'), 
+                self.get_config('y'), xerr, yerr)
+
+    def get_element_count(self):
+        """Return the number of points drawn."""
+
+        if not self.is_configured('x') or self.get_config('x') is None:
+            return 0
+
+        return numpy.size(self.get_config('x'))
+
+    def _calculate_bounds(self, x, y, xerr, yerr):
+        """Return the bounds of the points X and Y with errors XERR and 
+        YERR (may be None)."""
+
+        x = numpy.asarray(x, dtype = float).ravel()
+        y = numpy.asarray(y, dtype = float).ravel()
+        valid = numpy.isfinite(x) & numpy.isfinite(y)
+
+        (left, right) = self._error_extent(x, xerr)
+        (bottom, top) = self._error_extent(y, yerr)
+
+        return (matplotlayers.data_bounds.finite_range(left, right, valid),
+                matplotlayers.data_bounds.finite_range(bottom, top, valid))
+
+    def _error_extent(self, value, err):
+        """Return the (low, high) ends of the errorbars ERR (may be None) 
+        around VALUE.  Non-finite errors count as zero, since matplotlib
+        draws the point then without errorbar."""
+
+        if err is None:
+            return (value, value)
+
+        err = numpy.asarray(err, dtype = float)
+        err = numpy.where(numpy.isfinite(err), err, 0.0)
+
+        if err.ndim == 2:
+            (lower, upper) = (err[0].ravel(), err[1].ravel())
+        else:
+            lower = upper = err.ravel() if err.ndim == 1 else err
+
+        return (value - lower, value + upper)
+
+    #
+    # Picking methods ...
+    #
+
+    def get_spatial_index(self):
+        """Return a matplotlayers.spatial_index.SpatialIndex of the (x, y)
+        points, or None if the layer is empty.  The index is built on first
+        use after each change of the layer."""
+
+        if not self.is_configured('x') or not self.is_configured('y'):
+            return None
+
+        if self._spatial_index is None or \
+                self._spatial_index_version != self.version:
+            self._spatial_index = matplotlayers.spatial_index.SpatialIndex(
+                    self.get_config('x'), self.get_config('y'))
+            self._spatial_index_version = self.version
+
+        return self._spatial_index
+
+    def get_point(self, index):
+        """Return the (x, y) point with index INDEX."""
+
+        return (self.get_config('x').ravel()[index],
+                self.get_config('y').ravel()[index])
@@ -0,0 +1,96 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Lazy attributes of packages, importing the modules defining them only on
+first access.
+
+A package makes its public names lazy by ending its __init__.py with::
+
+    matplotlayers.lazy.install(__name__, {
+            'Stack': 'matplotlayers.stack',
+            ...})
+
+The package module is then replaced in sys.modules by a LazyModule holding
+the same attributes.  Accessing one of the lazy names imports the module
+given and takes the attribute of the same name from it, or the module
+itself if it is the submodule NAME."""
+
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module importing its lazy attributes on first access."""
+
+    def __getattr__(self, name):
+        """Called only for attributes not present yet."""
+
+        lazy_attributes = self.__dict__.get('_lazy_attributes', {})
+        if name not in lazy_attributes:
+            raise AttributeError("'module' object has no attribute %r" % \
+                    name)
+
+        module_name = lazy_attributes[name]
+        __import__(module_name)
+
+        if module_name == self.__name__ + '.' + name:
+            # A submodule.
+            value = sys.modules[module_name]
+        else:
+            value = getattr(sys.modules[module_name], name)
+
+        # Later accesses don't come here anymore.
+        setattr(self, name, value)
+
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) |
+                set(self.__dict__.get('_lazy_attributes', {}).keys()))
+
+
+def install(name, attributes):
+    """Replace the module NAME in sys.modules by a LazyModule with the same
+    attributes, and with the lazy ATTRIBUTES, mapping each public name to
+    the name of the module defining it."""
+
+    module = sys.modules[name]
+
+    lazy_module = LazyModule(name, module.__doc__)
+    lazy_module.__dict__.update(module.__dict__)
+    lazy_module._lazy_attributes = dict(attributes)
+
+    # Python 2 clears the globals of a module when it is deallocated.  The
+    # functions defined in the original module still use them.
+    lazy_module._lazy_original = module
+
+    # Let 'from NAME import *' import the lazy attributes, too, but not the
+    # modules imported by the package itself.
+    if '__all__' not in module.__dict__:
+        lazy_module.__all__ = sorted([public for (public, value) in
+                module.__dict__.items()
+                if not public.startswith('_') and
+                    not isinstance(value, types.ModuleType)] +
+                list(attributes.keys()))
+
+    sys.modules[name] = lazy_module
@@ -0,0 +1,63 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""The policy for rasterizing heavy layers in vector output.
+
+matplotlib can draw single artists as images embedded in vector output
+(PDF, PS, SVG), while the axes, ticks and text stay vectors.  Stacks let
+matplotlib do this for layers drawing more than ``threshold`` elements
+(see Layer.get_element_count()).  Stack.set_layer_rasterized() overrides
+this for single layers.
+
+The images are rendered at the dpi the figure is saved with.
+matplotlayers.backends.export saves vector formats at ``dpi`` by default.
+
+Change the policy by e.g.::
+
+    import matplotlayers.rasterization
+
+    matplotlayers.rasterization.threshold = None
+
+It applies to the layers drawn afterwards."""
+
+# Layers drawing more elements are rasterized.  None turns automatic
+# rasterization off.
+threshold = 10 ** 5
+
+# The resolution of the rasterized layers in vector output.
+dpi = 300
+
+
+def decide(layer, setting = None):
+    """Return whether to rasterize LAYER.  SETTING is True or False to
+    decide explicitly, or None to decide by the threshold."""
+
+    if setting is not None:
+        return setting
+
+    if threshold is None:
+        return False
+
+    count = layer.get_element_count()
+
+    return count is not None and count > threshold
@@ -0,0 +1,184 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Caching of colormapped RGBA data for image-like layers."""
+
+import matplotlib.cm
+import matplotlib.collections
+import matplotlib.image
+
+# Keys changing the colours of a layer.  Configuring them invalidates the
+# cached RGBA data.
+COLOUR_KEYS = ('cmap', 'norm', 'vmin', 'vmax', 'alpha')
+
+# Default bounds of an RGBACache.
+DEFAULT_MAX_ENTRIES = 4
+DEFAULT_MAX_BYTES = 128 * 2 ** 20
+
+
+class RGBACache:
+    """Bounded cache of the colormapped RGBA data of one layer.
+
+    The entries are keyed on the data version and the colour limits.  The
+    data version is incremented when one of the DATA_KEYS is configured.
+    Configuring either data keys or colour keys clears the cache, because
+    the old entries cannot be hit anymore."""
+
+    def __init__(self, data_keys, max_entries=None, max_bytes=None):
+        """DATA_KEYS are the configuration keys holding the data which is
+        colormapped.  MAX_ENTRIES and MAX_BYTES bound the cache, they
+        default to DEFAULT_MAX_ENTRIES and DEFAULT_MAX_BYTES.  Single RGBA
+        arrays larger than MAX_BYTES are not cached at all."""
+
+        if max_entries is None:
+            max_entries = DEFAULT_MAX_ENTRIES
+        if max_bytes is None:
+            max_bytes = DEFAULT_MAX_BYTES
+
+        self.data_keys = data_keys
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.data_version = 0
+
+        # List of (key, rgba), the most recently used entry last.
+        self._entries = []
+
+    #
+    # Invalidation ...
+    #
+
+    def invalidate(self, keys):
+        """Notify the cache that the configuration keys KEYS have been
+        configured or unconfigured."""
+
+        keys = list(keys)
+
+        for key in keys:
+            if key in self.data_keys:
+                self.data_version += 1
+                self.clear()
+                return
+
+        for key in keys:
+            if key in COLOUR_KEYS:
+                self.clear()
+                return
+
+    def clear(self):
+        """Drop all entries."""
+
+        self._entries = []
+
+    #
+    # Lookup and storage ...
+    #
+
+    def lookup(self, key):
+        """Return the RGBA data stored for KEY, or None if there is no such
+        entry.  KEY is combined with the data version."""
+
+        key = (self.data_version, key)
+
+        for (index, (entry_key, rgba)) in enumerate(self._entries):
+            if entry_key == key:
+                # Move the entry to the end, marking it most recently used.
+                self._entries.append(self._entries.pop(index))
+                return rgba
+
+        return None
+
+    def store(self, key, rgba):
+        """Store RGBA data RGBA for KEY, dropping the least recently used
+        entries when the bounds are exceeded."""
+
+        if rgba.nbytes > self.max_bytes:
+            return
+
+        self._entries.append(((self.data_version, key), rgba))
+
+        while len(self._entries) > self.max_entries or \
+                self.get_nbytes() > self.max_bytes:
+            self._entries.pop(0)
+
+    def get_nbytes(self):
+        """Return the number of bytes held by the cache."""
+
+        return sum([rgba.nbytes for (key, rgba) in self._entries])
+
+
+def apply_cached_rgba(cache, artist, A=None):
+    """Colours the matplotlib artist ARTIST by RGBA data taken from CACHE,
+    calculating and storing it only if not present yet.  A is the data to be
+    colormapped, it defaults to ARTIST.get_array().
+
+    Returns a matplotlib.cm.ScalarMappable carrying the norm, the colormap,
+    and the data of ARTIST, suitable e.g. for a Colorbar.  Returns None if
+    ARTIST does not support being coloured by RGBA data, in which case
+    ARTIST is left untouched."""
+
+    # Determine how to hand the RGBA data over ...
+
+    if isinstance(artist, matplotlib.image.PcolorImage):
+        return None
+    elif isinstance(artist, matplotlib.image.AxesImage):
+        kind = 'image'
+    elif isinstance(artist, matplotlib.collections.Collection):
+        kind = 'collection'
+    else:
+        return None
+
+    if A is None:
+        A = artist.get_array()
+    if A is None or (kind == 'image' and A.ndim != 2):
+        # Nothing to colormap, e.g. RGB(A) images.
+        return None
+
+    # Retrieve or calculate the RGBA data ...
+
+    key = (kind, tuple(artist.get_clim()), artist.get_alpha())
+    rgba = cache.lookup(key)
+
+    if rgba is None:
+        if kind == 'image':
+            rgba = artist.to_rgba(A, bytes=True)
+        else:
+            rgba = artist.to_rgba(A.ravel(), artist.get_alpha())
+            rgba = rgba.reshape((-1, 4))
+
+        cache.store(key, rgba)
+
+    # Hand the RGBA data over ...
+
+    mappable = matplotlib.cm.ScalarMappable(
+            norm=artist.norm, cmap=artist.cmap)
+    mappable.set_array(A)
+
+    if kind == 'image':
+        artist.set_data(rgba)
+    else:
+        # Without an array, the collection does not colormap on drawing.
+        artist.set_array(None)
+        artist.set_facecolor(rgba)
+
+    return mappable
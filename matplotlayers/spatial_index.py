@@ -0,0 +1,253 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Defines the SpatialIndex class for fast nearest-point queries."""
+
+import numpy
+
+# Mean number of points per cell of the grid used for unsorted data.
+POINTS_PER_CELL = 16
+
+
+class SpatialIndex:
+    """Answers nearest-point queries on a two-dimensional point set.
+
+    If the x coordinates are sorted, as for most series, queries use binary
+    search on x.  Otherwise, the points are binned into a uniform grid,
+    which is searched in rings of cells around the query point.
+
+    Distances are measured after dividing the x and y differences by the
+    scales handed over to .nearest(), so that e.g. distances on screen can
+    be used while the index is built only once in data coordinates."""
+
+    def __init__(self, x, y):
+        """X and Y are the coordinates of the points, of equal shape.  Points
+        with non-finite coordinates are ignored."""
+
+        x = numpy.asarray(x, dtype=float).ravel()
+        y = numpy.asarray(y, dtype=float).ravel()
+
+        # Skip non-finite points, but remember the original indices ...
+
+        valid = numpy.isfinite(x) & numpy.isfinite(y)
+        if valid.all():
+            self.indices = None
+        else:
+            self.indices = numpy.flatnonzero(valid)
+            (x, y) = (x[valid], y[valid])
+
+        self.x = x
+        self.y = y
+
+        # Choose the search strategy ...
+
+        if len(x) < 2 or (numpy.diff(x) >= 0).all():
+            self.mode = 'sorted'
+        else:
+            self.mode = 'grid'
+            self._build_grid()
+
+    def _build_grid(self):
+        """Bin the points into a uniform grid.  The points are sorted by
+        cell, .cell_starts holds the start index of each cell in that
+        order."""
+
+        n = len(self.x)
+        cells = max(1, int(numpy.sqrt(float(n) / POINTS_PER_CELL)))
+
+        (self.xmin, self.ymin) = (self.x.min(), self.y.min())
+        self.cell_width = (self.x.max() - self.xmin) / cells or 1.0
+        self.cell_height = (self.y.max() - self.ymin) / cells or 1.0
+        self.cells = cells
+
+        (cellx, celly) = self._cell_of(self.x, self.y)
+        cell_ids = celly * cells + cellx
+
+        self.order = numpy.argsort(cell_ids, kind='mergesort')
+        self.cell_starts = numpy.searchsorted(cell_ids[self.order],
+                numpy.arange(cells * cells + 1))
+
+    def _cell_of(self, x, y):
+        """Return the cell column and row of coordinates X and Y, clipped
+        to the grid."""
+
+        cellx = numpy.floor((x - self.xmin) / self.cell_width).astype(int)
+        celly = numpy.floor((y - self.ymin) / self.cell_height).astype(int)
+
+        return (numpy.clip(cellx, 0, self.cells - 1),
+                numpy.clip(celly, 0, self.cells - 1))
+
+    #
+    # Queries ...
+    #
+
+    def nearest(self, x, y, xscale = None, yscale = None,
+            max_distance = None):
+        """Return (index, distance) of the point nearest to (X, Y), where
+        INDEX refers to the arrays handed over on initialisation.  The
+        differences in x and y are divided by XSCALE and YSCALE (default 1)
+        before calculating the distance.  Returns None if there is no point
+        within MAX_DISTANCE (default unlimited)."""
+
+        if xscale is None:
+            xscale = 1.0
+        if yscale is None:
+            yscale = 1.0
+        if max_distance is None:
+            max_distance = numpy.inf
+
+        if len(self.x) == 0:
+            return None
+
+        if self.mode == 'sorted':
+            result = self._nearest_sorted(x, y, xscale, yscale, max_distance)
+        else:
+            result = self._nearest_grid(x, y, xscale, yscale, max_distance)
+
+        if result is None:
+            return None
+
+        (index, distance2) = result
+        if distance2 > max_distance ** 2:
+            return None
+
+        if self.indices is not None:
+            index = self.indices[index]
+
+        return (int(index), numpy.sqrt(distance2))
+
+    def _distances2(self, candidates, x, y, xscale, yscale):
+        """Return the squared scaled distances of the points with indices
+        or slice CANDIDATES to (X, Y)."""
+
+        return ((self.x[candidates] - x) / xscale) ** 2 + \
+                ((self.y[candidates] - y) / yscale) ** 2
+
+    def _nearest_sorted(self, x, y, xscale, yscale, max_distance):
+        """Search outwards from the position of X in the sorted x
+        coordinates, in chunks of growing size.  Returns (index, squared
+        distance)."""
+
+        n = len(self.x)
+        (best, best_distance2) = (None, numpy.inf)
+
+        position = numpy.searchsorted(self.x, x)
+        (low, high) = (position, position)
+        step = 32
+
+        while low > 0 or high < n:
+            (new_low, new_high) = (max(0, low - step), min(n, high + step))
+
+            for candidates in (slice(new_low, low), slice(high, new_high)):
+                if candidates.stop <= candidates.start:
+                    continue
+                distances2 = self._distances2(candidates, x, y,
+                        xscale, yscale)
+                index = distances2.argmin()
+                if distances2[index] < best_distance2:
+                    (best, best_distance2) = \
+                            (candidates.start + index, distances2[index])
+
+            (low, high) = (new_low, new_high)
+
+            # All points not examined yet are at least this far away in x.
+            gap = numpy.inf
+            if low > 0:
+                gap = min(gap, (x - self.x[low - 1]) / abs(xscale))
+            if high < n:
+                gap = min(gap, (self.x[high] - x) / abs(xscale))
+
+            if gap ** 2 >= best_distance2 or gap > max_distance:
+                break
+
+            step *= 2
+
+        if best is None:
+            return None
+
+        return (best, best_distance2)
+
+    def _nearest_grid(self, x, y, xscale, yscale, max_distance):
+        """Search the grid cells in rings around the cell of (X, Y).
+        Returns (index, squared distance)."""
+
+        (best, best_distance2) = (None, numpy.inf)
+        (cellx, celly) = self._cell_of(numpy.asarray(x), numpy.asarray(y))
+        (cellx, celly) = (int(cellx), int(celly))
+
+        # Points outside of ring r are at least this far away, per ring.
+        ring_distance = min(self.cell_width / abs(xscale),
+                self.cell_height / abs(yscale))
+
+        ring = 0
+        while True:
+            # Collect the points in the cells of the ring ...
+
+            candidates = []
+            for row in xrange(celly - ring, celly + ring + 1):
+                if not 0 <= row < self.cells:
+                    continue
+
+                if ring == 0 or row in (celly - ring, celly + ring):
+                    columns = xrange(cellx - ring, cellx + ring + 1)
+                else:
+                    columns = (cellx - ring, cellx + ring)
+
+                for column in columns:
+                    if not 0 <= column < self.cells:
+                        continue
+
+                    cell = row * self.cells + column
+                    (start, stop) = \
+                            (self.cell_starts[cell], self.cell_starts[cell + 1])
+                    if stop > start:
+                        candidates.append(self.order[start:stop])
+
+            # Examine them ...
+
+            if len(candidates) > 0:
+                candidates = numpy.concatenate(candidates)
+                distances2 = self._distances2(candidates, x, y,
+                        xscale, yscale)
+                index = distances2.argmin()
+                if distances2[index] < best_distance2:
+                    (best, best_distance2) = \
+                            (candidates[index], distances2[index])
+
+            # Stop when no point outside of the ring can be nearer, or when
+            # the ring covers the whole grid.
+
+            bound = ring * ring_distance
+            if bound ** 2 >= best_distance2 or bound > max_distance:
+                break
+
+            if celly - ring <= 0 and celly + ring >= self.cells - 1 and \
+                    cellx - ring <= 0 and cellx + ring >= self.cells - 1:
+                break
+
+            ring += 1
+
+        if best is None:
+            return None
+
+        return (best, best_distance2)
@@ -24,8 +24,10 @@
 """Defines the Stack class, an abstraction of Axes, providing the framework 
 to hold a stack of layers."""
 
-import matplotlib.figure
-import matplotlib.ticker
+import contextlib
+import matplotlayers.data_bounds
+import matplotlayers.rasterization
+import matplotlayers.timing
 
 
 class Stack:
@@ -37,7 +39,11 @@ class Stack:
     
     There is no association with a Figure, except that during initialisation
     time, the Axes may be created by using the Figure handed over by the
-    user."""
+    user.
+    
+    Changes of the labeling, the limits, the autoscaling, the locators, and
+    the colorbar mode can be collected by a batch (see .batch()) and are 
+    then applied to the Axes at once."""
     
     #
     # Initialisation methods ...
@@ -83,6 +89,39 @@ class Stack:
         if autoscale_y_on is None:
             autoscale_y_on = True
     
+        # Initialise the batch state ...
+        #
+        # The changes not applied to the axes yet, and the callbacks to be
+        # called after applying them.
+
+        self._batch_depth = 0
+        self._pending = {}
+        self._batch_callbacks = []
+
+        # The (xlim, ylim) of the axes before they have been cleared in the
+        # open batch, or None.
+        self._limits_before_clear = None
+
+        # The layers present.
+        self._layers = []
+        
+        # The layers rendered to the FigureAxes.
+        self._layers_drawn = []
+
+        # The matplotlib artists created by the layers drawn, and the 
+        # visibility, zorder and rasterization set for layers, all by id() 
+        # of the layer.
+        self._layer_artists = {}
+        self._layer_visible = {}
+        self._layer_zorder = {}
+        self._layer_rasterized = {}
+
+        # Whether a reset of the FigureAxes is needed before rendering.  This
+        # may occur because:
+        #  1.  Layers drawn have changed data.
+        #  2.  Layers have been removed.
+        self._needs_reset = False
+
         # Initialise attributes ...
 
         if axes is None:
@@ -101,39 +140,28 @@ class Stack:
         self.xlabel = self.axes.get_xlabel()
         self.ylabel = self.axes.get_ylabel()
 
-        # Apply the autoscaling ...
-        #
-        # This will also store the correct values for .xlim and .ylim.
-        
-        self.set_autoscale_on(
-                both_on = autoscale_both_on,
-                x_on = autoscale_x_on,
-                y_on = autoscale_y_on)
-
-        # Store the locators ...
+        with self.batch():
+            # Apply the autoscaling ...
+            #
+            # This will also store the correct values for .xlim and .ylim.
+            
+            self.set_autoscale_on(
+                    both_on = autoscale_both_on,
+                    x_on = autoscale_x_on,
+                    y_on = autoscale_y_on)
 
-        self.set_locators(locator_x=locator_x, locator_y=locator_y)
+            # Store the locators ...
 
-        # Prepare for use as a colorbar ...
-        #
-        # Do this after setting the locators and not before.  Because
-        # set_colorbar() sets also the xticks, but set_locators overrides
-        # this by setting the xlocator to AutoLocator(), when done in the
-        # wrong order.
+            self.set_locators(locator_x=locator_x, locator_y=locator_y)
 
-        self.set_colorbar(colorbar)
-    
-        # The layers present.
-        self._layers = []
-        
-        # The layers rendered to the FigureAxes.
-        self._layers_drawn = []
+            # Prepare for use as a colorbar ...
+            #
+            # The batch applies the colorbar mode after the locators.
+            # Because set_colorbar() sets also the xticks, but set_locators
+            # overrides this by setting the xlocator to AutoLocator(), when
+            # done in the wrong order.
 
-        # Whether a reset of the FigureAxes is needed before rendering.  This
-        # may occur because:
-        #  1.  Layers drawn have changed data.
-        #  2.  Layers have been removed.
-        self._needs_reset = False
+            self.set_colorbar(colorbar)
 
     #
     # Layer maintainance ...
@@ -158,6 +186,11 @@ class Stack:
         if id(layer) not in map(id, self._layers):
             self._layers.append(layer)
 
+    def get_layers(self):
+        """Return the list of layers, in drawing order."""
+
+        return list(self._layers)
+
     def remove_layer(self, layer):
         """Remove a layer from the Renderer.  Removing an nonexistent 
         layer will be silently ignored."""
@@ -165,8 +198,123 @@ class Stack:
         if id(layer) in map(id, self._layers):
             self._layers.remove(layer)
 
+            # Forget the settings of the layer.
+            self._layer_visible.pop(id(layer), None)
+            self._layer_zorder.pop(id(layer), None)
+            self._layer_rasterized.pop(id(layer), None)
+
             # Flag that a reset is needed:
             self._needs_reset = True
+
+    def update_layer(self, layer, **kwargs):
+        """Configure layer LAYER by KWARGS.  If LAYER is drawn, and has not
+        been changed otherwise, its artists are updated in place if the
+        layer supports this (see Layer.configure_in_place()), so that the
+        next .render() needs neither to clear the axes nor to draw the 
+        other layers again.  LAYER must not be drawn by other Stacks then.
+        Returns whether the update has been done in place."""
+
+        if layer.has_changed() or \
+                id(layer) not in map(id, self._layers_drawn) or \
+                not layer.configure_in_place(
+                    self._layer_artists.get(id(layer), []), **kwargs):
+            layer.configure(**kwargs)
+            return False
+
+        layer.unset_changed()
+
+        # The rasterization may depend on the data.
+        self._apply_layer_appearance(layer)
+
+        if self.autoscale_x_on or self.autoscale_y_on:
+            # The data limits of the axes are stale now.
+            if not self._datalim_from_bounds():
+                self.axes.relim()
+            self.axes.autoscale_view()
+
+        return True
+
+    #
+    # Layer appearance ...
+    #
+
+    def set_layer_visible(self, layer, visible):
+        """Show or hide the layer LAYER according to VISIBLE.  The artists
+        the layer has drawn are shown or hidden in place, so that the 
+        layer needs not to be drawn again.  The setting is kept when the 
+        layer is drawn again."""
+
+        self._layer_visible[id(layer)] = visible
+
+        for artist in self._layer_artists.get(id(layer), []):
+            artist.set_visible(visible)
+
+    def get_layer_visible(self, layer):
+        """Return whether the layer LAYER is shown."""
+
+        return self._layer_visible.get(id(layer), True)
+
+    def set_layer_zorder(self, layer, zorder):
+        """Set the zorder of all artists of layer LAYER to ZORDER in place,
+        see .set_layer_visible().  None restores the zorders chosen by 
+        matplotlib for artists drawn in future."""
+
+        if zorder is None:
+            self._layer_zorder.pop(id(layer), None)
+            return
+
+        self._layer_zorder[id(layer)] = zorder
+
+        for artist in self._layer_artists.get(id(layer), []):
+            artist.set_zorder(zorder)
+
+    def get_layer_zorder(self, layer):
+        """Return the zorder set for layer LAYER, or None if not set."""
+
+        return self._layer_zorder.get(id(layer))
+
+    def set_layer_rasterized(self, layer, rasterized):
+        """Let the artists of layer LAYER be drawn as images in vector 
+        output if RASTERIZED is True, or as vectors if it is False.  None 
+        decides by the number of elements of the layer, see 
+        matplotlayers.rasterization, which is the default.  Applies in 
+        place, see .set_layer_visible()."""
+
+        if rasterized is None:
+            self._layer_rasterized.pop(id(layer), None)
+        else:
+            self._layer_rasterized[id(layer)] = rasterized
+
+        rasterized = matplotlayers.rasterization.decide(layer, rasterized)
+        for artist in self._layer_artists.get(id(layer), []):
+            artist.set_rasterized(rasterized)
+
+    def get_layer_rasterized(self, layer):
+        """Return the rasterization set for layer LAYER, None means it is
+        decided by the number of elements."""
+
+        return self._layer_rasterized.get(id(layer))
+
+    def _apply_layer_appearance(self, layer):
+        """Apply the visibility and zorder set for LAYER to its artists."""
+
+        artists = self._layer_artists.get(id(layer), [])
+
+        if id(layer) in self._layer_visible:
+            for artist in artists:
+                artist.set_visible(self._layer_visible[id(layer)])
+
+        if id(layer) in self._layer_zorder:
+            for artist in artists:
+                artist.set_zorder(self._layer_zorder[id(layer)])
+
+        # Leave the rasterization given to the layer alone, unless set or
+        # decided otherwise.
+        rasterized = matplotlayers.rasterization.decide(layer,
+                self._layer_rasterized.get(id(layer)))
+        if rasterized or id(layer) in self._layer_rasterized:
+            for artist in artists:
+                artist.set_rasterized(rasterized)
     
     #
     # Rendering ...
@@ -174,7 +322,9 @@ class Stack:
 
     def render(self):
         """Render the layers to the Stack.  The Stack may be clear()'ed during 
-        this."""
+        this.  See matplotlayers.timing for measuring the time needed."""
+
+        started = matplotlayers.timing.start()
 
         # Reset eventually ...
 
@@ -182,8 +332,11 @@ class Stack:
 
         if self._needs_reset:
             # Clear the axes, the list of drawn layers, and the flag.
+            reset_started = matplotlayers.timing.start()
             self.clear()
+            matplotlayers.timing.stop('Stack.render reset', reset_started)
             self._layers_drawn = []
+            self._layer_artists = {}
             self._needs_reset = False
 
         # Draw all layers which are not drawn yet ...
@@ -191,13 +344,264 @@ class Stack:
         for layer in self._layers:
             if id(layer) in map(id, self._layers_drawn):
                 # The layer does not need to be drawn.
+                matplotlayers.timing.count('layers reused')
                 continue
 
+            # Record the artists the layer creates.
+            children = set(map(id, self.axes.get_children()))
+            layer_started = matplotlayers.timing.start()
             layer.to_axes(self.axes)
+            if layer_started is not None:
+                # By class, so that the stages don't grow with the layers
+                # ever drawn.
+                matplotlayers.timing.stop('Layer.to_axes %s' % \
+                        layer.__class__.__name__, layer_started)
+                matplotlayers.timing.count('layers rendered')
+            self._layer_artists[id(layer)] = [artist
+                    for artist in self.axes.get_children()
+                    if id(artist) not in children]
+            self._apply_layer_appearance(layer)
 
             layer.unset_changed()
             self._layers_drawn.append(layer)
 
+        matplotlayers.timing.stop('Stack.render', started)
+
+    #
+    # Autoscaling ...
+    #
+
+    def _datalim_from_bounds(self):
+        """Set the data limits of the axes to the union of the data bounds
+        of the layers drawn and shown (see Layer.get_data_bounds()), 
+        instead of scanning the data of all artists like axes.relim() does.
+        This is needed only when artists have been changed in place.  The 
+        view limits are then set by matplotlib's autoscale_view().  Returns
+        False without changing anything if some layer cannot tell its 
+        bounds, or if the axes aren't cartesian and linear."""
+
+        if getattr(self.axes, 'name', 'rectilinear') != 'rectilinear' or \
+                self.axes.get_xscale() != 'linear' or \
+                self.axes.get_yscale() != 'linear':
+            return False
+
+        if len(self._layers_drawn) == 0:
+            return False
+
+        # Collect the bounds ...
+
+        bounds = (None, None)
+
+        for layer in self._layers_drawn:
+            if not self.get_layer_visible(layer):
+                continue
+
+            layer_bounds = layer.get_data_bounds()
+            if layer_bounds is None:
+                return False
+
+            bounds = matplotlayers.data_bounds.union(bounds, layer_bounds)
+
+        if bounds[0] is None or bounds[1] is None:
+            return False
+
+        # Apply them like axes.relim() does, so that autoscale_view() keeps
+        # the orientation of the axes, the margins, and the sticky edges.
+        # matplotlib.transforms is loaded by the axes already.
+
+        import matplotlib.transforms
+
+        ((xmin, xmax), (ymin, ymax)) = bounds
+
+        self.axes.dataLim.ignore(True)
+        self.axes.dataLim.set_points(
+                matplotlib.transforms.Bbox.null().get_points())
+        self.axes.ignore_existing_data_limits = True
+        self.axes.update_datalim([(xmin, ymin), (xmax, ymax)])
+
+        return True
+
+    #
+    # Batching ...
+    #
+
+    @contextlib.contextmanager
+    def batch(self, callback = None):
+        """Collect the changes made by the property set methods and by 
+        .clear() inside of a with-statement, and apply them to the axes at
+        once when leaving it::
+
+            with stack.batch():
+                stack.set_xlim((0, 1))
+                stack.set_ylim((0, 2))
+
+        Only the last setting of each property takes effect, and the 
+        autoscaling is applied at most once.  CALLBACK is called once after
+        applying the changes, if there were any.
+        
+        Batches can be nested, the changes are applied when the outermost
+        batch is left.  If it is left by an exception, the changes are 
+        discarded, and axes cleared in the batch get the properties from
+        before the batch back.  Until then, the .get_Xlim() methods return
+        the limits before the batch."""
+
+        self._batch_depth += 1
+        if callback is not None:
+            self._batch_callbacks.append(callback)
+
+        failed = True
+        try:
+            yield self
+            failed = False
+
+        finally:
+            self._batch_depth -= 1
+            if failed and self._batch_depth == 0:
+                self._discard_pending()
+
+        self._flush()
+
+    def _discard_pending(self):
+        """Discard the changes of the batch left by an exception."""
+
+        self._pending = {}
+        self._batch_callbacks = []
+
+        if self._limits_before_clear is not None:
+            # The axes have been cleared.  Restore the properties stored,
+            # and let the next .render() draw the layers again.
+            self._pend_stored_settings()
+            self._needs_reset = True
+            self._apply_pending()
+
+    def _flush(self):
+        """Apply the pending changes, unless a batch is open."""
+
+        if self._batch_depth == 0:
+            self._apply_pending()
+
+    def _apply_pending(self):
+        """Apply the pending changes to the axes and call the callbacks of
+        the batches."""
+
+        (pending, callbacks) = (self._pending, self._batch_callbacks)
+        self._pending = {}
+        self._batch_callbacks = []
+        self._limits_before_clear = None
+
+        if len(pending) == 0:
+            return
+
+        # Apply the labeling ...
+
+        if 'title' in pending:
+            (self.title, self.title_kwargs) = pending['title']
+            self.axes.set_title(self.title, **self.title_kwargs)
+
+        if 'xlabel' in pending:
+            self.xlabel = pending['xlabel']
+            self.axes.set_xlabel(self.xlabel)
+
+        if 'ylabel' in pending:
+            self.ylabel = pending['ylabel']
+            self.axes.set_ylabel(self.ylabel)
+
+        # Apply the locators and the colorbar mode ...
+        #
+        # The colorbar mode must come after the locators, see __init__().
+
+        if 'locators' in pending:
+            (self.locator_x, self.locator_y) = pending['locators']
+            self._update_locators()
+
+        if 'colorbar' in pending:
+            self.colorbar = pending['colorbar']
+            self._update_colorbar_mode()
+
+        # Apply the limits and autoscaling ...
+
+        self._apply_pending_limits(pending.get('x'), pending.get('y'))
+
+        for callback in callbacks:
+            callback()
+
+    def _apply_pending_limits(self, x, y):
+        """Apply the pending limit states X and Y, see ._pend_limit()."""
+
+        # Fixed limits first, so that the autoscaling below leaves them
+        # alone ...
+
+        if x is not None and x not in ('auto', 'auto_freeze'):
+            self.axes.set_autoscalex_on(False)
+            self.autoscale_x_on = False
+            self.axes.set_xlim(x)
+            self.xlim = x
+
+        if y is not None and y not in ('auto', 'auto_freeze'):
+            self.axes.set_autoscaley_on(False)
+            self.autoscale_y_on = False
+            self.axes.set_ylim(y)
+            self.ylim = y
+
+        # Then autoscaling, done only once ...
+
+        x_on = x in ('auto', 'auto_freeze')
+        y_on = y in ('auto', 'auto_freeze')
+
+        if x_on:
+            self.axes.set_autoscalex_on(True)
+            # This signals .clear() that no limit shall be preserved.
+            self.xlim = None
+            self.autoscale_x_on = True
+
+        if y_on:
+            self.axes.set_autoscaley_on(True)
+            # This signals .clear() that no limit shall be preserved.
+            self.ylim = None
+            self.autoscale_y_on = True
+
+        if x_on or y_on:
+            self.axes.autoscale_view()
+
+        # Keep the autoscaled limits if autoscaling has been turned off 
+        # again in the same batch ...
+
+        if x == 'auto_freeze':
+            self.axes.set_autoscalex_on(False)
+            self.xlim = self.axes.get_xlim()
+            self.autoscale_x_on = False
+
+        if y == 'auto_freeze':
+            self.axes.set_autoscaley_on(False)
+            self.ylim = self.axes.get_ylim()
+            self.autoscale_y_on = False
+
+    def _pend_limit(self, axis, state):
+        """Combine the limit state STATE of AXIS ('x' or 'y') with the 
+        pending one.  A state is either a limit tuple, 'auto' for 
+        autoscaling, or 'freeze' for turning autoscaling off while keeping 
+        the current limit.  Freezing after 'auto' gives 'auto_freeze', and 
+        freezing after a limit keeps the limit.  Otherwise, freezing takes
+        the limit shown now, before the axes have been cleared in the
+        batch."""
+
+        previous = self._pending.get(axis)
+
+        if state == 'freeze':
+            if previous in ('auto', 'auto_freeze'):
+                state = 'auto_freeze'
+            elif previous is not None:
+                # A limit is pending.
+                state = previous
+            elif self._limits_before_clear is not None:
+                state = self._limits_before_clear['xy'.index(axis)]
+            elif axis == 'x':
+                state = tuple(self.axes.get_xlim())
+            else:
+                state = tuple(self.axes.get_ylim())
+
+        self._pending[axis] = state
+
     #
     # Property set methods ...
     #
@@ -205,21 +609,20 @@ class Stack:
     def set_title(self, title, **title_kwargs):
         """Set the title to string TITLE with kwargs *title_kwargs*."""
 
-        self.axes.set_title(title, **title_kwargs)
-        self.title = title
-        self.title_kwargs = title_kwargs
+        self._pending['title'] = (title, title_kwargs)
+        self._flush()
 
     def set_xlabel(self, xlabel):
         """Set the xlabel to string XLABEL."""
 
-        self.axes.set_xlabel(xlabel)
-        self.xlabel = xlabel
+        self._pending['xlabel'] = xlabel
+        self._flush()
 
     def set_ylabel(self, ylabel):
         """Set the ylabel to string YLABEL."""
 
-        self.axes.set_ylabel(ylabel)
-        self.ylabel = ylabel
+        self._pending['ylabel'] = ylabel
+        self._flush()
 
     def set_xlim(self, lim):
         """Sets the limit and the stored value for restoration in .clear().
@@ -227,16 +630,11 @@ class Stack:
         be turned on."""
 
         if lim is not None:
-            # This turns autoscaling off, maintaining the current xlim.
-            self.set_autoscale_on(x_on = False)
-
-            # This sets and stores the *new* xlim.
-            self.axes.set_xlim(lim)
-            self.xlim = lim
-
+            self._pend_limit('x', tuple(lim))
         else:
-            # Turn autoscaling on, which will also store None in .xlim.
-            self.set_autoscale_on(x_on = True)
+            self._pend_limit('x', 'auto')
+
+        self._flush()
 
     def set_ylim(self, lim):
         """Sets the limit and the stored value for restoration in .clear().
@@ -244,22 +642,18 @@ class Stack:
         be turned on."""
 
         if lim is not None:
-            # This turns autoscaling off, maintaining the current ylim.
-            self.set_autoscale_on(y_on = False)
-
-            # This sets and stores the *new* ylim.
-            self.axes.set_ylim(lim)
-            self.ylim = lim
-
+            self._pend_limit('y', tuple(lim))
         else:
-            # Turn autoscaling on, which will also store None in .ylim.
-            self.set_autoscale_on(y_on = True)
+            self._pend_limit('y', 'auto')
+
+        self._flush()
         
     def set_autoscale_on(self, both_on = None, x_on = None, y_on = None):
         """The autoscaling is controled by BOTH_ON, X_ON, and Y_ON.  If 
         BOTH_ON is given, it overrides X_ON and Y_ON.  If the autoscaling for 
         some axis isn't given (either by BOTH_ON or by X_ON or Y_ON), its 
-        setting will be maintained."""
+        setting will be maintained.  Turning autoscaling off maintains the
+        current limit."""
 
         if both_on is not None:
             # Override AUTOSCALING_X/Y.
@@ -267,41 +661,18 @@ class Stack:
             y_on = both_on
 
         if x_on is not None:
-            # Set the X autoscaling...
-            #
-            # Do not call .set_xlim() during that, because this may result in
-            # infinite recursion, if .set_autoscale_on() was called by 
-            # a .set_Xlim() method.
-
-            self.axes.set_autoscalex_on(x_on)
             if x_on:
-                # This signals .clear() that no limit shall be preserved.
-                self.xlim = None
+                self._pend_limit('x', 'auto')
             else:
-                # Signal .clear() the correct xlim.  If .autoscale_x_on was 
-                # True, then .xlim is currently None.
-                self.xlim = self.axes.get_xlim()
-            self.autoscale_x_on = x_on
+                self._pend_limit('x', 'freeze')
 
         if y_on is not None:
-            # Set the Y autoscaling ...
-            
-            self.axes.set_autoscaley_on(y_on)
             if y_on:
-                # This signals .clear() that no limit shall be preserved.
-                self.ylim = None
+                self._pend_limit('y', 'auto')
             else:
-                # Signal .clear() the correct ylim.  If .autoscale_y_on was 
-                # True, then .ylim is currently None.
-                self.ylim = self.axes.get_ylim()
-            self.autoscale_y_on = y_on
-        
-        # Apply the autoscaling if needed ...
+                self._pend_limit('y', 'freeze')
 
-        # If X_ON or Y_ON is None, this evaluates as False, i.e., no problem
-        # with None values supplied for X/Y_ON.
-        if x_on or y_on:
-            self.axes.autoscale_view()
+        self._flush()
 
     def _update_colorbar_mode(self):
         """Ensures the colorbar mode if present.  Note that returning from
@@ -322,16 +693,20 @@ class Stack:
     def set_colorbar(self, colorbar):
         """Sets the colorbar mode."""
 
-        self.colorbar = colorbar
-        self._update_colorbar_mode()
+        self._pending['colorbar'] = colorbar
+        self._flush()
 
     def set_locators(self, locator_x, locator_y):
         """Sets the locators to be used.  None means 'default locator'."""
 
-        self.locator_x = locator_x
-        self.locator_y = locator_y
+        self._pending['locators'] = (locator_x, locator_y)
+        self._flush()
 
-        # Set locators ...
+    def _update_locators(self):
+        """Hands the locators over to the axes."""
+
+        # Loaded by the axes already.
+        import matplotlib.ticker
 
         if self.locator_x is not None:
             self.axes.xaxis.set_major_locator(self.locator_x)
@@ -354,34 +729,43 @@ class Stack:
 
         # Put the axes back into initial state ...
 
+        if self._batch_depth > 0 and self._limits_before_clear is None:
+            # Keep the limits shown before for freezing them.
+            self._limits_before_clear = (tuple(self.axes.get_xlim()),
+                    tuple(self.axes.get_ylim()))
+
         self.axes.clear()
 
-        # Restore the settings stored ...
+        self._pend_stored_settings()
+        self._flush()
+
+    def _pend_stored_settings(self):
+        """Pend the settings stored for restoring them after clearing the
+        axes."""
+
+        # Settings pending in an open batch are newer and take precedence.
+
+        pending = self._pending
 
         # Restore labeling.
-        self.set_title(self.title, **self.title_kwargs)
-        self.set_xlabel(self.xlabel)
-        self.set_ylabel(self.ylabel)
+        pending.setdefault('title', (self.title, self.title_kwargs))
+        pending.setdefault('xlabel', self.xlabel)
+        pending.setdefault('ylabel', self.ylabel)
         
-        # Restore colorbar mode
-        self._update_colorbar_mode()
-
-        # Restore locators
-        if self.locator_x is not None:
-            self.axes.xaxis.set_major_locator(self.locator_x)
-        if self.locator_y is not None:
-            self.axes.yaxis.set_major_locator(self.locator_y)
+        # Restore locators and colorbar mode.
+        pending.setdefault('locators', (self.locator_x, self.locator_y))
+        pending.setdefault('colorbar', self.colorbar)
 
         # Restore lims.  If autoscaling was turned on, the corresponding
         # limit will be None, and the setting is maintained, because
         # autoscaling on is the default state.  If autoscaling was turned off,
         # the corresponding limit will be set, and the autoscaling will be
-        # turned off in the .axes by the .set_Xlim() call.
+        # turned off in the .axes.
         if self.xlim is not None:
-            self.set_xlim(self.xlim)
+            pending.setdefault('x', self.xlim)
 
         if self.ylim is not None:
-            self.set_ylim(self.ylim)
+            pending.setdefault('y', self.ylim)
 
     #
     # Property get methods ...
@@ -390,17 +774,20 @@ class Stack:
     def get_title(self):
         """Returns the title set for the axes."""
 
+        if 'title' in self._pending:
+            return self._pending['title'][0]
+
         return self.title
 
     def get_xlabel(self):
         """Returns the xlabel set for the axes."""
 
-        return self.xlabel
+        return self._pending.get('xlabel', self.xlabel)
     
     def get_ylabel(self):
         """Returns the ylabel set for the axes."""
 
-        return self.ylabel
+        return self._pending.get('ylabel', self.ylabel)
 
     def get_xlim(self):
         """Return the *actual* xlimit.  This may change during autoscaling."""
@@ -0,0 +1,242 @@
+# Copyright (c) 2008, 2009, 2010 Friedrich Romstedt 
+# <www.friedrichromstedt.org>
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Developed since: Oct 2026
+
+"""Timers for the stages of rendering a figure.
+
+Timing is off by default.  Turn it on by::
+
+    import matplotlayers.timing
+
+    matplotlayers.timing.enable()
+
+The instrumented code measures its stages by::
+
+    started = matplotlayers.timing.start()
+    ...
+    matplotlayers.timing.stop('Stage', started)
+
+When timing is off, .start() returns None and .stop() returns at once, so
+that the overhead is two function calls per stage.
+
+The statistics of each stage are kept over a rolling window of the most
+recent durations.  Retrieve them by get_statistics(), write them to the
+logging module by log(), and reset them by reset()."""
+
+import collections
+import logging
+import threading
+import timeit
+
+# The number of recent durations kept per stage when timing is enabled
+# without specifying the window.
+DEFAULT_WINDOW = 256
+
+# The percentiles reported by get_statistics().
+PERCENTILES = (50, 90, 99)
+
+# Whether timing is turned on.  Use enable() and disable() to change.
+enabled = False
+
+# The timer used, giving seconds.
+timer = timeit.default_timer
+
+_window = DEFAULT_WINDOW
+
+# The recent durations by stage name, the total number of measurements and
+# the total duration by stage name, and the counters by name.
+_durations = {}
+_totals = {}
+_counters = {}
+
+_lock = threading.Lock()
+
+#
+# Switching ...
+#
+
+
+def enable(window = None):
+    """Turn timing on.  WINDOW is the number of recent durations kept per
+    stage, it defaults to DEFAULT_WINDOW.  Changing the window resets the
+    statistics."""
+
+    global enabled, _window
+
+    if window is None:
+        window = DEFAULT_WINDOW
+
+    if window != _window:
+        _window = window
+        reset()
+
+    enabled = True
+
+
+def disable():
+    """Turn timing off.  The statistics gathered are kept."""
+
+    global enabled
+
+    enabled = False
+
+#
+# Measuring ...
+#
+
+
+def start():
+    """Return the start time for .stop(), or None if timing is off."""
+
+    if not enabled:
+        return None
+
+    return timer()
+
+
+def stop(name, started):
+    """Record the time elapsed since STARTED, as returned by .start(), for
+    stage NAME.  Does nothing if STARTED is None."""
+
+    if started is None:
+        return
+
+    record(name, timer() - started)
+
+
+def record(name, duration):
+    """Record DURATION in seconds for stage NAME."""
+
+    _lock.acquire()
+    try:
+        if name not in _durations:
+            _durations[name] = collections.deque(maxlen = _window)
+            _totals[name] = (0, 0.0)
+
+        _durations[name].append(duration)
+        (count, total) = _totals[name]
+        _totals[name] = (count + 1, total + duration)
+    finally:
+        _lock.release()
+
+
+def count(name, increment = 1):
+    """Increment the counter NAME by INCREMENT, if timing is on."""
+
+    if not enabled:
+        return
+
+    _lock.acquire()
+    try:
+        _counters[name] = _counters.get(name, 0) + increment
+    finally:
+        _lock.release()
+
+#
+# Statistics ...
+#
+
+
+def _percentile(durations, percentile):
+    """Return the PERCENTILE of the sorted DURATIONS (nearest rank)."""
+
+    index = int(round(percentile / 100.0 * (len(durations) - 1)))
+    return durations[index]
+
+
+def summarize(durations):
+    """Return a dict with the 'mean', 'min', 'max', and the PERCENTILES
+    ('p50' etc.) of the non-empty sequence DURATIONS."""
+
+    durations = sorted(durations)
+
+    summary = {
+            'mean': sum(durations) / len(durations),
+            'min': durations[0],
+            'max': durations[-1]}
+    for percentile in PERCENTILES:
+        summary['p%d' % percentile] = _percentile(durations, percentile)
+
+    return summary
+
+
+def get_statistics():
+    """Return (stages, counters).  STAGES maps each stage name to a dict
+    with the keys 'count' and 'total' (all measurements), and 'mean',
+    'min', 'max', and 'p50', 'p90', 'p99' (recent measurements), all times
+    in seconds.  COUNTERS maps the counter names to their values."""
+
+    _lock.acquire()
+    try:
+        durations = dict((name, list(recent))
+                for (name, recent) in _durations.items())
+        totals = dict(_totals)
+        counters = dict(_counters)
+    finally:
+        _lock.release()
+
+    stages = {}
+    for (name, recent) in durations.items():
+        (count, total) = totals[name]
+        statistics = summarize(recent)
+        statistics['count'] = count
+        statistics['total'] = total
+
+        stages[name] = statistics
+
+    return (stages, counters)
+
+
+def reset():
+    """Forget all measurements and counters."""
+
+    _lock.acquire()
+    try:
+        _durations.clear()
+        _totals.clear()
+        _counters.clear()
+    finally:
+        _lock.release()
+
+
+def log(logger = None, level = None):
+    """Write the statistics to the logging.Logger LOGGER (default the
+    'matplotlayers.timing' logger) with level LEVEL (default
+    logging.INFO), one line per stage and counter."""
+
+    if logger is None:
+        logger = logging.getLogger('matplotlayers.timing')
+    if level is None:
+        level = logging.INFO
+
+    (stages, counters) = get_statistics()
+
+    for name in sorted(stages.keys()):
+        statistics = stages[name]
+        logger.log(level, '%s: n=%d mean=%.2fms p50=%.2fms p90=%.2fms '
+                'p99=%.2fms max=%.2fms', name, statistics['count'],
+                1e3 * statistics['mean'], 1e3 * statistics['p50'],
+                1e3 * statistics['p90'], 1e3 * statistics['p99'],
+                1e3 * statistics['max'])
+
+    for name in sorted(counters.keys()):
+        logger.log(level, '%s: %d', name, counters[name])